@@ -3,13 +3,15 @@ import numpy as np
 import streamlit as st
 import matplotlib.pyplot as plt
 import matplotlib
-from data_collector import DataCollector
-from portfolio import Portfolio
+from catalog import COMPANIES_FILE, CompanyCatalog
 from genetic_algorithm import GeneticAlgorithm
-from datetime import datetime, timedelta
+from frontier import DEFAULT_POINTS as PONTOS_FRONTEIRA
+from lp_solver import STOP_REASON as LP_STOP_REASON
+from optimization_service import ENGINE_GA, ENGINE_LP, ENGINE_NSGA2, OptimizationJob
+from profiles import PARAMETROS_PARETO, PERFIS_INVESTIMENTO, optimization_params
+from result_cache import ResultCache
+from datetime import datetime
 import warnings
-import yfinance as yf
-import time
 
 matplotlib.use('Agg')
 warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
@@ -18,127 +20,69 @@ matplotlib.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'Liberation Sa
 
 st.set_page_config(page_title="Otimizador de Portfolio", layout="wide", initial_sidebar_state="expanded")
 
-# Estrutura de dados dos perfis de investimento
-PERFIS_INVESTIMENTO = {
-    'Conservador': {
-        'descricao': 'Perfil focado em preservação de capital com menor volatilidade',
-        'caracteristicas': [
-            'Prioriza setores defensivos (Utilities, Saúde, Consumo Básico)',
-            'Menor exposição a setores cíclicos',
-            'Parâmetros do algoritmo ajustados para estabilidade'
-        ],
-        'parametros': {
-            'taxa_livre_risco': 0.1075,
-            'geracoes': 30,
-            'tamanho_populacao': 50,
-            'taxa_mutacao': 0.15,
-            'taxa_crossover': 0.7,
-            'threshold_fitness': 0.15,
-            'max_ativos': 12,
-            'min_ativos': 8
-        },
-        'cor': '#28a745'
-    },
-    'Moderado': {
-        'descricao': 'Perfil equilibrado entre risco e retorno',
-        'caracteristicas': [
-            'Diversificação balanceada entre setores',
-            'Combinação de ativos defensivos e crescimento',
-            'Parâmetros moderados para exploração e estabilidade'
-        ],
-        'parametros': {
-            'taxa_livre_risco': 0.1075,
-            'geracoes': 40,
-            'tamanho_populacao': 75,
-            'taxa_mutacao': 0.2,
-            'taxa_crossover': 0.8,
-            'threshold_fitness': 0.12,
-            'max_ativos': 15,
-            'min_ativos': 10
-        },
-        'cor': '#ffc107'
-    },
-    'Arrojado': {
-        'descricao': 'Perfil agressivo focado em maximização de retornos',
-        'caracteristicas': [
-            'Maior exposição a setores de crescimento e cíclicos',
-            'Aceita maior volatilidade em busca de retornos superiores',
-            'Parâmetros otimizados para exploração máxima'
-        ],
-        'parametros': {
-            'taxa_livre_risco': 0.1075,
-            'geracoes': 50,
-            'tamanho_populacao': 100,
-            'taxa_mutacao': 0.25,
-            'taxa_crossover': 0.85,
-            'threshold_fitness': 0.10,
-            'max_ativos': 18,
-            'min_ativos': 12
-        },
-        'cor': '#dc3545'
-    }
+# Descrição exibida para cada motivo de parada do algoritmo genético
+MOTIVOS_PARADA = {
+    GeneticAlgorithm.StopReason.THRESHOLD.value: "🎯 Limiar de fitness atingido",
+    GeneticAlgorithm.StopReason.MAX_GENERATIONS.value: "⏱️ Limite de gerações",
+    GeneticAlgorithm.StopReason.STAGNATION.value: "📉 Fitness estagnado",
+    GeneticAlgorithm.StopReason.FITNESS_GAP.value: "🎯 População convergiu ao melhor",
+    GeneticAlgorithm.StopReason.DIVERSITY.value: "🧬 Diversidade esgotada",
+    GeneticAlgorithm.StopReason.CANCELLED.value: "⏹️ Cancelada pelo usuário",
+    LP_STOP_REASON: "📐 Ótimo exato (programação linear)"
+}
+
+# Motores de otimização oferecidos na configuração
+MOTORES_OTIMIZACAO = {
+    ENGINE_GA: "🧬 Algoritmo Genético",
+    ENGINE_NSGA2: "🎯 NSGA-II (frente de Pareto compartilhada entre perfis)",
+    ENGINE_LP: "📐 Programação Linear (ótimo exato)"
 }
 
-@st.cache_data
-def _baixar_dados_ibovespa_cached(start_date, end_date):
-    """Função cached para download de dados do Ibovespa.
+# Seleção de pais oferecida para o algoritmo genético
+SELECOES_PAIS = {
+    GeneticAlgorithm.SelectionType.TOURNAMENT.value: "🏆 Torneio",
+    GeneticAlgorithm.SelectionType.ROULETTE.value: "🎡 Roleta (amostragem universal estocástica)",
+    GeneticAlgorithm.SelectionType.RANK.value: "📶 Ranking linear",
+    GeneticAlgorithm.SelectionType.TRUNCATION.value: "✂️ Truncamento (metade superior)"
+}
+
+@st.cache_resource
+def obter_cache_resultados():
+    """Retorna o cache de resultados compartilhado entre as sessões.
     
-    Args:
-        start_date (datetime): Data de início
-        end_date (datetime): Data de fim
-        
     Returns:
-        pd.DataFrame: DataFrame com preços de fechamento do Ibovespa
-        
-    Raises:
-        Exception: Erro ao baixar dados do yfinance
+        ResultCache: Cache em memória (LRU) e em disco das otimizações
     """
-    try:
-        data = yf.download("^BVSP", start=start_date, end=end_date, auto_adjust=True)
-        return data
-    except Exception as e:
-        raise Exception(f"Erro ao baixar dados do Ibovespa: {str(e)}")
+    return ResultCache()
 
-@st.cache_data
+@st.cache_resource
 def carregar_empresas():
-    """Carrega dados das empresas do arquivo CSV.
+    """Carrega o cadastro indexado das empresas do arquivo CSV.
+    
+    O cadastro é lido uma única vez e compartilhado entre as sessões.
     
     Returns:
-        list: Lista de dicionários com dados das empresas (código, nome, setor, preço)
+        CompanyCatalog: Cadastro das empresas (None se não puder ser carregado)
         
     Raises:
         FileNotFoundError: Arquivo CSV não encontrado
         pd.errors.EmptyDataError: Arquivo CSV vazio ou corrompido
     """
     try:
-        stocks_df = pd.read_csv("data/empresas_br_bovespa.csv")
-        
-        if stocks_df.empty:
-            raise pd.errors.EmptyDataError("Arquivo CSV está vazio")
-            
-
-        empresas = []
-        for _, row in stocks_df.iterrows():
-            empresas.append({
-                'codigo': row['Ticker'],
-                'nome': row['Nome'],
-                'setor': row['Setor'],
-                'preco': row['Preço']
-            })
-        return empresas
+        return CompanyCatalog.from_csv(COMPANIES_FILE)
         
     except FileNotFoundError:
-        st.error("❌ Arquivo 'data/empresas_br_bovespa.csv' não encontrado. Verifique se o arquivo existe.")
-        return []
+        st.error(f"❌ Arquivo '{COMPANIES_FILE}' não encontrado. Verifique se o arquivo existe.")
+        return None
     except pd.errors.EmptyDataError:
         st.error("❌ Arquivo CSV está vazio ou corrompido.")
-        return []
+        return None
     except KeyError as e:
         st.error(f"❌ Coluna obrigatória não encontrada no CSV: {e}")
-        return []
+        return None
     except Exception as e:
         st.error(f"❌ Erro inesperado ao carregar dados das empresas: {str(e)}")
-        return []
+        return None
 
 
 if "etapa_atual" not in st.session_state:
@@ -153,6 +97,11 @@ if "resultado_otimizacao" not in st.session_state:
     st.session_state.resultado_otimizacao = None
 if "executando_otimizacao" not in st.session_state:
     st.session_state.executando_otimizacao = False
+# Registro dos jobs de otimização da sessão e do job acompanhado
+if "jobs" not in st.session_state:
+    st.session_state.jobs = {}
+if "job_atual" not in st.session_state:
+    st.session_state.job_atual = None
 
 
 
@@ -167,9 +116,9 @@ def mostrar_selecao_acoes():
     """
     st.title("Seleção das Ações")
     
-    empresas = carregar_empresas()
+    catalogo = carregar_empresas()
     
-    if not empresas:
+    if not catalogo:
         st.error("Não foi possível carregar os dados das empresas.")
         return
     
@@ -203,34 +152,29 @@ def mostrar_selecao_acoes():
         
         st.subheader("Filtros e Seleção de Ações")
         
-        # Filtro por setor (remove valores NaN/None)
-        setores_unicos = sorted(list(set(emp['setor'] for emp in empresas if emp['setor'] and not pd.isna(emp['setor']))))
-        setores_disponiveis = ['Todos os Setores'] + setores_unicos
+        # Filtro por setor (empresas sem setor aparecem apenas em 'Todos os Setores')
+        setores_disponiveis = ['Todos os Setores'] + catalogo.sector_names
         setor_selecionado = st.selectbox("Filtrar por Setor", setores_disponiveis)
         
-        # Aplicar filtro por setor
-        if setor_selecionado == 'Todos os Setores':
-            empresas_filtradas = empresas
-        else:
-            empresas_filtradas = [emp for emp in empresas if emp['setor'] == setor_selecionado and emp['setor'] and not pd.isna(emp['setor'])]
-        
-        # Converter para DataFrame para exibição
-        df_empresas = pd.DataFrame(empresas_filtradas)
-        df_empresas.columns = ['Código', 'Nome', 'Setor', 'Preço (R$)']
+        # Aplicar filtro por setor e montar a tabela de exibição
+        setor_filtro = None if setor_selecionado == 'Todos os Setores' else setor_selecionado
+        codigos_filtrados = catalogo.tickers_in(setor_filtro)
+        df_empresas = catalogo.table(setor_filtro)
+        disponiveis = set(codigos_filtrados)
         
         # Checkbox para selecionar todas
         selecionar_todas = st.checkbox("Selecionar todas as ações disponíveis")
         
         if selecionar_todas:
-            acoes_selecionadas = [emp['codigo'] for emp in empresas_filtradas]
+            acoes_selecionadas = codigos_filtrados
         else:
             # Limite para performance
             st.info("💡 Recomendamos selecionar entre 5-20 ações para otimização eficiente")
             acoes_selecionadas = st.multiselect(
                 "Escolha as ações para otimização:",
-                [emp['codigo'] for emp in empresas_filtradas],
-                default=[codigo for codigo in st.session_state.acoes_selecionadas if codigo in [emp['codigo'] for emp in empresas_filtradas]][:20],
-                format_func=lambda x: f"{x} - {next((emp['nome'] for emp in empresas_filtradas if emp['codigo'] == x), x)} ({next((emp['setor'] for emp in empresas_filtradas if emp['codigo'] == x and emp['setor'] and not pd.isna(emp['setor'])), 'Sem Setor')})"
+                codigos_filtrados,
+                default=[codigo for codigo in st.session_state.acoes_selecionadas if codigo in disponiveis][:20],
+                format_func=catalogo.label
             )
         
         # Mostrar tabela das ações filtradas
@@ -262,24 +206,21 @@ def mostrar_selecao_acoes():
         st.metric("Valor do Aporte", f"R$ {valor_aporte:,.2f}")
         st.metric("Taxa Livre de Risco", f"{risk_free_rate:.1%}")
         
-        if empresas_filtradas and setor_selecionado != 'Todos os Setores':
-            st.metric("Ações no Setor", len(empresas_filtradas))
+        if codigos_filtrados and setor_selecionado != 'Todos os Setores':
+            st.metric("Ações no Setor", len(codigos_filtrados))
         
         if acoes_selecionadas:
             st.write(f"**Primeiras 10 Ações Selecionadas:**")
             for codigo in acoes_selecionadas[:10]:
-                empresa = next((emp for emp in empresas if emp['codigo'] == codigo), None)
-                if empresa:
-                    setor_display = empresa['setor'] if empresa['setor'] and not pd.isna(empresa['setor']) else 'Sem Setor'
-                    st.write(f"• {codigo} - {empresa['nome']} ({setor_display})")
+                if codigo in catalogo:
+                    st.write(f"• {catalogo.label(codigo)}")
             
             if len(acoes_selecionadas) > 10:
                 st.write(f"... e mais {len(acoes_selecionadas) - 10} ações")
                 
             # Distribuição por setor das ações selecionadas
             if len(acoes_selecionadas) > 1:
-                setores_selecionados = [next((emp['setor'] for emp in empresas if emp['codigo'] == codigo and emp['setor'] and not pd.isna(emp['setor'])), 'Sem Setor') for codigo in acoes_selecionadas]
-                distribuicao_setores = pd.Series(setores_selecionados).value_counts()
+                distribuicao_setores = catalogo.sector_counts(acoes_selecionadas)
                 
                 with st.expander("📊 Distribuição por Setor"):
                     for setor, count in distribuicao_setores.items():
@@ -388,19 +329,15 @@ def mostrar_parametros_algoritmo():
                 value=f"{perfil_atual['parametros']['taxa_livre_risco']:.2%}",
                 help="Taxa de referência para cálculo do índice de Sharpe"
             )
-        
-        # Configurações fixas do algoritmo
-        st.subheader("Configurações Fixas do Algoritmo")
-        
-        config_cols = st.columns(2)
-        
-        with config_cols[0]:
-            st.write("• **Método de Seleção:** Tournament (3 competidores)")
-            st.write("• **Tipo de Crossover:** Single-point")
             
-        with config_cols[1]:
-            st.write("• **Elitismo:** Ativo (10% melhores preservados)")
-            st.write("• **Critério de Parada:** Threshold ou gerações máximas")
+            st.metric(
+                label="🛡️ Aversão ao Risco",
+                value=f"{perfil_atual['parametros']['aversao_risco']:.0%}",
+                help="Peso do CVaR no fitness da carteira, em todos os motores"
+            )
+        
+        # Configurações do algoritmo, preenchidas após a escolha do motor e da seleção
+        configuracoes = st.container()
     
     with col2:
         st.subheader("Resumo da Configuração")
@@ -408,6 +345,43 @@ def mostrar_parametros_algoritmo():
         st.metric("Perfil de Investimento", st.session_state.perfil_selecionado)
         st.metric("Ações Selecionadas", len(st.session_state.acoes_selecionadas))
         st.metric("Valor do Aporte", f"R$ {config['capital_inicial']:,.2f}")
+        
+        semente = st.number_input(
+            "🎲 Semente Aleatória",
+            min_value=0,
+            value=42,
+            step=1,
+            help="A mesma semente, com os mesmos dados e parâmetros, reproduz a mesma carteira"
+        )
+        
+        motor = st.radio(
+            "Motor de Otimização",
+            options=list(MOTORES_OTIMIZACAO.keys()),
+            format_func=MOTORES_OTIMIZACAO.get,
+            help="A programação linear encontra em milissegundos a carteira de maior fitness; o algoritmo genético é comparado a esse ótimo nos resultados"
+        )
+        
+        selecao = st.selectbox(
+            "Seleção de Pais",
+            options=list(SELECOES_PAIS.keys()),
+            format_func=SELECOES_PAIS.get,
+            disabled=motor != ENGINE_GA,
+            help="Como o algoritmo genético escolhe os pais de cada geração, a partir do fitness calculado uma única vez por geração"
+        )
+        
+        comparar_otimo = st.checkbox(
+            "📐 Comparar com o ótimo exato",
+            disabled=motor == ENGINE_LP,
+            help="Resolve também o programa linear média-CVaR para mostrar a distância do AG ao ótimo"
+        )
+        
+        calcular_fronteira = st.checkbox(
+            f"🗺️ Traçar fronteira eficiente ({PONTOS_FRONTEIRA} pontos)",
+            help="Repete a otimização para uma grade de pesos do CVaR, partindo a cada ponto da solução do anterior"
+        )
+    
+    with configuracoes:
+        mostrar_configuracoes_algoritmo(motor, selecao, perfil_atual['parametros'])
     
     st.divider()
     
@@ -425,307 +399,189 @@ def mostrar_parametros_algoritmo():
         with col_btn2:
             if st.button("🚀 Executar Otimização", type="primary"):
                 # Configurar parâmetros baseados no perfil selecionado
-                st.session_state.parametros_otimizacao = {
-                    'population_size': perfil_atual['parametros']['tamanho_populacao'],
-                    'max_generations': perfil_atual['parametros']['geracoes'],
-                    'threshold': perfil_atual['parametros']['threshold_fitness'],
-                    'crossover_rate': perfil_atual['parametros']['taxa_crossover'],
-                    'mutation_rate': perfil_atual['parametros']['taxa_mutacao'],
-                    'risk_free_rate': perfil_atual['parametros']['taxa_livre_risco']
-                }
+                st.session_state.parametros_otimizacao = optimization_params(
+                    st.session_state.perfil_selecionado,
+                    semente=int(semente),
+                    motor=motor,
+                    selecao=selecao,
+                    comparar_otimo=comparar_otimo or None,
+                    pontos_fronteira=PONTOS_FRONTEIRA if calcular_fronteira else None
+                )
                 
                 # Salvar perfil selecionado para uso posterior
                 st.session_state.perfil_investimento = st.session_state.perfil_selecionado
                 
+                # Nova execução: o próximo acesso aos resultados inicia um novo job
+                st.session_state.resultado_otimizacao = None
+                descartar_job_atual()
+                
                 st.session_state.etapa_atual = 3
                 st.rerun()
     else:
         # Mostrar mensagem quando está executando
         st.info("🔄 **Otimização em andamento...** Aguarde a conclusão do processo.")
 
-@st.cache_data
-def calcular_benchmarks(returns_data_hash, capital_inicial, dias, acoes_selecionadas):
-    """Calcula benchmark do Índice Bovespa usando dados reais do yfinance.
+def mostrar_configuracoes_algoritmo(motor, selecao, parametros):
+    """Exibe as configurações do motor escolhido que não vêm do perfil.
     
     Args:
-        returns_data_hash (str): Hash dos dados de retorno para cache
-        capital_inicial (float): Valor inicial do investimento
-        dias (int): Número de dias para simulação
-        acoes_selecionadas (list): Lista de ações selecionadas
-        
-    Returns:
-        dict: Dicionário com valores do benchmark Bovespa
-        
-    Raises:
-        ValueError: Erro nos parâmetros de entrada
+        motor: Motor de otimização escolhido
+        selecao: Tipo de seleção de pais do algoritmo genético
+        parametros: Parâmetros do perfil de investimento
     """
-    try:
-        if capital_inicial <= 0:
-            raise ValueError("Capital inicial deve ser positivo")
-        if dias <= 0:
-            raise ValueError("Número de dias deve ser positivo")
-            
-        # Baixa dados reais do Ibovespa usando função cached
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=dias + 60)  # Margem maior para garantir dados suficientes
-        
-
-        bovespa_data = _baixar_dados_ibovespa_cached(start_date, end_date)
-        
-        if bovespa_data is None or bovespa_data.empty:
-            raise ValueError("Não foi possível baixar dados do Ibovespa")
-            
-        # Extrai preços de fechamento (lida com MultiIndex)
-        if 'Close' in bovespa_data.columns:
-            close_prices = bovespa_data['Close']
-
-            if hasattr(close_prices, 'squeeze'):
-                close_prices = close_prices.squeeze()
-        elif hasattr(bovespa_data.columns, 'levels') and 'Close' in bovespa_data.columns.get_level_values(0):
-            # MultiIndex - pega a coluna Close
-            close_prices = bovespa_data.xs('Close', axis=1, level=0)
-            if hasattr(close_prices, 'squeeze'):
-                close_prices = close_prices.squeeze()
-        else:
-
-            close_cols = [col for col in bovespa_data.columns if 'Close' in str(col)]
-            if close_cols:
-                close_prices = bovespa_data[close_cols[0]]
-                if hasattr(close_prices, 'squeeze'):
-                    close_prices = close_prices.squeeze()
-            else:
-                raise ValueError("Coluna 'Close' não encontrada nos dados do Ibovespa")
-            
-
-        bovespa_returns = close_prices.pct_change().dropna()
-        
-        if len(bovespa_returns) == 0:
-            raise ValueError("Não foi possível calcular retornos do Ibovespa")
-        
-
-        if len(bovespa_returns) < dias:
-            st.warning(f"⚠️ Apenas {len(bovespa_returns)} dias de dados disponíveis para o Ibovespa. Usando todos os dados disponíveis.")
-            retornos_utilizados = bovespa_returns
-        else:
-            retornos_utilizados = bovespa_returns.tail(dias)
-        
-        # Converte para array numpy 1D de forma segura
-        retornos_array = np.asarray(retornos_utilizados).flatten()
-        
-
-        retornos_array = retornos_array[~np.isnan(retornos_array)]
+    st.subheader("Configurações do Algoritmo")
+    
+    if motor == ENGINE_LP:
+        metodo = cruzamento = elitismo = "Não se aplica"
+        parada = "Ótimo exato do programa linear"
+    elif motor == ENGINE_NSGA2:
+        metodo = "Torneio por posto de frente e aglomeração (NSGA-II)"
+        cruzamento = "Uniforme por máscara"
+        elitismo = "Sobrevivência (μ + λ) por frentes e aglomeração"
+        parada = f"{PARAMETROS_PARETO['max_generations']} gerações"
+    else:
+        metodo = SELECOES_PAIS[selecao]
+        if selecao == GeneticAlgorithm.SelectionType.TOURNAMENT.value:
+            metodo += " (3 competidores)"
+        cruzamento = "Uniforme por máscara"
+        elitismo = "Ativo (10% melhores da geração anterior preservados)"
+        parada = (
+            f"Limiar de fitness {parametros['threshold_fitness']}, "
+            f"estagnação por {parametros['janela_estagnacao']} gerações, "
+            f"população convergida, diversidade abaixo de {parametros['diversidade_minima']} "
+            f"ou {parametros['geracoes']} gerações"
+        )
+    
+    config_cols = st.columns(2)
+    
+    with config_cols[0]:
+        st.write(f"• **Motor:** {MOTORES_OTIMIZACAO[motor]}")
+        st.write(f"• **Método de Seleção:** {metodo}")
+        st.write(f"• **Tipo de Crossover:** {cruzamento}")
         
-        if len(retornos_array) == 0:
-            raise ValueError("Nenhum retorno válido encontrado")
-            
+    with config_cols[1]:
+        st.write(f"• **Elitismo:** {elitismo}")
+        st.write(f"• **Critério de Parada:** {parada}")
 
-        valor_cumulativo = capital_inicial * np.cumprod(1 + retornos_array)
-        valor_bovespa = pd.Series(valor_cumulativo)
-        
+def descartar_job_atual():
+    """Cancela o job corrente, se ainda em andamento, e o retira da sessão.
+    
+    Sem o cancelamento, a thread de um job abandonado seguiria evoluindo
+    até o fim sem que ninguém aguardasse seu resultado.
+    """
+    job = st.session_state.jobs.pop(st.session_state.job_atual, None)
+    if job is not None and not job.done:
+        job.cancel()
+    st.session_state.job_atual = None
+    st.session_state.executando_otimizacao = False
 
-        valor_bovespa.reset_index(drop=True, inplace=True)
-        
-        return {
-            'bovespa': valor_bovespa
-        }
+def obter_job_otimizacao():
+    """Retorna o job da otimização corrente, iniciando-o se necessário.
+    
+    Returns:
+        OptimizationJob: Job registrado em ``st.session_state.jobs``
+    """
+    job_id = st.session_state.job_atual
+    if job_id is None or job_id not in st.session_state.jobs:
+        job = OptimizationJob(
+            st.session_state.acoes_selecionadas,
+            st.session_state.parametros_otimizacao,
+            st.session_state.configuracao_investimento['capital_inicial'],
+            cache=obter_cache_resultados()
+        ).start()
+        st.session_state.jobs[job.id] = job
+        st.session_state.job_atual = job.id
+        st.session_state.executando_otimizacao = True
+    return st.session_state.jobs[st.session_state.job_atual]
 
-    except ValueError as e:
-        st.error(f"❌ Erro nos parâmetros do benchmark: {str(e)}")
-        # Retorna None para indicar que não há dados disponíveis
-        return {
-            'bovespa': None
-        }
-    except Exception as e:
-        st.warning(f"⚠️ Erro ao baixar dados do Ibovespa: {str(e)}")
-        st.info("📊 **Nota:** Dados do Ibovespa não puderam ser carregados. Apenas a carteira otimizada será analisada.")
-        # Retorna None para indicar que não há dados disponíveis
-        return {
-            'bovespa': None
-        }
+@st.fragment(run_every=1.0)
+def acompanhar_otimizacao(job_id):
+    """Exibe ao vivo o progresso de um job de otimização.
+    
+    O fragmento é reexecutado a cada segundo sem bloquear a página: a
+    barra e o gráfico mostram o melhor fitness e o fitness médio de cada
+    geração concluída. Ao término do job, a página inteira é recarregada.
+    
+    Args:
+        job_id (str): Identificador do job no registro da sessão
+    """
+    job = st.session_state.jobs[job_id]
+    if job.done:
+        st.rerun()
+    
+    historico = job.history
+    if job.params.get('motor') == ENGINE_NSGA2:
+        max_geracoes = PARAMETROS_PARETO['max_generations']
+    else:
+        max_geracoes = max(job.params['max_generations'], 1)
+    st.progress(min(len(historico) / max_geracoes, 1.0))
+    
+    if historico:
+        ultima = historico[-1]
+        st.text(f"🔄 Geração {ultima.generation + 1}/{max_geracoes} - melhor fitness: {ultima.best_fitness:.4f}")
+        st.line_chart(pd.DataFrame(
+            {
+                'Melhor Fitness': [stats.best_fitness for stats in historico],
+                'Fitness Médio': [stats.mean_fitness for stats in historico]
+            },
+            index=pd.Index([stats.generation + 1 for stats in historico], name='Geração')
+        ))
+    else:
+        st.text(job.phase)
+    
+    if st.button("⏹️ Cancelar Otimização", key=f"cancelar_{job_id}"):
+        job.cancel()
+        st.info("Cancelamento solicitado: a evolução (ou o traçado da fronteira) termina ao fim da geração atual.")
 
 def executar_otimizacao_real():
-    """Executa otimização usando a implementação real do algoritmo genético.
+    """Acompanha a otimização em segundo plano e devolve seu resultado.
     
-    Baixa dados históricos reais do Yahoo Finance, executa o algoritmo genético
-    para otimizar a carteira e calcula métricas de performance.
+    A otimização roda em um ``OptimizationJob`` (thread própria), de modo
+    que a página continua responsiva; enquanto o job não termina, apenas o
+    progresso é exibido.
     
     Returns:
-        dict: Dicionário com resultados da otimização incluindo pesos, fitness,
-              métricas de risco/retorno e histórico de evolução
-              
-    Raises:
-        Exception: Erro ao baixar dados ou executar otimização
+        dict: Resultados da otimização incluindo pesos, fitness, métricas de
+              risco/retorno e histórico de evolução, ou None enquanto o job
+              estiver em andamento
     """
-    acoes = st.session_state.acoes_selecionadas
-    params = st.session_state.parametros_otimizacao
-    config = st.session_state.configuracao_investimento
+    job = obter_job_otimizacao()
+    if not job.done:
+        acompanhar_otimizacao(job.id)
+        return None
     
-    try:
-        # Marcar que otimização está sendo executada
-        st.session_state.executando_otimizacao = True
-        
-        # Barra de progresso
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        status_text.text("📊 Carregando dados históricos das ações...")
-        progress_bar.progress(20)
-        
-        # Carrega dados históricos reais
-        coletor = DataCollector(acoes)
-        returns_data = coletor.download_data()
-        
-        # Filtra apenas as colunas que correspondem às ações selecionadas (com sufixo .SA)
-        acoes_com_sufixo = [ticker + ".SA" if not ticker.endswith('.SA') else ticker for ticker in acoes]
-        acoes_disponiveis = [col for col in returns_data.columns if col in acoes_com_sufixo or col in acoes]
-        
-        if len(acoes_disponiveis) < 2:
-            raise ValueError(f"Dados insuficientes. Apenas {len(acoes_disponiveis)} ações disponíveis de {len(acoes)} selecionadas.")
-        
-
-        returns_data = returns_data[acoes_disponiveis]
-        
-
-        ticker_mapping = {}
-        for ticker in acoes:
-            ticker_sa = ticker + ".SA" if not ticker.endswith('.SA') else ticker
-            if ticker_sa in acoes_disponiveis:
-                ticker_mapping[ticker] = ticker_sa
-            elif ticker in acoes_disponiveis:
-                ticker_mapping[ticker] = ticker
-        
-
-        acoes_com_dados = list(ticker_mapping.keys())
-        
-
-        acoes_nao_carregadas = [ticker for ticker in acoes if ticker not in acoes_com_dados]
-        if acoes_nao_carregadas:
-            st.warning(f"⚠️ {len(acoes_nao_carregadas)} ação(ões) não puderam ser carregadas: {', '.join(acoes_nao_carregadas[:5])}{'...' if len(acoes_nao_carregadas) > 5 else ''}. Continuando com {len(acoes_com_dados)} ações.")
-        
-        status_text.text("🧬 Inicializando população do algoritmo genético...")
-        progress_bar.progress(40)
-        
-
-        n_acoes = len(acoes_com_dados)
-        initial_weights = {ticker: 1/n_acoes for ticker in acoes_com_dados}
-        
-
-        population = []
-        for _ in range(params['population_size']):
-
-            weights_for_portfolio = {}
-            for ticker_orig in acoes_com_dados:
-                ticker_data = ticker_mapping[ticker_orig]
-                weights_for_portfolio[ticker_data] = 1/n_acoes
-            
-            portfolio = Portfolio.random_instance(
-                weights=weights_for_portfolio,
-                returns=returns_data,
-                risk_free_rate=params['risk_free_rate']
-            )
-            population.append(portfolio)
-        
-        status_text.text("🔄 Executando evolução do algoritmo genético...")
-        progress_bar.progress(60)
-        
-
-        ga = GeneticAlgorithm(
-            population=population,
-            fitness_key=lambda p: p.fitness(),
-            max_generations=params['max_generations'],
-            mutation_rate=params['mutation_rate'],
-            crossover_rate=params['crossover_rate'],
-            selection_type=GeneticAlgorithm.SelectionType.TOURNAMENT,
-            threshold=params['threshold']
-        )
-        
-
-        best_portfolio = ga.run()
-        
-        status_text.text("📈 Calculando métricas finais...")
-        progress_bar.progress(90)
-        
-
-        pesos_otimos_raw = best_portfolio.weights
-        fitness_final = best_portfolio.fitness()
-        retorno_esperado = best_portfolio.ExpReturn
-        cvar_final = best_portfolio.cvar
-        
-
-        pesos_otimos_display = {}
-        for ticker_orig, ticker_data in ticker_mapping.items():
-            if ticker_data in pesos_otimos_raw:
-                pesos_otimos_display[ticker_orig] = pesos_otimos_raw[ticker_data]
-        
-        pesos_otimos = pd.Series(pesos_otimos_display)
-        
-        # Métricas adicionais - usa os pesos corretos alinhados com os dados
-        pesos_para_calculo = pd.Series(pesos_otimos_raw)
-        portfolio_returns = returns_data.dot(pesos_para_calculo)
-        volatilidade = portfolio_returns.std() * np.sqrt(252)
-        
-        progress_bar.progress(100)
-        status_text.text("✅ Otimização concluída!")
-        
-
-        time.sleep(1)
-        progress_bar.empty()
-        status_text.empty()
-        
-        # Simula dados de evolução se disponível
-        if hasattr(ga, 'results') and ga.results is not None:
-            fitness_hist = {
-                'melhor': ga.results['best_fitness'].tolist(),
-                'media': ga.results['mean_fitness'].tolist()
-            }
-            geracoes_executadas = len(ga.results['best_fitness'])
-        else:
-
-            geracoes_executadas = params['max_generations']
-            fitness_hist = {
-                'melhor': [fitness_final] * geracoes_executadas,
-                'media': [fitness_final * 0.8] * geracoes_executadas
-            }
-        
-
-        dias = 120
-        valor_portfolio = pd.Series(config['capital_inicial'] * np.cumprod(1 + portfolio_returns.tail(dias)))
-        
-        # Calcular benchmarks reais
-        returns_data_hash = str(hash(str(returns_data.values.tobytes())))
-        benchmarks = calcular_benchmarks(returns_data_hash, config['capital_inicial'], dias, acoes_com_dados)
-        
-        progress_bar.empty()
-        status_text.empty()
-        
-        # Marcar que otimização foi concluída
-        st.session_state.executando_otimizacao = False
-        
-        return {
-            'pesos': pesos_otimos,
-            'fitness': fitness_final,
-            'retorno_esperado': retorno_esperado,
-            'volatilidade': volatilidade,
-            'cvar': cvar_final,
-            'fitness_hist': fitness_hist,
-            'valor_portfolio': valor_portfolio,
-            'valor_bovespa': benchmarks['bovespa'] if benchmarks['bovespa'] is not None else [],
-            'datas': pd.date_range(end=datetime.now(), periods=len(valor_portfolio)),
-            'geracoes_executadas': geracoes_executadas,
-            'convergiu': fitness_final >= params['threshold']
-        }
-        
-    except Exception as e:
-        # Marcar que otimização foi concluída (mesmo com erro)
-        st.session_state.executando_otimizacao = False
-        
-        progress_bar.empty()
-        status_text.empty()
-        st.error(f"❌ **Erro na otimização:** {str(e)}")
+    st.session_state.executando_otimizacao = False
+    
+    # O desfecho é exibido agora e o resultado passa a ``resultado_otimizacao``:
+    # os jobs concluídos (este e os abandonados) saem do registro da sessão,
+    # e uma nova tentativa após erro inicia outro job
+    st.session_state.jobs = {
+        job_id: registrado for job_id, registrado in st.session_state.jobs.items() if not registrado.done
+    }
+    st.session_state.job_atual = None
+    
+    if job.status == OptimizationJob.Status.FAILED:
+        st.error(f"❌ **Erro na otimização:** {str(job.error)}")
         st.error("🔄 **Solução:** Verifique sua conexão com a internet e tente novamente.")
         
         # Não usa fallback simulado - força o usuário a resolver o problema
         st.stop()
+    
+    resultado = job.result
+    acoes_nao_carregadas = resultado['acoes_nao_carregadas']
+    if acoes_nao_carregadas:
+        st.warning(f"⚠️ {len(acoes_nao_carregadas)} ação(ões) não puderam ser carregadas: {', '.join(acoes_nao_carregadas[:5])}{'...' if len(acoes_nao_carregadas) > 5 else ''}. Continuando com {len(job.tickers) - len(acoes_nao_carregadas)} ações.")
+        if resultado['falhas_download']:
+            with st.expander("Detalhes das falhas de download"):
+                for ticker, motivo in resultado['falhas_download'].items():
+                    st.write(f"• {ticker}: {motivo}")
+    if resultado['em_cache']:
+        st.info("♻️ Resultado recuperado de uma execução anterior com os mesmos dados e parâmetros.")
+    if job.status == OptimizationJob.Status.CANCELLED:
+        st.warning("⏹️ Otimização cancelada: exibindo a melhor carteira encontrada até o cancelamento.")
+    if len(resultado['valor_bovespa']) == 0:
+        st.warning("⚠️ Série do Ibovespa indisponível nos dados coletados. Apenas a carteira otimizada será analisada.")
+    return resultado
 
 def mostrar_resultados():
     """Exibe os resultados da otimização com visualizações interativas.
@@ -741,7 +597,10 @@ def mostrar_resultados():
 
     if (st.session_state.resultado_otimizacao is None or 
         'valor_bovespa' not in st.session_state.resultado_otimizacao):
-        st.session_state.resultado_otimizacao = executar_otimizacao_real()
+        resultado = executar_otimizacao_real()
+        if resultado is None:
+            return
+        st.session_state.resultado_otimizacao = resultado
     
     resultado = st.session_state.resultado_otimizacao
     config = st.session_state.configuracao_investimento
@@ -777,7 +636,7 @@ def mostrar_resultados():
         st.metric("Carteira Otimizada", f"R$ {valor_final_otimizado:,.2f}", f"R$ {ganho_otimizado:,.2f}")
     
 
-    tab1, tab2, tab3, tab4 = st.tabs(["Alocação", "Performance", "Evolução AG", "Ibovespa"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Alocação", "Performance", "Evolução AG", "Ibovespa", "Fronteira Eficiente"])
     
     with tab1:
         col1, col2 = st.columns([1, 1])
@@ -887,29 +746,41 @@ def mostrar_resultados():
     with tab3:
         st.subheader("Evolução do Algoritmo Genético")
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        geracoes = range(1, len(resultado['fitness_hist']['melhor']) + 1)
-        ax.plot(geracoes, resultado['fitness_hist']['melhor'], 
-               label="Melhor Fitness", color="blue", linewidth=2)
-        ax.plot(geracoes, resultado['fitness_hist']['media'], 
-               label="Fitness Médio", color="orange", linestyle="--", alpha=0.7)
-        ax.set_title("Evolução do Fitness por Geração")
-        ax.set_xlabel("Geração")
-        ax.set_ylabel("Fitness")
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        st.pyplot(fig)
-        plt.close(fig)  # Clean up memory
+        if resultado['fitness_hist']['melhor']:
+            fig, ax = plt.subplots(figsize=(12, 6))
+            geracoes = range(1, len(resultado['fitness_hist']['melhor']) + 1)
+            ax.plot(geracoes, resultado['fitness_hist']['melhor'], 
+                   label="Melhor Fitness", color="blue", linewidth=2)
+            ax.plot(geracoes, resultado['fitness_hist']['media'], 
+                   label="Fitness Médio", color="orange", linestyle="--", alpha=0.7)
+            if resultado.get('fitness_otimo') is not None:
+                ax.axhline(y=resultado['fitness_otimo'], color='green', linestyle=':', label="Ótimo Exato (PL)")
+            ax.set_title("Evolução do Fitness por Geração")
+            ax.set_xlabel("Geração")
+            ax.set_ylabel("Fitness")
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+            st.pyplot(fig)
+            plt.close(fig)  # Clean up memory
+        else:
+            st.info("📐 Carteira obtida pela solução exata por programação linear: não há evolução por gerações.")
         
 
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Melhor Fitness", f"{max(resultado['fitness_hist']['melhor']):.3f}")
+            st.metric("Melhor Fitness", f"{resultado['fitness']:.3f}")
+            if resultado.get('fitness_otimo') is not None:
+                distancia = resultado['fitness_otimo'] - resultado['fitness']
+                st.caption(f"Ótimo exato: {resultado['fitness_otimo']:.4f} (distância: {distancia:.2e})")
         with col2:
             st.metric("Gerações Executadas", f"{resultado['geracoes_executadas']}")
         with col3:
+            motivo = resultado.get('motivo_parada')
+            st.metric("Critério de Parada", MOTIVOS_PARADA.get(motivo, "—"))
             convergencia = "✅ Sim" if resultado['convergiu'] else "❌ Não"
-            st.metric("Convergiu", convergencia)
+            st.caption(f"Limiar de fitness atingido: {convergencia}")
+        if resultado.get('versao_dados'):
+            st.caption(f"Versão dos dados de retorno: `{resultado['versao_dados'][:12]}`")
     
     with tab4:
         st.subheader("Evolução do Índice Ibovespa")
@@ -973,6 +844,69 @@ def mostrar_resultados():
             - Período de simulação muito recente
             - Feriados ou fins de semana
             """)
+    
+    with tab5:
+        st.subheader("Fronteira Eficiente: Retorno x Risco de Cauda")
+        
+        fronteira = resultado.get('fronteira')
+        pareto = resultado.get('pareto')
+        if pareto is not None and len(pareto) > 0:
+            fig, ax = plt.subplots(figsize=(12, 6))
+            
+            ax.scatter(-pareto['cvar'] * 100, pareto['retorno_esperado'] * 100,
+                      color='#1f77b4', s=25, label='Frente de Pareto (NSGA-II)')
+            ax.scatter([-resultado['cvar'] * 100], [resultado['retorno_esperado'] * 100],
+                      color='red', marker='*', s=250, label=f"Carteira do Perfil {st.session_state.get('perfil_investimento', '')}", zorder=3)
+            
+            ax.set_title("Frente de Pareto Retorno x CVaR")
+            ax.set_xlabel("Perda Média na Cauda - CVaR 95% (% ao dia)")
+            ax.set_ylabel("Retorno Esperado (% ao dia)")
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+            
+            st.pyplot(fig)
+            plt.close(fig)
+            st.caption(
+                f"{len(pareto)} carteiras não dominadas obtidas em uma única evolução, compartilhada por todos os perfis; "
+                "cada perfil escolhe a de maior fitness para a sua aversão ao risco (peso do CVaR)."
+            )
+        
+        if fronteira is not None and len(fronteira) > 0:
+            fig, ax = plt.subplots(figsize=(12, 6))
+            
+            # Risco como perda média nos piores dias (CVaR com sinal trocado)
+            escala = ax.scatter(-fronteira['cvar'] * 100, fronteira['retorno_esperado'] * 100,
+                               c=fronteira['aversao_risco'], cmap='viridis', s=30, label='Fronteira')
+            ax.plot(-fronteira['cvar'] * 100, fronteira['retorno_esperado'] * 100, color='gray', alpha=0.4)
+            ax.scatter([-resultado['cvar'] * 100], [resultado['retorno_esperado'] * 100],
+                      color='red', marker='*', s=250, label='Carteira Otimizada', zorder=3)
+            fig.colorbar(escala, ax=ax, label='Peso do CVaR (aversão ao risco)')
+            
+            ax.set_title("Fronteira Eficiente Média-CVaR")
+            ax.set_xlabel("Perda Média na Cauda - CVaR 95% (% ao dia)")
+            ax.set_ylabel("Retorno Esperado (% ao dia)")
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+            
+            st.pyplot(fig)
+            plt.close(fig)
+            
+            df_fronteira = pd.DataFrame({
+                'Aversão ao Risco': fronteira['aversao_risco'],
+                'Retorno Esperado (%)': fronteira['retorno_esperado'] * 100,
+                'CVaR (%)': fronteira['cvar'] * 100,
+                'Volatilidade Anual (%)': fronteira['volatilidade'] * 100,
+                'Fitness': fronteira['fitness']
+            })
+            st.dataframe(df_fronteira.round(4), use_container_width=True)
+            st.download_button(
+                label="📥 Exportar Fronteira (CSV)",
+                data=fronteira.to_csv(index=False),
+                file_name=f"fronteira_eficiente_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                mime="text/csv"
+            )
+        elif pareto is None:
+            st.info(f"🗺️ Marque \"Traçar fronteira eficiente\" na etapa de parâmetros para calcular {PONTOS_FRONTEIRA} carteiras entre máximo retorno e mínimo CVaR.")
 
     st.divider()
     
@@ -982,6 +916,7 @@ def mostrar_resultados():
         if st.button("🔄 Nova Otimização", use_container_width=True):
             st.session_state.etapa_atual = 1
             st.session_state.resultado_otimizacao = None
+            descartar_job_atual()
             st.session_state.acoes_selecionadas = []
             st.session_state.configuracao_investimento = None
             st.session_state.parametros_otimizacao = None
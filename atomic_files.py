@@ -0,0 +1,36 @@
+"""
+Módulo contendo a gravação atômica de arquivos.
+
+O conteúdo é gravado em um temporário exclusivo (``tempfile.mkstemp``) no
+mesmo diretório e só então substitui o arquivo final com ``os.replace``:
+leitores, inclusive outros processos e mapeamentos em memória abertos,
+veem sempre a versão anterior ou a nova, nunca um arquivo pela metade.
+"""
+
+from typing import IO, Callable
+import os
+import tempfile
+
+
+def replace_atomically(path: str, write: Callable[[IO], None], binary: bool = False) -> None:
+    """
+    Grava um arquivo por um temporário exclusivo no mesmo diretório.
+    
+    O conteúdo só substitui o arquivo (``os.replace``) depois de gravado por
+    inteiro; em caso de erro, o temporário é removido e o arquivo anterior
+    permanece.
+    
+    Args:
+        path: Caminho do arquivo final
+        write: Função que grava o conteúdo no arquivo aberto
+        binary: Se o arquivo deve ser aberto em modo binário
+    """
+    directory, name = os.path.split(path)
+    descriptor, temporary = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory or None)
+    try:
+        with os.fdopen(descriptor, 'wb' if binary else 'w', encoding=None if binary else 'utf-8') as file:
+            write(file)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
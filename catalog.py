@@ -0,0 +1,191 @@
+"""
+Módulo contendo o cadastro indexado das empresas listadas.
+
+O ``CompanyCatalog`` lê o arquivo de empresas uma única vez para colunas
+(tickers, nomes, setores e preços) e monta os índices ticker → linha e
+setor → linhas. Consultas de nome e setor por ticker são O(1) e filtros por
+setor são operações vetorizadas, de modo que a tela de seleção continue
+instantânea mesmo com milhares de ativos (B3 completa e BDRs).
+"""
+
+from typing import Dict, Iterable, List
+import numpy as np
+import pandas as pd
+
+COMPANIES_FILE = "data/empresas_br_bovespa.csv"
+
+
+class CompanyCatalog:
+    """
+    Cadastro de empresas em formato colunar, indexado por ticker e setor.
+    
+    A ordem das linhas segue o arquivo; tickers repetidos mantêm apenas a
+    primeira ocorrência. Empresas sem setor aparecem como ``NO_SECTOR``
+    nas consultas, mas não entram na lista de setores.
+    """
+    
+    NO_SECTOR = "Sem Setor"
+    
+    # Colunas obrigatórias do arquivo de empresas (o preço é opcional)
+    REQUIRED_COLUMNS = ('Ticker', 'Nome', 'Setor')
+    
+    def __init__(self, companies: pd.DataFrame) -> None:
+        """
+        Inicializa o cadastro.
+        
+        Args:
+            companies: Tabela com as colunas ``Ticker``, ``Nome``, ``Setor`` e,
+                opcionalmente, ``Preço``
+        
+        Raises:
+            KeyError: Coluna obrigatória ausente
+        """
+        missing = [column for column in self.REQUIRED_COLUMNS if column not in companies.columns]
+        if missing:
+            raise KeyError(f"Coluna(s) obrigatória(s) ausente(s) no cadastro: {', '.join(missing)}")
+        companies = companies.drop_duplicates(subset='Ticker', keep='first')
+        
+        self.tickers: np.ndarray = companies['Ticker'].astype(str).to_numpy()
+        self.names: np.ndarray = companies['Nome'].astype(object).to_numpy()
+        prices = companies['Preço'] if 'Preço' in companies.columns else pd.Series(np.nan, index=companies.index)
+        self.prices: np.ndarray = pd.to_numeric(prices, errors='coerce').to_numpy(dtype=np.float64)
+        
+        # Setores como categorias: códigos inteiros (-1 = sem setor) e nomes ordenados
+        sectors = pd.Categorical(companies['Setor'].where(companies['Setor'].notna() & (companies['Setor'] != '')))
+        self._sector_codes: np.ndarray = sectors.codes
+        self._sector_names: List[str] = [str(sector) for sector in sectors.categories]
+        self.sectors: np.ndarray = np.append(np.array(self._sector_names, dtype=object), self.NO_SECTOR)[self._sector_codes]
+        
+        self._rows: Dict[str, int] = {ticker: row for row, ticker in enumerate(self.tickers)}
+        order = np.argsort(self._sector_codes, kind='stable')
+        bounds = np.searchsorted(self._sector_codes[order], np.arange(len(self._sector_names) + 1))
+        self._sector_rows: Dict[str, np.ndarray] = {
+            sector: order[bounds[code]:bounds[code + 1]] for code, sector in enumerate(self._sector_names)
+        }
+    
+    @classmethod
+    def from_csv(cls, path: str = COMPANIES_FILE) -> 'CompanyCatalog':
+        """
+        Carrega o cadastro de um arquivo CSV.
+        
+        Args:
+            path: Caminho do arquivo de empresas
+        
+        Returns:
+            CompanyCatalog: Cadastro indexado
+        
+        Raises:
+            FileNotFoundError: Arquivo inexistente
+            pd.errors.EmptyDataError: Arquivo vazio
+            KeyError: Coluna obrigatória ausente
+        """
+        companies = pd.read_csv(path)
+        if companies.empty:
+            raise pd.errors.EmptyDataError("Arquivo CSV está vazio")
+        return cls(companies)
+    
+    @property
+    def sector_names(self) -> List[str]:
+        """Retorna os setores do cadastro, em ordem alfabética."""
+        return list(self._sector_names)
+    
+    def row(self, ticker: str) -> int:
+        """Retorna a linha de um ticker (None se não estiver no cadastro)."""
+        return self._rows.get(ticker)
+    
+    def name(self, ticker: str) -> str:
+        """Retorna o nome da empresa, ou o próprio ticker se não cadastrado."""
+        row = self._rows.get(ticker)
+        return ticker if row is None else self.names[row]
+    
+    def sector(self, ticker: str) -> str:
+        """Retorna o setor da empresa, ou ``NO_SECTOR`` se ausente."""
+        row = self._rows.get(ticker)
+        return self.NO_SECTOR if row is None else self.sectors[row]
+    
+    def label(self, ticker: str) -> str:
+        """Retorna a descrição ``TICKER - Nome (Setor)`` usada na seleção."""
+        return f"{ticker} - {self.name(ticker)} ({self.sector(ticker)})"
+    
+    def rows_in(self, sectors: Iterable[str] = None) -> np.ndarray:
+        """
+        Retorna as linhas das empresas de um ou mais setores, na ordem do arquivo.
+        
+        Args:
+            sectors: Setores desejados (None para todas as empresas)
+        
+        Returns:
+            np.ndarray: Posições das linhas no cadastro
+        
+        Raises:
+            KeyError: Setor inexistente no cadastro
+        """
+        if sectors is None:
+            return np.arange(len(self.tickers))
+        sectors = [sectors] if isinstance(sectors, str) else list(sectors)
+        unknown = [sector for sector in sectors if sector not in self._sector_rows]
+        if unknown:
+            raise KeyError(f"Setor(es) inexistente(s) no cadastro: {', '.join(unknown)}")
+        if not sectors:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate([self._sector_rows[sector] for sector in sectors]))
+    
+    def tickers_in(self, sectors: Iterable[str] = None) -> List[str]:
+        """
+        Retorna os tickers de um ou mais setores, na ordem do arquivo.
+        
+        Args:
+            sectors: Setores desejados (None para todas as empresas)
+        
+        Returns:
+            List[str]: Tickers dos setores
+        
+        Raises:
+            KeyError: Setor inexistente no cadastro
+        """
+        return self.tickers[self.rows_in(sectors)].tolist()
+    
+    def _rows_of(self, tickers: Iterable[str]) -> np.ndarray:
+        """Retorna as linhas dos tickers, com -1 para os que não estão no cadastro."""
+        return np.fromiter((self._rows.get(ticker, -1) for ticker in tickers), dtype=np.intp)
+    
+    def sector_counts(self, tickers: Iterable[str]) -> pd.Series:
+        """
+        Conta os tickers de cada setor.
+        
+        Args:
+            tickers: Tickers a contar (tickers fora do cadastro contam como ``NO_SECTOR``)
+        
+        Returns:
+            pd.Series: Quantidade por setor, em ordem decrescente
+        """
+        # A posição extra (-1) corresponde aos tickers fora do cadastro
+        sectors = np.append(self.sectors, self.NO_SECTOR)[self._rows_of(tickers)]
+        return pd.Series(sectors, dtype=object).value_counts()
+    
+    def table(self, sectors: Iterable[str] = None) -> pd.DataFrame:
+        """
+        Monta a tabela de exibição das empresas de um ou mais setores.
+        
+        Args:
+            sectors: Setores desejados (None para todas as empresas)
+        
+        Returns:
+            pd.DataFrame: Colunas ``Código``, ``Nome``, ``Setor`` e ``Preço (R$)``
+        """
+        rows = self.rows_in(sectors)
+        return pd.DataFrame({
+            'Código': self.tickers[rows],
+            'Nome': self.names[rows],
+            'Setor': self.sectors[rows],
+            'Preço (R$)': self.prices[rows]
+        })
+    
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._rows
+    
+    def __len__(self) -> int:
+        return len(self.tickers)
+    
+    def __repr__(self) -> str:
+        return f"CompanyCatalog({len(self)} empresas, {len(self._sector_names)} setores)"
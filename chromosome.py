@@ -6,6 +6,7 @@ para serem utilizados no algoritmo genético.
 """
 
 from abc import ABC, abstractmethod
+from copy import deepcopy
 from typing import TypeVar, Tuple
 
 T = TypeVar('T', bound='Chromosome')
@@ -18,6 +19,8 @@ class Chromosome(ABC):
     por qualquer cromossomo utilizado no algoritmo genético.
     """
     
+    __slots__ = ()
+    
     @abstractmethod
     def fitness(self) -> float:
         """
@@ -50,6 +53,19 @@ class Chromosome(ABC):
         """
         pass
 
+    def copy(self: T) -> T:
+        """
+        Cria uma cópia independente do cromossomo.
+        
+        Mutações na cópia não devem alterar o original. A implementação
+        padrão faz uma cópia profunda; subclasses podem sobrescrevê-la com
+        uma cópia mais barata.
+        
+        Returns:
+            T: Novo cromossomo com os mesmos genes
+        """
+        return deepcopy(self)
+
     @classmethod
     @abstractmethod
     def random_instance(cls) -> T:
@@ -60,3 +76,16 @@ class Chromosome(ABC):
             T: Nova instância aleatória do cromossomo
         """
         pass
+    
+    @classmethod
+    def fitness_stats(cls) -> dict:
+        """
+        Retorna os contadores de avaliações de fitness do tipo de cromossomo.
+        
+        Cromossomos que contam suas avaliações sobrescrevem este método com
+        um dicionário contendo ``evaluations`` e ``cache_hits``.
+        
+        Returns:
+            dict: Contadores de avaliações, ou None se não houver contagem
+        """
+        return None
@@ -0,0 +1,281 @@
+"""
+Linha de comando para otimizar carteiras sem a interface web.
+
+Executa o mesmo fluxo da interface (``optimization_service``) a partir de
+uma lista de tickers ou de setores do cadastro de empresas e grava os pesos
+e as métricas em JSON ou CSV. Não importa o Streamlit nem o matplotlib,
+podendo ser agendada (cron, filas de lote) para reotimizações periódicas.
+A saída padrão traz apenas o documento de resultado; avisos e mensagens
+das bibliotecas de download vão para a saída de erro.
+
+Exemplos:
+    python -m cli --tickers PETR4 VALE3 ITUB4 --profile Moderado
+    python -m cli --sector "Serviços Financeiros" --start 2024-01-01 --output carteira.csv
+"""
+
+from datetime import datetime, timedelta
+from contextlib import redirect_stdout
+from typing import List
+import argparse
+import json
+import os
+import sys
+import pandas as pd
+from catalog import COMPANIES_FILE, CompanyCatalog
+from data_collector import DataCollector
+from download_scheduler import DownloadScheduler
+from optimization_service import ENGINE_GA, ENGINE_LP, ENGINE_NSGA2, SELECTION_TYPES, run_optimization
+from price_sources import LocalFileSource, SyntheticSource, YFinanceSource
+from price_store import PriceStore
+from profiles import PERFIS_INVESTIMENTO, optimization_params
+from result_cache import ResultCache
+
+# Métricas escalares do resultado gravadas na saída
+METRICS = ('fitness', 'fitness_otimo', 'retorno_esperado', 'volatilidade', 'cvar', 'geracoes_executadas', 'motivo_parada', 'versao_dados')
+
+
+def select_tickers(tickers: List[str] = None, sectors: List[str] = None, companies_file: str = COMPANIES_FILE) -> List[str]:
+    """
+    Resolve os tickers a otimizar.
+    
+    Args:
+        tickers: Tickers informados explicitamente
+        sectors: Setores do cadastro cujas empresas devem ser incluídas
+        companies_file: Arquivo CSV do cadastro de empresas
+    
+    Returns:
+        List[str]: Tickers sem repetição, na ordem informada
+    
+    Raises:
+        ValueError: Setor inexistente no cadastro
+    """
+    selected = list(tickers or [])
+    if sectors:
+        catalog = CompanyCatalog.from_csv(companies_file)
+        unknown = sorted(set(sectors) - set(catalog.sector_names))
+        if unknown:
+            raise ValueError(f"Setor(es) inexistente(s) no cadastro: {', '.join(unknown)}")
+        selected.extend(catalog.tickers_in(sectors))
+    return list(dict.fromkeys(selected))
+
+
+def build_collector(args: argparse.Namespace, tickers: List[str]) -> DataCollector:
+    """
+    Cria o coletor de dados conforme a fonte de preços escolhida.
+    
+    O armazém local guarda apenas preços do Yahoo Finance: é o mesmo lido pela
+    interface web, que não pode receber preços sintéticos ou de arquivos.
+    """
+    store = None
+    if args.prices_dir:
+        source = LocalFileSource(args.prices_dir)
+    elif args.synthetic is not None:
+        source = SyntheticSource(seed=args.synthetic)
+    else:
+        source = DownloadScheduler(YFinanceSource())
+        store = None if args.no_store else PriceStore()
+    return DataCollector(tickers, start=args.start, end=args.end, store=store, source=source)
+
+
+def result_document(result: dict, tickers: List[str], args: argparse.Namespace, params: dict) -> dict:
+    """
+    Converte o resultado da otimização em um documento serializável em JSON.
+    
+    Args:
+        result: Resultado de ``run_optimization``
+        tickers: Tickers pedidos
+        args: Argumentos da linha de comando
+        params: Parâmetros do algoritmo genético usados
+    
+    Returns:
+        dict: Pesos, métricas, parâmetros, avisos da execução e, se
+        calculadas, a fronteira eficiente e a frente de Pareto (um registro
+        por carteira)
+    """
+    document = {
+        'perfil': args.profile,
+        'inicio': args.start.strftime('%Y-%m-%d'),
+        'fim': args.end.strftime('%Y-%m-%d'),
+        'capital_inicial': args.capital,
+        'tickers': tickers,
+        'parametros': params,
+        'pesos': {ticker: float(weight) for ticker, weight in result['pesos'].items()},
+        'acoes_nao_carregadas': result['acoes_nao_carregadas'],
+        'falhas_download': result['falhas_download'],
+        'em_cache': result['em_cache']
+    }
+    for table in ('fronteira', 'pareto'):
+        if result.get(table) is not None:
+            document[table] = result[table].to_dict(orient='records')
+    for metric in METRICS:
+        value = result[metric]
+        document[metric] = value if value is None or isinstance(value, (str, int)) else float(value)
+    return document
+
+
+def write_output(document: dict, output: str = None, file_format: str = None) -> None:
+    """
+    Grava o documento de resultado em JSON ou CSV.
+    
+    No CSV cada linha é um ativo com seu peso, seguido das métricas da
+    carteira, de modo que arquivos de várias execuções possam ser
+    concatenados.
+    
+    Args:
+        document: Documento de ``result_document``
+        output: Caminho do arquivo (padrão: saída padrão)
+        file_format: ``'json'`` ou ``'csv'`` (padrão: extensão do arquivo, ou JSON)
+    """
+    if file_format is None:
+        file_format = 'csv' if output and output.lower().endswith('.csv') else 'json'
+    if output:
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    if file_format == 'csv':
+        frame = pd.DataFrame({'ticker': list(document['pesos']), 'peso': list(document['pesos'].values())})
+        for metric in ('perfil', 'inicio', 'fim') + METRICS:
+            frame[metric] = document[metric]
+        frame.to_csv(output if output else sys.stdout, index=False)
+    else:
+        text = json.dumps(document, ensure_ascii=False, indent=2)
+        if output:
+            with open(output, 'w', encoding='utf-8') as handle:
+                handle.write(text + "\n")
+        else:
+            print(text)
+
+
+def _date(value: str) -> datetime:
+    """Converte uma data AAAA-MM-DD dos argumentos."""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida (use AAAA-MM-DD): {value}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Cria o analisador dos argumentos da linha de comando."""
+    today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="Otimiza uma carteira de ações com o algoritmo genético, sem a interface web."
+    )
+    selection = parser.add_argument_group("seleção de ativos")
+    selection.add_argument("--tickers", nargs="+", metavar="TICKER", help="Tickers a otimizar (ex.: PETR4 VALE3)")
+    selection.add_argument("--sector", action="append", dest="sectors", metavar="SETOR",
+                           help="Inclui as empresas de um setor do cadastro (pode ser repetido)")
+    selection.add_argument("--companies", default=COMPANIES_FILE, help="Arquivo CSV do cadastro de empresas")
+    
+    data = parser.add_argument_group("dados")
+    data.add_argument("--start", type=_date, default=today - timedelta(days=180), help="Data de início (AAAA-MM-DD)")
+    data.add_argument("--end", type=_date, default=today, help="Data de fim, exclusiva (AAAA-MM-DD)")
+    data.add_argument("--prices-dir", help="Lê os preços de um diretório local (CSV/Parquet por ticker)")
+    data.add_argument("--synthetic", type=int, metavar="SEMENTE", help="Usa preços sintéticos com a semente informada")
+    data.add_argument("--no-store", action="store_true", help="Não usa o armazém local de preços (usado só com o Yahoo Finance)")
+    
+    optimization = parser.add_argument_group("otimização")
+    optimization.add_argument("--profile", default="Moderado", choices=list(PERFIS_INVESTIMENTO), help="Perfil de investimento")
+    optimization.add_argument("--capital", type=float, default=10000.0, help="Valor inicial do investimento")
+    optimization.add_argument("--engine", default=ENGINE_GA, choices=(ENGINE_GA, ENGINE_NSGA2, ENGINE_LP),
+                              help="Motor de otimização: algoritmo genético, frente de Pareto (NSGA-II) ou solução exata por programação linear")
+    optimization.add_argument("--selection", choices=SELECTION_TYPES,
+                              help="Seleção de pais do algoritmo genético: torneio (padrão), roleta, ranking ou truncamento")
+    optimization.add_argument("--compare-optimum", action="store_true",
+                              help="Resolve também o programa linear para informar o fitness ótimo (fitness_otimo)")
+    optimization.add_argument("--seed", type=int, default=42, help="Semente da otimização")
+    optimization.add_argument("--frontier-points", type=int, metavar="PONTOS",
+                              help="Traça a fronteira eficiente com o número de pontos informado (apenas na saída JSON)")
+    optimization.add_argument("--population-size", type=int, help="Tamanho da população")
+    optimization.add_argument("--generations", type=int, help="Número máximo de gerações")
+    optimization.add_argument("--mutation-rate", type=float, help="Taxa de mutação")
+    optimization.add_argument("--crossover-rate", type=float, help="Taxa de cruzamento")
+    optimization.add_argument("--threshold", type=float, help="Limiar de fitness para parada antecipada")
+    optimization.add_argument("--risk-aversion", type=float,
+                              help="Aversão ao risco: peso do CVaR no fitness (padrão: a do perfil)")
+    optimization.add_argument("--workers", type=int, metavar="PROCESSOS",
+                              help="Avalia o fitness do algoritmo genético em um pool com o número de processos informado")
+    optimization.add_argument("--islands", type=int, metavar="ILHAS",
+                              help="Reparte a população do algoritmo genético em ilhas com migração periódica")
+    optimization.add_argument("--no-cache", action="store_true", help="Não consulta nem grava o cache de resultados")
+    
+    output = parser.add_argument_group("saída")
+    output.add_argument("--output", "-o", help="Arquivo de saída (padrão: saída padrão)")
+    output.add_argument("--format", choices=("json", "csv"), help="Formato da saída (padrão: pela extensão, ou JSON)")
+    return parser
+
+
+def _optimize(args: argparse.Namespace) -> dict:
+    """
+    Executa a otimização pedida e monta o documento de resultado.
+    
+    Falhas de download são avisadas na saída de erro; a otimização segue
+    com os tickers obtidos.
+    
+    Args:
+        args: Argumentos da linha de comando
+    
+    Returns:
+        dict: Documento de ``result_document``
+    """
+    tickers = select_tickers(args.tickers, args.sectors, args.companies)
+    params = optimization_params(
+        args.profile,
+        semente=args.seed,
+        motor=args.engine,
+        selecao=args.selection,
+        comparar_otimo=args.compare_optimum or None,
+        pontos_fronteira=args.frontier_points,
+        population_size=args.population_size,
+        max_generations=args.generations,
+        mutation_rate=args.mutation_rate,
+        crossover_rate=args.crossover_rate,
+        threshold=args.threshold,
+        risk_aversion=args.risk_aversion,
+        processos=args.workers,
+        ilhas=args.islands
+    )
+    result = run_optimization(
+        tickers,
+        params,
+        args.capital,
+        collector=build_collector(args, tickers),
+        cache=None if args.no_cache else ResultCache()
+    )
+    for ticker, reason in result['falhas_download'].items():
+        print(f"Aviso: falha ao baixar {ticker}: {reason}", file=sys.stderr)
+    return result_document(result, tickers, args, params)
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Executa a linha de comando.
+    
+    Args:
+        argv: Argumentos (padrão: ``sys.argv[1:]``)
+    
+    Returns:
+        int: Código de saída (0 em caso de sucesso)
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.tickers and not args.sectors:
+        parser.error("informe --tickers e/ou --sector")
+    if args.end <= args.start:
+        parser.error("a data de fim deve ser posterior à data de início")
+    
+    try:
+        # Qualquer texto impresso durante a coleta e a otimização (ex.: progresso
+        # do yfinance) iria corromper o JSON na saída padrão
+        with redirect_stdout(sys.stderr):
+            document = _optimize(args)
+        write_output(document, args.output, args.format)
+    except Exception as e:
+        print(f"Erro na otimização: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,12 +3,48 @@ Módulo para coleta e processamento de dados financeiros.
 
 Este módulo contém classes e funções para baixar dados históricos
 de ações do Yahoo Finance e processá-los para uso no algoritmo genético.
+
+O cache de sessão do Streamlit só é usado quando a interface web já o
+carregou; na linha de comando o módulo não importa o Streamlit.
 """
 
+from functools import wraps
+import sys
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-import streamlit as st
+from download_scheduler import DownloadReport
+from price_store import PriceStore
+from price_sources import PriceSource, YFinanceSource
+from market_data import MarketData
+
+# Dias já armazenados baixados de novo junto de cada trecho ausente: os
+# fechamentos ajustados são comparados para detectar reajustes do histórico
+OVERLAP_DAYS = 7
+
+# Diferença relativa a partir da qual o histórico armazenado é considerado
+# em outra base de ajuste (desdobramento ou provento posterior)
+ADJUSTMENT_TOLERANCE = 1e-6
+
+def _session_cache(function):
+    """
+    Aplica ``st.cache_data`` à função quando o Streamlit está carregado.
+    
+    A decisão é tomada na primeira chamada: dentro da interface web o
+    resultado fica no cache da sessão; fora dela a função é chamada
+    diretamente, sem importar o Streamlit.
+    """
+    cached = None
+    
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        nonlocal cached
+        if cached is None:
+            streamlit = sys.modules.get('streamlit')
+            cached = streamlit.cache_data(function) if streamlit is not None else function
+        return cached(*args, **kwargs)
+    return wrapper
 
 def add_suffix(ticker: str) -> str:
     """Adiciona sufixo .SA aos tickers brasileiros."""
@@ -20,7 +56,33 @@ def create_tickers_array(tickers: list) -> list:
     """Converte lista de tickers adicionando sufixo .SA."""
     return [add_suffix(ticker) for ticker in tickers]
 
-@st.cache_data
+def _with_suffix(tickers: tuple, benchmark: str) -> list:
+    """Adiciona o sufixo .SA aos tickers que ainda não o possuem, exceto ao benchmark."""
+    return [
+        add_suffix(ticker) if not ticker.endswith('.SA') and ticker != benchmark else ticker
+        for ticker in tickers
+    ]
+
+def _download_closes(all_tickers: list, start: datetime, end: datetime) -> pd.DataFrame:
+    """
+    Baixa os preços de fechamento ajustados do yfinance.
+    
+    Args:
+        all_tickers: Códigos completos dos ativos (com sufixo)
+        start: Data de início
+        end: Data de fim
+        
+    Returns:
+        pd.DataFrame: Fechamentos ajustados, uma coluna por ticker obtido
+    """
+    return YFinanceSource(download=yf.download).fetch_closes(all_tickers, start, end)
+
+def _closes_to_returns(adj_close: pd.DataFrame) -> pd.DataFrame:
+    """Remove colunas incompletas e converte fechamentos em variações percentuais."""
+    adj_close = adj_close.dropna(axis=1)
+    return adj_close.pct_change().dropna()
+
+@_session_cache
 def _download_data_cached(tickers: tuple, benchmark: str, start: datetime, end: datetime) -> pd.DataFrame:
     """
     Função cached para download de dados do yfinance.
@@ -38,30 +100,32 @@ def _download_data_cached(tickers: tuple, benchmark: str, start: datetime, end:
         Exception: Erro ao baixar dados do yfinance ou processar dados
     """
     try:
-        tickers_with_suffix = []
-        for ticker in tickers:
-            if not ticker.endswith('.SA') and ticker != benchmark:
-                tickers_with_suffix.append(add_suffix(ticker))
-            else:
-                tickers_with_suffix.append(ticker)
+        all_tickers = _with_suffix(tickers, benchmark) + [benchmark]
+        return _closes_to_returns(_download_closes(all_tickers, start, end))
+        
+    except Exception as e:
+        raise Exception(f"Erro ao baixar dados históricos: {str(e)}")
+
+@_session_cache
+def _download_closes_cached(tickers: tuple, benchmark: str, start: datetime, end: datetime) -> pd.DataFrame:
+    """
+    Função cached para download dos fechamentos dos ativos e do benchmark.
+    
+    Args:
+        tickers: Tupla com códigos dos ativos
+        benchmark: Código do benchmark
+        start: Data de início
+        end: Data de fim
         
-        all_tickers = tickers_with_suffix + [benchmark]
-        data = yf.download(all_tickers, start=start, end=end, group_by="ticker", auto_adjust=True)
-        adj_close = pd.DataFrame()
+    Returns:
+        pd.DataFrame: Fechamentos ajustados dos ativos e do benchmark
         
-        for ticker in all_tickers:
-            try:
-                if len(all_tickers) == 1:
-                    adj_close[ticker] = data['Close']
-                else:
-                    adj_close[ticker] = data[ticker]['Close']
-            except (KeyError, TypeError) as e:
-                print(f"Erro ao processar ticker {ticker}: {e}")
-                continue
-        
-        # Remove colunas com muitos NaNs e retorna variações percentuais
-        adj_close.dropna(axis=1, inplace=True)
-        return adj_close.pct_change().dropna()
+    Raises:
+        Exception: Erro ao baixar dados do yfinance
+    """
+    try:
+        all_tickers = _with_suffix(tickers, benchmark) + [benchmark]
+        return _download_closes(all_tickers, start, end)
         
     except Exception as e:
         raise Exception(f"Erro ao baixar dados históricos: {str(e)}")
@@ -80,7 +144,9 @@ class DataCollector:
         benchmark: str = "^BVSP", 
         start: datetime = datetime.today() - timedelta(days=180), 
         end: datetime = datetime.today(), 
-        cache: bool = True
+        cache: bool = True,
+        store: PriceStore = None,
+        source: PriceSource = None
     ):
         """
         Inicializa o coletor de dados.
@@ -91,6 +157,9 @@ class DataCollector:
             start: Data de início dos dados
             end: Data de fim dos dados
             cache: Se deve usar cache para evitar downloads repetidos
+            store: Armazém local de preços consultado antes do download
+                (padrão: nenhum, usando apenas o cache da sessão)
+            source: Fonte dos preços (padrão: Yahoo Finance)
         """
         if tickers is None:
             raise TypeError("tickers cannot be None")
@@ -99,6 +168,10 @@ class DataCollector:
         self.start = start
         self.end = end
         self.cache = cache
+        self.store = store
+        self.source = source
+        # Relatório combinado dos downloads da última coleta, quando a fonte o fornece
+        self.last_report: DownloadReport = None
         
         # Configuração do cache para evitar downloads repetidos
         if cache:
@@ -114,4 +187,148 @@ class DataCollector:
         Raises:
             Exception: Erro ao baixar dados do yfinance ou processar dados
         """
-        return _download_data_cached(tuple(self.tickers), self.benchmark, self.start, self.end)
+        if self.store is None and self.source is None:
+            return _download_data_cached(tuple(self.tickers), self.benchmark, self.start, self.end)
+        return self.download_market_data().returns
+    
+    def download_market_data(self) -> MarketData:
+        """
+        Coleta, em uma única busca, os fechamentos dos ativos e do benchmark.
+        
+        Quando a fonte registra um ``last_report`` (como o
+        ``DownloadScheduler``), os relatórios de todos os trechos baixados
+        são combinados em ``last_report`` do coletor.
+        
+        Returns:
+            MarketData: Fechamentos e retornos dos ativos e do benchmark
+            
+        Raises:
+            Exception: Erro ao baixar dados do yfinance ou processar dados
+        """
+        self.last_report = None
+        if self.store is not None:
+            closes = self._closes_from_store()
+        elif self.source is not None:
+            all_tickers = _with_suffix(tuple(self.tickers), self.benchmark) + [self.benchmark]
+            closes = self._fetch_closes(all_tickers, self.start, self.end)
+        else:
+            closes = _download_closes_cached(tuple(self.tickers), self.benchmark, self.start, self.end)
+        return MarketData(closes, self.benchmark)
+    
+    def _fetch_closes(self, tickers: list, start: datetime, end: datetime) -> pd.DataFrame:
+        """Obtém fechamentos da fonte configurada (padrão: Yahoo Finance)."""
+        if self.source is not None:
+            closes = self.source.fetch_closes(tickers, start, end)
+            report = getattr(self.source, 'last_report', None)
+            if report is not None:
+                self.last_report = report if self.last_report is None else self.last_report.merge(report)
+            return closes
+        return _download_closes(tickers, start, end)
+    
+    def _closes_from_store(self) -> pd.DataFrame:
+        """
+        Lê os preços do armazém local, baixando apenas os trechos ausentes.
+        
+        Para cada ticker, só são pedidos ao yfinance os trechos do intervalo
+        ainda não cobertos (início e/ou fim). Tickers com o mesmo trecho
+        ausente são baixados juntos, de modo que a atualização diária do
+        universo vira uma única requisição com os pregões novos.
+        
+        Só entram na cobertura os tickers que vieram na resposta: uma falha
+        de download é indistinguível de uma resposta vazia, e registrá-la
+        impediria para sempre um novo download do trecho. Pelo mesmo motivo,
+        a cobertura vai apenas até o último pregão recebido, de modo que um
+        pregão ainda não publicado seja pedido de novo na próxima execução.
+        
+        Os fechamentos são ajustados: um desdobramento ou provento faz o
+        Yahoo reajustar todo o histórico, e emendar o trecho novo ao antigo
+        criaria um falso salto de retorno. Cada trecho é pedido com
+        ``OVERLAP_DAYS`` dias já armazenados; se eles divergem, o histórico
+        do ticker é baixado de novo por inteiro e substitui o armazenado.
+        
+        Returns:
+            pd.DataFrame: Fechamentos ajustados dos ativos e do benchmark
+            
+        Raises:
+            Exception: Erro ao baixar dados do yfinance ou processar dados
+        """
+        all_tickers = _with_suffix(tuple(self.tickers), self.benchmark) + [self.benchmark]
+        
+        segments = {}
+        for ticker in all_tickers:
+            for segment in self.store.missing_ranges(ticker, self.start, self.end):
+                segments.setdefault(segment, []).append(ticker)
+        
+        overlap = pd.Timedelta(days=OVERLAP_DAYS)
+        readjusted = {}
+        for (segment_start, segment_end), tickers in segments.items():
+            covered = self.store.coverage(tickers[0])
+            fetch_start, fetch_end = segment_start, segment_end
+            if covered is not None and segment_end <= covered[0]:
+                fetch_end = segment_end + overlap
+            elif covered is not None:
+                fetch_start = segment_start - overlap
+            downloaded = self._download_segment(tickers, fetch_start, fetch_end)
+            
+            for ticker in tickers:
+                if ticker not in downloaded.columns or not downloaded[ticker].notna().any():
+                    # Ticker ausente da resposta (falha ou trecho sem pregões): não grava cobertura
+                    continue
+                closes = downloaded[ticker].dropna()
+                if not self._matches_store(ticker, closes):
+                    # Histórico reajustado: o armazenado está em outra base e é substituído
+                    covered = self.store.coverage(ticker)
+                    full_range = (min(pd.Timestamp(self.start), covered[0]), max(pd.Timestamp(self.end), covered[1]))
+                    readjusted.setdefault(full_range, []).append(ticker)
+                    continue
+                end = segment_end
+                covered = self.store.coverage(ticker)
+                if covered is None or segment_end > covered[0]:
+                    # Trecho final: cobre apenas até o último pregão recebido
+                    end = self._covered_until(closes, segment_end)
+                self.store.write(ticker, closes, segment_start, end)
+        
+        for (full_start, full_end), tickers in readjusted.items():
+            downloaded = self._download_segment(tickers, full_start, full_end)
+            for ticker in tickers:
+                if ticker in downloaded.columns and downloaded[ticker].notna().any():
+                    closes = downloaded[ticker].dropna()
+                    self.store.write(ticker, closes, full_start, self._covered_until(closes, full_end))
+        
+        return self.store.read_many(all_tickers, self.start, self.end)
+    
+    def _download_segment(self, tickers: list, start: datetime, end: datetime) -> pd.DataFrame:
+        """Baixa um trecho de fechamentos, padronizando a mensagem de erro."""
+        try:
+            return self._fetch_closes(tickers, start, end)
+        except Exception as e:
+            raise Exception(f"Erro ao baixar dados históricos: {str(e)}")
+    
+    @staticmethod
+    def _covered_until(closes: pd.Series, end: datetime) -> pd.Timestamp:
+        """Fim da cobertura de um trecho final: o dia seguinte ao último pregão recebido."""
+        return min(pd.Timestamp(end), pd.Timestamp(closes.index[-1]).normalize() + pd.Timedelta(days=1))
+    
+    def _matches_store(self, ticker: str, closes: pd.Series) -> bool:
+        """
+        Verifica se os fechamentos baixados estão na mesma base de ajuste do armazém.
+        
+        Args:
+            ticker: Código do ativo
+            closes: Fechamentos baixados, incluindo os dias de sobreposição
+        
+        Returns:
+            bool: True se os pregões já armazenados coincidem (ou se não há
+            pregão em comum para comparar)
+        """
+        if ticker not in self.store:
+            return True
+        stored = self.store.read(ticker)
+        dates = pd.DatetimeIndex(closes.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        fetched = pd.Series(closes.to_numpy(dtype=np.float64), index=dates.normalize())
+        common = stored.index.intersection(fetched.index)
+        if common.empty:
+            return True
+        return bool(np.allclose(fetched[common], stored[common], rtol=ADJUSTMENT_TOLERANCE, atol=0.0))
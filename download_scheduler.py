@@ -0,0 +1,194 @@
+"""
+Módulo contendo o agendador de downloads de preços em lotes.
+
+O universo de tickers é dividido em lotes baixados em paralelo por um pool
+limitado de threads. Lotes que falham (exceção da fonte) ou que voltam sem
+parte dos tickers são repetidos com espera exponencial, e ao final um
+``DownloadReport`` informa quais tickers foram obtidos e por que os demais
+falharam. O agendador é ele próprio uma fonte de preços, podendo ser
+passado como ``source`` ao ``DataCollector``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+import time
+import pandas as pd
+from price_sources import ERRORS_ATTR, PriceSource
+
+
+@dataclass
+class DownloadReport:
+    """
+    Resultado de um download agendado.
+    
+    Attributes:
+        succeeded: Tickers obtidos
+        failed: Motivo da falha de cada ticker não obtido
+        attempts: Número de requisições feitas à fonte
+        elapsed: Tempo de parede total, em segundos
+    """
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    attempts: int = 0
+    elapsed: float = 0.0
+    
+    @property
+    def ok(self) -> bool:
+        """Indica se todos os tickers foram obtidos."""
+        return not self.failed
+    
+    def merge(self, other: 'DownloadReport') -> 'DownloadReport':
+        """
+        Combina dois relatórios de downloads da mesma coleta (ex.: trechos distintos).
+        
+        Um ticker que falhou em qualquer trecho permanece entre as falhas,
+        pois parte do intervalo pedido ficou sem dados.
+        
+        Args:
+            other: Relatório de outro download
+        
+        Returns:
+            DownloadReport: Relatório combinado
+        """
+        failed = {**self.failed, **other.failed}
+        succeeded = [
+            ticker for ticker in dict.fromkeys(self.succeeded + other.succeeded) if ticker not in failed
+        ]
+        return DownloadReport(succeeded, failed, self.attempts + other.attempts, self.elapsed + other.elapsed)
+
+
+class DownloadScheduler:
+    """
+    Fonte de preços que distribui o download em lotes concorrentes.
+    
+    São repetidos os lotes cuja requisição falha e os tickers ausentes de
+    uma resposta com pregões; uma resposta sem nenhum pregão é aceita como
+    intervalo vazio. Cada chamada a ``fetch_closes`` guarda seu relatório
+    em ``last_report``.
+    """
+    
+    def __init__(
+        self,
+        source: PriceSource,
+        chunk_size: int = 50,
+        max_workers: int = 4,
+        retries: int = 3,
+        backoff: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        """
+        Inicializa o agendador.
+        
+        Args:
+            source: Fonte de preços usada para cada lote
+            chunk_size: Número máximo de tickers por requisição
+            max_workers: Número máximo de lotes baixados simultaneamente
+            retries: Número de novas tentativas após a primeira falha
+            backoff: Espera (segundos) antes da primeira nova tentativa,
+                dobrada a cada tentativa seguinte
+            sleep: Função de espera (substituível nos testes)
+        
+        Raises:
+            ValueError: Tamanho de lote, número de threads ou tentativas inválidos
+        """
+        if chunk_size < 1:
+            raise ValueError("O tamanho do lote deve ser de pelo menos um ticker.")
+        if max_workers < 1:
+            raise ValueError("O agendador precisa de pelo menos uma thread.")
+        if retries < 0:
+            raise ValueError("O número de novas tentativas não pode ser negativo.")
+        self.source = source
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self._sleep = sleep
+        self.last_report: DownloadReport = None
+    
+    def _chunks(self, tickers: List[str]) -> List[List[str]]:
+        """Divide os tickers em lotes de até ``chunk_size``."""
+        return [tickers[i:i + self.chunk_size] for i in range(0, len(tickers), self.chunk_size)]
+    
+    def _fetch_chunk(self, chunk: List[str], start: datetime, end: datetime) -> Tuple[pd.DataFrame, Dict[str, str], int]:
+        """
+        Baixa um lote, repetindo apenas os tickers que ainda faltam.
+        
+        Args:
+            chunk: Tickers do lote
+            start: Data de início
+            end: Data de fim
+        
+        Returns:
+            Tuple: Fechamentos obtidos, motivo da falha de cada ticker
+            restante e número de requisições feitas
+        """
+        pending = list(chunk)
+        frames = []
+        reasons: Dict[str, str] = {}
+        attempts = 0
+        
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._sleep(self.backoff * 2 ** (attempt - 1))
+            attempts += 1
+            try:
+                closes = self.source.fetch_closes(pending, start, end)
+            except Exception as e:
+                reasons = {ticker: f"{type(e).__name__}: {e}" for ticker in pending}
+                continue
+            
+            errors = closes.attrs.get(ERRORS_ATTR, {})
+            if closes.empty and not errors:
+                # Resposta válida sem pregões (fim de semana, feriado): não há o que repetir
+                reasons = {ticker: "sem pregões no intervalo" for ticker in pending}
+                break
+            
+            received = [
+                ticker for ticker in pending
+                if ticker in closes.columns and closes[ticker].notna().any()
+            ]
+            if received:
+                frames.append(closes[received])
+            pending = [ticker for ticker in pending if ticker not in received]
+            # Motivo informado pela fonte, quando houver (ex.: exceção ao extrair o ticker)
+            reasons = {ticker: errors.get(ticker, "sem dados na resposta") for ticker in pending}
+            if not pending:
+                break
+        
+        closes = pd.concat(frames, axis=1) if frames else pd.DataFrame()
+        return closes, reasons, attempts
+    
+    def fetch_closes(self, tickers: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Baixa os fechamentos de todos os tickers em lotes concorrentes.
+        
+        Args:
+            tickers: Códigos completos dos ativos
+            start: Data de início (inclusiva)
+            end: Data de fim (exclusiva)
+        
+        Returns:
+            pd.DataFrame: Fechamentos obtidos, na ordem de ``tickers``
+        """
+        began = time.perf_counter()
+        tickers = list(dict.fromkeys(tickers))
+        report = DownloadReport()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._fetch_chunk, chunk, start, end) for chunk in self._chunks(tickers)]
+            results = [future.result() for future in futures]
+        
+        frames = []
+        for closes, reasons, attempts in results:
+            if not closes.empty:
+                frames.append(closes)
+            report.failed.update(reasons)
+            report.attempts += attempts
+        
+        closes = pd.concat(frames, axis=1).sort_index() if frames else pd.DataFrame()
+        report.succeeded = [ticker for ticker in tickers if ticker in closes.columns]
+        report.elapsed = time.perf_counter() - began
+        self.last_report = report
+        return closes[report.succeeded] if report.succeeded else closes
@@ -0,0 +1,76 @@
+"""
+Módulo contendo a impressão digital (fingerprint) dos dados de retornos.
+
+A impressão digital identifica de forma estável um conjunto de dados: o
+mesmo conteúdo gera sempre o mesmo identificador, entre sessões e
+processos (ao contrário de ``hash()``, que varia a cada execução). Ela é
+calculada com BLAKE2b diretamente sobre o buffer das matrizes, em blocos,
+sem converter os dados em texto, e serve de chave para os caches que
+dependem dos retornos (benchmark, fitness e resultados da otimização).
+"""
+
+from hashlib import blake2b
+from typing import Iterable
+import numpy as np
+import pandas as pd
+
+# Tamanho da impressão digital, em bytes (32 caracteres hexadecimais)
+DIGEST_SIZE = 16
+
+# Tamanho dos blocos lidos do buffer a cada atualização do hash
+CHUNK_BYTES = 1 << 20
+
+
+def _update_array(digest, array: np.ndarray) -> None:
+    """Acrescenta ao hash o formato, o tipo e o conteúdo de uma matriz."""
+    array = np.ascontiguousarray(array)
+    digest.update(f"{array.dtype.str}{array.shape}".encode('utf-8'))
+    buffer = memoryview(array).cast('B')
+    for offset in range(0, len(buffer), CHUNK_BYTES):
+        digest.update(buffer[offset:offset + CHUNK_BYTES])
+
+
+def _update_labels(digest, labels: Iterable) -> None:
+    """Acrescenta ao hash uma sequência de rótulos (tickers ou nomes de colunas)."""
+    for label in labels:
+        digest.update(str(label).encode('utf-8'))
+        digest.update(b'\x00')
+
+
+def fingerprint_array(array: np.ndarray, labels: Iterable = (), dates: pd.Index = None) -> str:
+    """
+    Calcula a impressão digital de uma matriz de retornos.
+    
+    Args:
+        array: Matriz de retornos (T x N)
+        labels: Rótulos das colunas, na ordem da matriz
+        dates: Índice de datas das linhas (opcional)
+    
+    Returns:
+        str: Identificador hexadecimal estável do conteúdo
+    """
+    digest = blake2b(digest_size=DIGEST_SIZE)
+    _update_labels(digest, labels)
+    digest.update(b'\x01')
+    if dates is not None:
+        index = pd.Index(dates)
+        if isinstance(index, pd.DatetimeIndex):
+            _update_array(digest, index.as_unit('ns').asi8)
+        else:
+            _update_labels(digest, index)
+    digest.update(b'\x02')
+    _update_array(digest, np.asarray(array))
+    return digest.hexdigest()
+
+
+def fingerprint_frame(frame: pd.DataFrame) -> str:
+    """
+    Calcula a impressão digital de um DataFrame de retornos.
+    
+    Args:
+        frame: Retornos indexados por data, uma coluna por ativo
+    
+    Returns:
+        str: Identificador hexadecimal estável do conteúdo
+    """
+    return fingerprint_array(frame.to_numpy(dtype=np.float64), frame.columns, frame.index)
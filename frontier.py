@@ -0,0 +1,265 @@
+"""
+Módulo contendo a fronteira eficiente de risco e retorno.
+
+A taxa livre de risco de ``Portfolio.fitness`` é o peso do CVaR frente ao
+retorno esperado; percorrer uma grade desse peso traça a fronteira entre
+risco de cauda e retorno. Cada ponto parte da solução do ponto anterior:
+no algoritmo genético, a melhor carteira e metade da população final do
+ponto anterior iniciam o seguinte, que evolui por poucas gerações e
+reaproveita o retorno esperado e o CVaR já calculados desses portfólios;
+na programação linear, as restrições são montadas uma única vez. As
+métricas de todos os pontos saem de uma única avaliação em lote.
+
+Alternativamente, o NSGA-II (``pareto_front``) obtém em uma única evolução
+o conjunto de Pareto entre retorno esperado e CVaR, do qual cada perfil
+escolhe a carteira de maior fitness para a sua aversão ao risco.
+"""
+
+from threading import Event
+from typing import Callable, Iterable, List, Tuple
+import numpy as np
+import pandas as pd
+from genetic_algorithm import GeneticAlgorithm
+from instrumentation import GenerationHooks
+from lp_solver import MeanCVaRProgram
+from portfolio import Portfolio, evaluate_population, population_diversity, score_weights
+from universe import ReturnsUniverse
+from vectorized_operators import VectorizedGeneticAlgorithm
+
+# Número padrão de pontos da fronteira
+DEFAULT_POINTS = 50
+
+
+def risk_aversion_grid(points: int = DEFAULT_POINTS, low: float = 0.0, high: float = 1.0) -> np.ndarray:
+    """
+    Cria a grade de pesos do CVaR percorrida pela fronteira.
+    
+    Args:
+        points: Número de pontos
+        low: Menor peso (0 maximiza apenas o retorno)
+        high: Maior peso (1 minimiza apenas o CVaR)
+    
+    Returns:
+        np.ndarray: Pesos igualmente espaçados, em ordem crescente
+    
+    Raises:
+        ValueError: Menos de um ponto ou intervalo fora de [0, 1]
+    """
+    if points < 1:
+        raise ValueError("A fronteira deve ter pelo menos um ponto.")
+    if not 0 <= low <= high <= 1:
+        raise ValueError("Os pesos do CVaR devem estar entre 0 e 1, em ordem crescente.")
+    return np.linspace(low, high, points)
+
+
+def pareto_table(universe: ReturnsUniverse, weights: np.ndarray, alpha: float = 0.95) -> pd.DataFrame:
+    """
+    Monta a tabela de um conjunto de carteiras, sem taxa associada.
+    
+    Args:
+        universe: Universo de ativos
+        weights: Matriz (P x N) de pesos normalizados, uma carteira por linha
+        alpha: Nível de confiança do CVaR
+    
+    Returns:
+        pd.DataFrame: Colunas ``retorno_esperado``, ``cvar``,
+        ``volatilidade`` (anualizada) e o peso de cada ticker
+    """
+    exp_returns, cvars = score_weights(universe.matrix, universe.mean, weights, alpha)
+    volatility = np.sqrt(np.einsum('pi,ij,pj->p', weights, universe.cov, weights)) * np.sqrt(252)
+    table = pd.DataFrame({'retorno_esperado': exp_returns, 'cvar': cvars, 'volatilidade': volatility})
+    return pd.concat([table, pd.DataFrame(weights, columns=list(universe.tickers))], axis=1)
+
+
+def frontier_table(universe: ReturnsUniverse, rates: Iterable[float], weights: np.ndarray, alpha: float = 0.95) -> pd.DataFrame:
+    """
+    Monta a tabela da fronteira a partir dos pesos de cada ponto.
+    
+    Args:
+        universe: Universo de ativos
+        rates: Peso do CVaR de cada ponto
+        weights: Matriz (P x N) de pesos normalizados, um ponto por linha
+        alpha: Nível de confiança do CVaR
+    
+    Returns:
+        pd.DataFrame: Colunas ``aversao_risco``, ``fitness``,
+        ``retorno_esperado``, ``cvar``, ``volatilidade`` (anualizada) e o
+        peso de cada ticker
+    """
+    rates = np.asarray(list(rates), dtype=np.float64)
+    table = pareto_table(universe, weights, alpha)
+    table.insert(0, 'fitness', (1 - rates) * table['retorno_esperado'] + rates * table['cvar'])
+    table.insert(0, 'aversao_risco', rates)
+    return table
+
+
+def lp_frontier(universe: ReturnsUniverse, rates: Iterable[float], alpha: float = 0.95) -> pd.DataFrame:
+    """
+    Traça a fronteira exata, resolvendo o programa linear em cada ponto.
+    
+    Args:
+        universe: Universo de ativos
+        rates: Grade de pesos do CVaR
+        alpha: Nível de confiança do CVaR
+    
+    Returns:
+        pd.DataFrame: Tabela de ``frontier_table``
+    """
+    rates = list(rates)
+    program = MeanCVaRProgram(universe, alpha)
+    weights = np.array([program.solve(rate).weights for rate in rates]).reshape(len(rates), universe.size)
+    return frontier_table(universe, rates, weights, alpha)
+
+
+def ga_frontier(
+    universe: ReturnsUniverse,
+    rates: Iterable[float],
+    params: dict,
+    warm_generations: int = None,
+    rng: np.random.Generator = None,
+    cancel_event: Event = None,
+    on_point: Callable[[int, int], None] = None
+) -> pd.DataFrame:
+    """
+    Traça a fronteira com o algoritmo genético, com partida a quente.
+    
+    O primeiro ponto parte de uma população aleatória e evolui por
+    ``max_generations``. Cada ponto seguinte parte da melhor carteira e de
+    metade da população final do anterior, com a taxa livre de risco
+    atualizada, completada por portfólios aleatórios que repõem a
+    diversidade perdida na convergência, e evolui apenas por
+    ``warm_generations``.
+    
+    Args:
+        universe: Universo de ativos
+        rates: Grade de pesos do CVaR
+        params: Parâmetros do algoritmo genético (``population_size``,
+            ``max_generations``, ``crossover_rate``, ``mutation_rate`` e,
+            opcionalmente, os critérios de convergência e a ``selecao``)
+        warm_generations: Gerações de cada ponto após o primeiro (padrão:
+            um décimo de ``max_generations``, ao menos duas)
+        rng: Gerador de números aleatórios (padrão: ``params['semente']``)
+        cancel_event: Evento que encerra o traçado quando sinalizado; a
+            tabela traz apenas os pontos concluídos até então
+        on_point: Função chamada com o índice e o total de pontos antes de
+            cada ponto
+    
+    Returns:
+        pd.DataFrame: Tabela de ``frontier_table``
+    """
+    rates = list(rates)
+    if warm_generations is None:
+        warm_generations = max(2, params['max_generations'] // 10)
+    rng = rng if rng is not None else np.random.default_rng(params.get('semente'))
+    
+    population: List[Portfolio] = None
+    weights = np.empty((len(rates), universe.size))
+    done = 0
+    for point, rate in enumerate(rates):
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        if on_point is not None:
+            on_point(point, len(rates))
+        if population is None:
+            population = Portfolio.random_population(universe, params['population_size'], risk_free_rate=rate, rng=rng)
+            generations = params['max_generations']
+        else:
+            # Partida a quente: o fitness em cache (retorno e CVaR) não depende da taxa
+            for portfolio in population:
+                portfolio.risk_free_rate = rate
+            generations = warm_generations
+        
+        ga = VectorizedGeneticAlgorithm(
+            population=population,
+            fitness_key=lambda p: p.fitness(),
+            batch_fitness=evaluate_population,
+            max_generations=generations,
+            mutation_rate=params['mutation_rate'],
+            crossover_rate=params['crossover_rate'],
+            selection_type=GeneticAlgorithm.SelectionType(params.get('selecao', GeneticAlgorithm.SelectionType.TOURNAMENT.value)),
+            threshold=float('inf'),
+            stagnation_window=params.get('stagnation_window'),
+            stagnation_epsilon=params.get('stagnation_epsilon', 0.0),
+            diversity=population_diversity,
+            rng=rng,
+            cancel_event=cancel_event
+        )
+        best = ga.run()
+        if ga.stop_reason == GeneticAlgorithm.StopReason.CANCELLED:
+            # Ponto interrompido no meio da evolução: não entra na fronteira
+            break
+        weights[point] = best.normalized_genes()
+        done = point + 1
+        # A melhor carteira do ponto segue para o próximo, mesmo que a elite a tenha perdido
+        survivors = [portfolio for portfolio in ga.population if portfolio is not best][:len(ga.population) // 2]
+        fresh = Portfolio.random_population(universe, len(ga.population) - len(survivors) - 1, risk_free_rate=rate, rng=rng)
+        population = [best] + survivors + fresh
+    return frontier_table(universe, rates[:done], weights[:done])
+
+
+def pareto_front(
+    universe: ReturnsUniverse,
+    params: dict,
+    risk_free_rate: float = 0.0,
+    rng: np.random.Generator = None,
+    hooks: GenerationHooks = None,
+    cancel_event: Event = None
+) -> Tuple[np.ndarray, GeneticAlgorithm]:
+    """
+    Obtém o conjunto de Pareto entre retorno esperado e CVaR com o NSGA-II.
+    
+    Args:
+        universe: Universo de ativos
+        params: Parâmetros do algoritmo genético (``population_size``,
+            ``max_generations``, ``crossover_rate`` e ``mutation_rate``)
+        risk_free_rate: Taxa usada apenas no fitness escalar registrado no
+            histórico da evolução
+        rng: Gerador de números aleatórios (padrão: ``params['semente']``)
+        hooks: Ganchos notificados a cada geração
+        cancel_event: Evento que encerra a evolução quando sinalizado
+    
+    Returns:
+        Tuple[np.ndarray, GeneticAlgorithm]: Pesos normalizados das carteiras
+        não dominadas (F x N, em ordem crescente de retorno) e o algoritmo
+        executado, com histórico e motivo de parada
+    """
+    rng = rng if rng is not None else np.random.default_rng(params.get('semente'))
+    population = Portfolio.random_population(universe, params['population_size'], risk_free_rate=risk_free_rate, rng=rng)
+    ga = VectorizedGeneticAlgorithm(
+        population=population,
+        fitness_key=lambda p: p.fitness(),
+        batch_fitness=evaluate_population,
+        max_generations=params['max_generations'],
+        mutation_rate=params['mutation_rate'],
+        crossover_rate=params['crossover_rate'],
+        selection_type=GeneticAlgorithm.SelectionType.NSGA2,
+        threshold=float('inf'),
+        diversity=population_diversity,
+        hooks=hooks,
+        rng=rng,
+        cancel_event=cancel_event,
+        objectives=lambda p: p.objectives()
+    )
+    ga.run()
+    weights = np.array([portfolio.normalized_genes() for portfolio in ga.pareto_front]).reshape(-1, universe.size)
+    # Carteiras com os mesmos pesos aparecem uma única vez na frente
+    weights = np.unique(weights, axis=0)
+    exp_returns, _ = score_weights(universe.matrix, universe.mean, weights, 0.95)
+    return weights[np.argsort(exp_returns, kind='stable')], ga
+
+
+def best_on_front(universe: ReturnsUniverse, weights: np.ndarray, risk_free_rate: float, alpha: float = 0.95) -> int:
+    """
+    Escolhe, entre as carteiras da frente, a de maior fitness para uma taxa.
+    
+    Args:
+        universe: Universo de ativos
+        weights: Matriz (F x N) de pesos normalizados da frente
+        risk_free_rate: Taxa livre de risco (peso do CVaR no fitness)
+        alpha: Nível de confiança do CVaR
+    
+    Returns:
+        int: Linha da carteira escolhida
+    """
+    exp_returns, cvars = score_weights(universe.matrix, universe.mean, weights, alpha)
+    return int(np.argmax((1 - risk_free_rate) * exp_returns + risk_free_rate * cvars))
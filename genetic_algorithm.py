@@ -2,16 +2,21 @@
 Módulo contendo a implementação do algoritmo genético.
 
 Esta classe implementa um algoritmo genético genérico que pode ser usado
-para otimizar qualquer tipo de cromossomo.
+para otimizar qualquer tipo de cromossomo, com um único fitness ou, na
+seleção NSGA-II, com vários objetivos ao mesmo tempo.
 """
 
 from __future__ import annotations
-from typing import TypeVar, Generic, List, Callable, Tuple
+from typing import TypeVar, Generic, List, Callable, Sequence, Tuple
 from statistics import mean
-from random import choices, random, uniform
 from enum import Enum
-import matplotlib.pyplot as plt
+from threading import Event
+from time import perf_counter
+import numpy as np
 import pandas as pd
+from instrumentation import GenerationHooks, GenerationStats, PHASES
+from nsga2 import crowded_tournament, rank_and_crowding, select_survivors
+from selection import roulette_selection, rank_selection, tournament_selection, top_k, truncation_selection
 
 T = TypeVar('T', bound='Chromosome')
 
@@ -26,6 +31,19 @@ class GeneticAlgorithm(Generic[T]):
     class SelectionType(Enum):
         """Tipos de seleção disponíveis no algoritmo genético."""
         TOURNAMENT = "tournament"
+        ROULETTE = "roulette"
+        RANK = "rank"
+        TRUNCATION = "truncation"
+        NSGA2 = "nsga2"
+    
+    class StopReason(Enum):
+        """Motivos pelos quais a evolução pode ser encerrada."""
+        THRESHOLD = "threshold"
+        MAX_GENERATIONS = "max_generations"
+        STAGNATION = "stagnation"
+        FITNESS_GAP = "fitness_gap"
+        DIVERSITY = "diversity"
+        CANCELLED = "cancelled"
     
     def __init__(
         self,
@@ -36,7 +54,17 @@ class GeneticAlgorithm(Generic[T]):
         crossover_rate: float,
         selection_type: SelectionType = SelectionType.TOURNAMENT,
         fitness_key: Callable = None,
-        elitism: bool = True
+        elitism: bool = True,
+        batch_fitness: Callable[[List[C]], None] = None,
+        stagnation_window: int = None,
+        stagnation_epsilon: float = 0.0,
+        gap_tolerance: float = None,
+        diversity_floor: float = None,
+        diversity: Callable[[List[C]], float] = None,
+        hooks: GenerationHooks = None,
+        rng: np.random.Generator = None,
+        cancel_event: Event = None,
+        objectives: Callable[[C], Sequence[float]] = None
     ) -> None:
         """
         Inicializa o algoritmo genético.
@@ -50,7 +78,36 @@ class GeneticAlgorithm(Generic[T]):
             selection_type: Tipo de seleção a ser usado
             fitness_key: Função para calcular aptidão
             elitism: Se deve aplicar elitismo
+            batch_fitness: Função opcional que avalia a população inteira de
+                uma vez, preenchendo o cache de fitness dos cromossomos
+            stagnation_window: Número de gerações sem melhora do melhor
+                fitness maior que ``stagnation_epsilon`` para encerrar
+            stagnation_epsilon: Melhora mínima considerada na janela
+            gap_tolerance: Diferença entre o melhor fitness e a média da
+                população abaixo da qual a evolução é encerrada
+            diversity_floor: Diversidade mínima da população
+            diversity: Função que mede a diversidade da população
+                (obrigatória se ``diversity_floor`` for informado)
+            hooks: Ganchos notificados a cada geração (padrão: nenhum efeito)
+            rng: Gerador de números aleatórios dos operadores, ou semente
+                para criá-lo (padrão: gerador não semeado)
+            cancel_event: Evento que, quando sinalizado (por outra thread),
+                encerra a evolução ao fim da geração corrente
+            objectives: Função que devolve os objetivos (a maximizar) de um
+                cromossomo; obrigatória na seleção NSGA-II, em que substitui
+                ``fitness_key`` na seleção e na sobrevivência
+        
+        Raises:
+            ValueError: Critério de diversidade sem função de diversidade ou
+                seleção NSGA-II sem função de objetivos
         """
+        if diversity_floor is not None and diversity is None:
+            raise ValueError("O critério de diversidade exige uma função de diversidade.")
+        if stagnation_window is not None and stagnation_window < 1:
+            raise ValueError("A janela de estagnação deve ter pelo menos uma geração.")
+        if selection_type == GeneticAlgorithm.SelectionType.NSGA2 and objectives is None:
+            raise ValueError("A seleção NSGA-II exige uma função de objetivos.")
+        
         self._population: List[C] = population
         self._threshold: float = threshold
         self._max_generations: int = max_generations
@@ -59,70 +116,237 @@ class GeneticAlgorithm(Generic[T]):
         self._selection_type: GeneticAlgorithm.SelectionType = selection_type
         self._fitness_key: Callable = fitness_key if fitness_key else lambda x: x.fitness()
         self._elitism: bool = elitism
+        self._batch_fitness: Callable[[List[C]], None] = batch_fitness
+        self._stagnation_window: int = stagnation_window
+        self._stagnation_epsilon: float = stagnation_epsilon
+        self._gap_tolerance: float = gap_tolerance
+        self._diversity_floor: float = diversity_floor
+        self._diversity: Callable[[List[C]], float] = diversity
+        self._hooks: GenerationHooks = hooks if hooks is not None else GenerationHooks()
+        self._rng: np.random.Generator = np.random.default_rng(rng)
+        self._cancel_event: Event = cancel_event
+        self._objectives: Callable[[C], Sequence[float]] = objectives
+        self._competitors: int = 3
+        # Tamanho da elite no início da população da geração, poupada da mutação
+        self._elite_size: int = 0
+        self.stop_reason: GeneticAlgorithm.StopReason = None
+        self.pareto_front: List[C] = None
+    
+    @property
+    def population(self) -> List[C]:
+        """Retorna a população atual."""
+        return self._population
+    
+    def _evaluate_population(self) -> None:
+        """Avalia a população atual em lote, quando há avaliador configurado."""
+        if self._batch_fitness is not None and self._population:
+            self._batch_fitness(self._population)
+    
+    @property
+    def _multi_objective(self) -> bool:
+        """Indica se a seleção é multiobjetivo (NSGA-II)."""
+        return self._selection_type == GeneticAlgorithm.SelectionType.NSGA2
     
-    def _pick_tournament(self, competitors: int = 3) -> Tuple[C, C]:
+    def _objective_matrix(self, population: List[C]) -> np.ndarray:
+        """Monta a matriz (P x M) dos objetivos de uma população."""
+        return np.array([self._objectives(chromosome) for chromosome in population], dtype=np.float64)
+    
+    def _fitness_array(self, population: List[C]) -> np.ndarray:
+        """Monta o vetor (P) de fitness de uma população."""
+        return np.fromiter((self._fitness_key(chromosome) for chromosome in population), dtype=np.float64, count=len(population))
+    
+    def _parent_indices(self, fitness: np.ndarray, n_pairs: int) -> np.ndarray:
         """
-        Seleção por torneio.
+        Sorteia os pares de pais conforme o tipo de seleção.
         
         Args:
-            competitors: Número de competidores no torneio
-            
+            fitness: Vetor (P) de fitness da geração, calculado uma única vez
+            n_pairs: Número de pares de pais
+        
         Returns:
-            Tuple[C, C]: Dois cromossomos selecionados
+            np.ndarray: Matriz (n_pairs x 2) com os índices dos pais
         """
-        participants = choices(self._population, k=competitors)
-        sorted_participants = sorted(participants, key=self._fitness_key, reverse=True)
+        if self._selection_type == GeneticAlgorithm.SelectionType.ROULETTE:
+            return roulette_selection(fitness, n_pairs, self._rng)
+        if self._selection_type == GeneticAlgorithm.SelectionType.RANK:
+            return rank_selection(fitness, n_pairs, self._rng)
+        if self._selection_type == GeneticAlgorithm.SelectionType.TRUNCATION:
+            return truncation_selection(fitness, n_pairs, self._rng)
+        return tournament_selection(fitness, n_pairs, self._competitors, self._rng)
+    
+    def _select_parent_indices(self) -> np.ndarray:
+        """
+        Sorteia os pares de pais da próxima geração, como índices da população.
         
-        # Garante que sempre retornamos 2 cromossomos
-        if len(sorted_participants) >= 2:
-            return tuple(sorted_participants[:2])
-        else:
-            # Se há apenas 1 participante, duplica
-            return tuple([sorted_participants[0], sorted_participants[0]])
-
-    def _reduce_replace(self) -> None:
-        """Substitui a população atual por uma nova geração."""
+        Returns:
+            np.ndarray: Matriz (K x 2) com pares suficientes para repor a população
+        """
+        n_pairs = (len(self._population) + 1) // 2
+        if self._multi_objective:
+            ranks, crowding = rank_and_crowding(self._objective_matrix(self._population))
+            return crowded_tournament(ranks, crowding, 2 * n_pairs, self._rng).reshape(-1, 2)
+        return self._parent_indices(self._fitness_array(self._population), n_pairs)
+    
+    def _select_parents(self) -> List[Tuple[C, C]]:
+        """
+        Seleciona os pares de pais da próxima geração.
+        
+        Returns:
+            List[Tuple[C, C]]: Pares suficientes para repor a população
+        """
+        return [(self._population[i], self._population[j]) for i, j in self._select_parent_indices()]
+    
+    def _crossover(self, parents: List[Tuple[C, C]]) -> List[C]:
+        """
+        Gera a nova população a partir dos pares de pais.
+        
+        Args:
+            parents: Pares de pais selecionados
+            
+        Returns:
+            List[C]: Nova população, com o tamanho da atual
+        """
         new_population = []
-        while len(new_population) < len(self._population):
-            parents = self._pick_tournament(3)
-            if random() < self._crossover_rate:
-                new_population.extend(parents[0].crossover(parents[1]))
+        for parent1, parent2 in parents:
+            if self._rng.random() < self._crossover_rate:
+                new_population.extend(parent1.crossover(parent2))
+            elif self._multi_objective:
+                # Pais e filhos disputam a sobrevivência: a prole não pode
+                # compartilhar objetos (mutados no lugar) com os pais
+                new_population.extend((parent1.copy(), parent2.copy()))
             else:
-                new_population.extend(parents)
-        if len(new_population) > len(self._population):
-            new_population.pop()
-        self._population = new_population
+                new_population.extend((parent1, parent2))
+        return new_population[:len(self._population)]
+    
+    def _reduce_replace(self) -> None:
+        """Substitui a população atual por uma nova geração."""
+        self._population = self._crossover(self._select_parents())
 
-    def _apply_elitism(self, new_population: List[C]) -> List[C]:
+    def _apply_elitism(self, new_population: List[C], previous: List[C] = None) -> List[C]:
         """
         Preserva os melhores indivíduos da população anterior.
         
         Args:
             new_population: Nova população gerada
+            previous: População anterior (padrão: a população atual)
             
         Returns:
-            List[C]: População com elitismo aplicado
+            List[C]: População com elitismo aplicado, do melhor ao pior
         """
         if not self._elitism:
             return new_population
+        previous = self._population if previous is None else previous
         
-        # Ordena população atual e nova por fitness
-        self._population.sort(key=self._fitness_key, reverse=True)
-        new_population.sort(key=self._fitness_key, reverse=True)
-        
-        # Mantém os 10% melhores da população anterior
-        elite_size = max(1, len(self._population) // 10)
-        elite = self._population[:elite_size]
+        # Mantém os 10% melhores da população anterior (seleção parcial, sem ordenar tudo)
+        elite_size = max(1, len(previous) // 10)
+        elite = [previous[i] for i in top_k(self._fitness_array(previous), elite_size)]
+        self._elite_size = elite_size
         
         # Substitui os piores da nova população pelos melhores da anterior
-        return elite + new_population[:len(self._population) - elite_size]
+        survivors = top_k(self._fitness_array(new_population), len(previous) - elite_size)
+        return elite + [new_population[i] for i in survivors]
+    
+    def _select_survivors(self, parents: List[C]) -> List[C]:
+        """
+        Escolhe a próxima população entre pais e filhos (NSGA-II).
+        
+        Args:
+            parents: População do início da geração
+            
+        Returns:
+            List[C]: Sobreviventes, com o tamanho da população de pais
+        """
+        pool = parents + self._population
+        survivors = select_survivors(self._objective_matrix(pool), len(parents))
+        return [pool[i] for i in survivors]
+    
+    def _mutable_population(self) -> List[C]:
+        """
+        Seleciona os indivíduos sujeitos à mutação.
+        
+        A elite fica no início da população; pais copiados sem cruzamento
+        podem ser os mesmos objetos da elite e também são poupados.
+        
+        Returns:
+            List[C]: Indivíduos da população fora da elite
+        """
+        elite = {id(chromosome) for chromosome in self._population[:self._elite_size]}
+        return [chromosome for chromosome in self._population if id(chromosome) not in elite]
     
     def _mutation(self) -> None:
-        """Aplica mutação na população."""
-        for chromosome in self._population:
-            if random() < self._mutation_rate:
+        """Aplica mutação na população, exceto na elite preservada."""
+        for chromosome in self._mutable_population():
+            if self._rng.random() < self._mutation_rate:
                 chromosome.mutate()
     
+    def _convergence_reason(
+        self,
+        best_history: List[float],
+        current_mean_fitness: float
+    ) -> GeneticAlgorithm.StopReason:
+        """
+        Verifica os critérios de convergência configurados.
+        
+        Args:
+            best_history: Melhor fitness de cada geração até a atual
+            current_mean_fitness: Fitness médio da população atual
+        
+        Returns:
+            StopReason: Motivo de parada, ou None se a evolução deve continuar
+        """
+        window = self._stagnation_window
+        if window is not None and len(best_history) > window:
+            if best_history[-1] - best_history[-1 - window] <= self._stagnation_epsilon:
+                return GeneticAlgorithm.StopReason.STAGNATION
+        
+        if self._gap_tolerance is not None:
+            if best_history[-1] - current_mean_fitness <= self._gap_tolerance:
+                return GeneticAlgorithm.StopReason.FITNESS_GAP
+        
+        if self._diversity_floor is not None:
+            if self._diversity(self._population) <= self._diversity_floor:
+                return GeneticAlgorithm.StopReason.DIVERSITY
+        
+        return None
+    
+    def _fitness_counters(self) -> dict:
+        """Retorna os contadores de fitness do tipo de cromossomo da população."""
+        if not self._population:
+            return None
+        return type(self._population[0]).fitness_stats()
+    
+    def _timed(self, timings: dict, phase: str, function: Callable, *args):
+        """
+        Executa uma fase da geração acumulando seu tempo de parede.
+        
+        Args:
+            timings: Tempos acumulados por fase
+            phase: Nome da fase
+            function: Função que executa a fase
+            args: Argumentos da função
+            
+        Returns:
+            Resultado de ``function``
+        """
+        start = perf_counter()
+        result = function(*args)
+        timings[phase] += perf_counter() - start
+        return result
+    
+    def _timed_evaluation(self, generation: int, timings: dict) -> None:
+        """
+        Avalia a população registrando o tempo e notificando os ganchos.
+        
+        Args:
+            generation: Índice da geração (-1 para a população inicial)
+            timings: Tempos acumulados por fase
+        """
+        start = perf_counter()
+        self._evaluate_population()
+        seconds = perf_counter() - start
+        timings['evaluation'] += seconds
+        self._hooks.on_evaluate(generation, len(self._population), seconds)
+    
     def run(self) -> C:
         """
         Executa o algoritmo genético.
@@ -130,10 +354,12 @@ class GeneticAlgorithm(Generic[T]):
         Returns:
             C: Melhor cromossomo encontrado
         """
+        self._timed_evaluation(-1, dict.fromkeys(PHASES, 0.0))
         best: C = max(self._population, key=self._fitness_key)
         gens = []
         best_fitness_list = []
         mean_fitness_list = []
+        self.stop_reason = GeneticAlgorithm.StopReason.MAX_GENERATIONS
         
         for generation in range(self._max_generations):
             current_best_fitness = self._fitness_key(best)
@@ -142,30 +368,87 @@ class GeneticAlgorithm(Generic[T]):
             best_fitness_list.append(current_best_fitness)
             mean_fitness_list.append(current_mean_fitness)
             
+            if self._cancel_event is not None and self._cancel_event.is_set():
+                self.stop_reason = GeneticAlgorithm.StopReason.CANCELLED
+                break
+            
             if current_best_fitness >= self._threshold:
+                self.stop_reason = GeneticAlgorithm.StopReason.THRESHOLD
+                break
+            
+            reason = self._convergence_reason(best_fitness_list, current_mean_fitness)
+            if reason is not None:
+                self.stop_reason = reason
                 break
                 
-            print(f"Generation: {generation}, Best Fitness: {current_best_fitness}, Mean Fitness: {current_mean_fitness}")
+            self._hooks.on_generation_start(generation)
+            timings = dict.fromkeys(PHASES, 0.0)
+            counters = self._fitness_counters()
+            self._elite_size = 0
             
-            self._reduce_replace()
-            if self._elitism:
-                self._population = self._apply_elitism(self._population)
-            self._mutation()
+            previous = self._population
+            parents = self._timed(timings, 'selection', self._select_parents)
+            self._population = self._timed(timings, 'crossover', self._crossover, parents)
+            self._timed_evaluation(generation, timings)
+            if self._elitism and not self._multi_objective:
+                self._population = self._timed(timings, 'elitism', self._apply_elitism, self._population, previous)
+            self._timed(timings, 'mutation', self._mutation)
+            self._timed_evaluation(generation, timings)
+            if self._multi_objective:
+                # Sobrevivência (μ + λ) por frentes e aglomeração: o elitismo do NSGA-II
+                self._population = self._timed(timings, 'elitism', self._select_survivors, previous)
             
             highest: C = max(self._population, key=self._fitness_key)
             if self._fitness_key(highest) > self._fitness_key(best):
                 best = highest
+            
+            self._hooks.on_generation_end(self._generation_stats(generation, best, timings, counters))
                 
         self.results = pd.DataFrame({
             "gens": gens,
             "best_fitness": best_fitness_list,
             "mean_fitness": mean_fitness_list
         })
+        self.results.attrs['stop_reason'] = self.stop_reason.value
+        if self._multi_objective:
+            ranks, _ = rank_and_crowding(self._objective_matrix(self._population))
+            self.pareto_front = [chromosome for chromosome, rank in zip(self._population, ranks) if rank == 0]
         return best
     
+    def _generation_stats(self, generation: int, best: C, timings: dict, counters: dict) -> GenerationStats:
+        """
+        Monta as métricas de uma geração recém-concluída.
+        
+        Args:
+            generation: Índice da geração
+            best: Melhor cromossomo encontrado até agora
+            timings: Tempos acumulados por fase
+            counters: Contadores de fitness do início da geração
+            
+        Returns:
+            GenerationStats: Métricas da geração
+        """
+        stats = GenerationStats(
+            generation=generation,
+            best_fitness=self._fitness_key(best),
+            mean_fitness=mean(map(self._fitness_key, self._population)),
+            timings=timings,
+            diversity=self._diversity(self._population) if self._diversity else None
+        )
+        after = self._fitness_counters()
+        if counters is not None and after is not None:
+            stats.evaluations = after['evaluations'] - counters['evaluations']
+            hits = after['cache_hits'] - counters['cache_hits']
+            total = stats.evaluations + hits
+            stats.cache_hit_rate = hits / total if total else 0.0
+        return stats
+    
     def show_results(self) -> None:
         """Exibe os resultados do algoritmo genético em um gráfico."""
         if hasattr(self, 'results'):
+            # Importado apenas aqui: execuções em lote não dependem do matplotlib
+            import matplotlib.pyplot as plt
+            
             df = pd.DataFrame(self.results)
             plt.figure(figsize=(10, 6))
             plt.plot(df['gens'], df['best_fitness'], label='Melhor Fitness', linewidth=2)
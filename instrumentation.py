@@ -0,0 +1,123 @@
+"""
+Módulo contendo a instrumentação por geração do algoritmo genético.
+
+O ``GeneticAlgorithm`` notifica um objeto de ganchos (hooks) no início de
+cada geração, após cada avaliação da população e ao final da geração, com
+o tempo gasto em cada fase, o número de avaliações de fitness, a taxa de
+acerto do cache e a diversidade da população. A implementação padrão não
+faz nada; ``JsonLinesHooks`` grava uma linha JSON por geração.
+"""
+
+from dataclasses import dataclass, field, asdict
+from typing import Dict, TextIO, Union
+import json
+
+# Fases de uma geração, na ordem em que são executadas
+PHASES = ('selection', 'crossover', 'evaluation', 'elitism', 'mutation')
+
+
+@dataclass
+class GenerationStats:
+    """
+    Métricas de uma geração do algoritmo genético.
+    
+    Attributes:
+        generation: Índice da geração
+        best_fitness: Melhor fitness encontrado até o fim da geração
+        mean_fitness: Fitness médio da população ao fim da geração
+        timings: Tempo de parede (segundos) gasto em cada fase
+        evaluations: Avaliações de fitness calculadas na geração
+        cache_hit_rate: Fração das consultas de fitness atendidas pelo cache
+            (None se o cromossomo não expõe contadores)
+        diversity: Diversidade da população (None se não configurada)
+    """
+    generation: int
+    best_fitness: float
+    mean_fitness: float
+    timings: Dict[str, float] = field(default_factory=dict)
+    evaluations: int = None
+    cache_hit_rate: float = None
+    diversity: float = None
+    
+    @property
+    def elapsed(self) -> float:
+        """Retorna o tempo total da geração em segundos."""
+        return sum(self.timings.values())
+    
+    def to_dict(self) -> dict:
+        """Retorna as métricas como dicionário serializável."""
+        return asdict(self)
+
+
+class GenerationHooks:
+    """
+    Ganchos chamados pelo ``GeneticAlgorithm`` a cada geração.
+    
+    Esta implementação não faz nada; subclasses sobrescrevem apenas os
+    métodos de interesse.
+    """
+    
+    def on_generation_start(self, generation: int) -> None:
+        """
+        Chamado antes da reprodução de uma geração.
+        
+        Args:
+            generation: Índice da geração
+        """
+    
+    def on_evaluate(self, generation: int, population_size: int, seconds: float) -> None:
+        """
+        Chamado após cada avaliação da população.
+        
+        Args:
+            generation: Índice da geração (-1 para a população inicial)
+            population_size: Número de cromossomos avaliados
+            seconds: Tempo de parede da avaliação
+        """
+    
+    def on_generation_end(self, stats: GenerationStats) -> None:
+        """
+        Chamado ao final de uma geração.
+        
+        Args:
+            stats: Métricas da geração
+        """
+
+
+class JsonLinesHooks(GenerationHooks):
+    """
+    Ganchos que gravam as métricas de cada geração em formato JSON lines.
+    
+    Aceita um caminho de arquivo (aberto em modo de acréscimo) ou um fluxo
+    de texto já aberto, que não é fechado por ``close()``.
+    """
+    
+    def __init__(self, target: Union[str, TextIO]) -> None:
+        """
+        Inicializa o gravador.
+        
+        Args:
+            target: Caminho do arquivo ou fluxo de texto de destino
+        """
+        if isinstance(target, str):
+            self._stream = open(target, 'a', encoding='utf-8')
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+    
+    def on_generation_end(self, stats: GenerationStats) -> None:
+        """Grava as métricas da geração como uma linha JSON."""
+        self._stream.write(json.dumps(stats.to_dict()) + "\n")
+        self._stream.flush()
+    
+    def close(self) -> None:
+        """Fecha o arquivo, se ele foi aberto por este objeto."""
+        if self._owns_stream:
+            self._stream.close()
+    
+    def __enter__(self) -> 'JsonLinesHooks':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,274 @@
+"""
+Módulo contendo o modelo de ilhas para o algoritmo genético.
+
+Cada ilha é uma subpopulação independente que evolui com o
+``GeneticAlgorithm`` em seu próprio processo. A cada intervalo de migração
+as ilhas trocam seus melhores cromossomos segundo uma topologia (anel ou
+totalmente conectada); entre migrações não há comunicação, e apenas as
+matrizes de genes trafegam entre os processos.
+
+Cada ilha tem seu próprio fluxo de números aleatórios, derivado da semente
+do modelo por ``SeedSequence.spawn``: o resultado depende apenas da semente,
+e não do número de processos ou da ordem em que as ilhas são executadas.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from threading import Event
+from typing import List, Tuple
+import numpy as np
+import pandas as pd
+from genetic_algorithm import GeneticAlgorithm
+from parallel import SharedReturns, _attach_shared_returns, worker_universe
+from portfolio import Portfolio, evaluate_population, stack_population
+from universe import ReturnsUniverse
+
+
+def _evolve_island(
+    genes: np.ndarray,
+    risk_free_rate: float,
+    generations: int,
+    ga_params: dict,
+    seed_sequence: np.random.SeedSequence
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, pd.DataFrame]:
+    """
+    Evolui uma ilha por algumas gerações no processo auxiliar.
+    
+    Args:
+        genes: Matriz (S x N) com os genes da ilha
+        risk_free_rate: Taxa livre de risco dos portfólios
+        generations: Número de gerações desta época
+        ga_params: Parâmetros repassados ao ``GeneticAlgorithm``
+        seed_sequence: Semente da ilha para esta época
+    
+    Returns:
+        Tuple: Genes da população final ordenados do melhor para o pior, seus
+        fitness, genes do melhor cromossomo da época e histórico da época
+    """
+    universe = worker_universe()
+    rng = np.random.default_rng(seed_sequence)
+    population = [Portfolio(row, universe, risk_free_rate, rng) for row in genes]
+    ga = GeneticAlgorithm(
+        population=population,
+        max_generations=generations,
+        batch_fitness=evaluate_population,
+        rng=rng,
+        **ga_params
+    )
+    best = ga.run()
+    
+    final_population = ga.population
+    evaluate_population(final_population)
+    fitness = np.array([p.fitness() for p in final_population])
+    order = np.argsort(-fitness)
+    final_genes = stack_population(final_population)[order]
+    return final_genes, fitness[order], best.genes.copy(), ga.results
+
+
+class IslandModel:
+    """
+    Algoritmo genético em modelo de ilhas com migração periódica.
+    
+    As ilhas rodam em um pool de processos que compartilha a matriz de
+    retornos do universo via memória compartilhada.
+    """
+    
+    class Topology(Enum):
+        """Topologias de migração disponíveis entre as ilhas."""
+        RING = "ring"
+        FULLY_CONNECTED = "fully_connected"
+    
+    def __init__(
+        self,
+        universe: ReturnsUniverse,
+        islands: int,
+        island_size: int,
+        max_generations: int,
+        mutation_rate: float,
+        crossover_rate: float,
+        threshold: float,
+        risk_free_rate: float = 0.2,
+        migration_interval: int = 10,
+        migrants: int = 2,
+        topology: 'IslandModel.Topology' = Topology.RING,
+        elitism: bool = True,
+        selection_type: GeneticAlgorithm.SelectionType = GeneticAlgorithm.SelectionType.TOURNAMENT,
+        max_workers: int = None,
+        seed: int = None,
+        cancel_event: Event = None
+    ) -> None:
+        """
+        Inicializa o modelo de ilhas.
+        
+        Args:
+            universe: Universo de ativos compartilhado
+            islands: Número de ilhas (subpopulações)
+            island_size: Número de cromossomos por ilha
+            max_generations: Número máximo de gerações de cada ilha
+            mutation_rate: Taxa de mutação
+            crossover_rate: Taxa de cruzamento
+            threshold: Limiar de aptidão para parada antecipada
+            risk_free_rate: Taxa livre de risco dos portfólios
+            migration_interval: Gerações entre duas migrações
+            migrants: Número de melhores cromossomos enviados por ilha
+            topology: Topologia de migração
+            elitism: Se as ilhas devem aplicar elitismo
+            selection_type: Seleção de pais usada em cada ilha
+            max_workers: Número de processos (padrão: um por ilha)
+            seed: Semente do modelo (padrão: entropia do sistema operacional)
+            cancel_event: Evento que, quando sinalizado, encerra a evolução
+                ao fim da época em andamento
+        
+        Raises:
+            ValueError: Parâmetros de migração inválidos
+        """
+        if islands < 1:
+            raise ValueError("O modelo de ilhas precisa de pelo menos uma ilha.")
+        if migration_interval < 1:
+            raise ValueError("O intervalo de migração deve ser de pelo menos uma geração.")
+        if not 0 <= migrants < island_size:
+            raise ValueError("O número de migrantes deve ser menor que o tamanho da ilha.")
+        
+        self.universe = universe
+        self._islands = islands
+        self._island_size = island_size
+        self._max_generations = max_generations
+        self._threshold = threshold
+        self._risk_free_rate = risk_free_rate
+        self._migration_interval = migration_interval
+        self._migrants = migrants
+        self._topology = topology
+        self._max_workers = max_workers or islands
+        self._seed = seed
+        self._cancel_event = cancel_event
+        self._ga_params = {
+            'threshold': threshold,
+            'mutation_rate': mutation_rate,
+            'crossover_rate': crossover_rate,
+            'elitism': elitism,
+            'selection_type': selection_type
+        }
+    
+    def _sources(self, island: int) -> List[int]:
+        """
+        Retorna as ilhas que enviam migrantes para ``island``.
+        
+        Args:
+            island: Índice da ilha de destino
+        
+        Returns:
+            List[int]: Índices das ilhas de origem
+        """
+        if self._islands == 1:
+            return []
+        if self._topology == IslandModel.Topology.RING:
+            return [(island - 1) % self._islands]
+        return [other for other in range(self._islands) if other != island]
+    
+    def _migrate(self, genes: List[np.ndarray], fitness: List[np.ndarray]) -> None:
+        """
+        Substitui os piores de cada ilha pelos melhores das ilhas de origem.
+        
+        As populações chegam ordenadas do melhor para o pior; todas as ilhas
+        recebem migrantes escolhidos antes de qualquer substituição.
+        
+        Args:
+            genes: Matriz de genes ordenada de cada ilha
+            fitness: Fitness ordenado de cada ilha
+        """
+        m = self._migrants
+        if m == 0:
+            return
+        
+        incoming = []
+        for island in range(self._islands):
+            sources = self._sources(island)
+            if not sources:
+                incoming.append(None)
+                continue
+            candidates = np.vstack([genes[source][:m] for source in sources])
+            candidate_fitness = np.concatenate([fitness[source][:m] for source in sources])
+            best = np.argsort(-candidate_fitness)[:m]
+            incoming.append(candidates[best].copy())
+        
+        for island, migrants in enumerate(incoming):
+            if migrants is not None:
+                genes[island][-len(migrants):] = migrants
+    
+    def run(self) -> Portfolio:
+        """
+        Executa o modelo de ilhas.
+        
+        Returns:
+            Portfolio: Melhor portfólio encontrado entre todas as ilhas
+        """
+        # Um fluxo independente por ilha; cada época recebe um filho do fluxo da ilha
+        streams = np.random.SeedSequence(self._seed).spawn(self._islands)
+        populations = [
+            Portfolio.random_population(
+                self.universe, self._island_size, self._risk_free_rate,
+                rng=np.random.default_rng(stream.spawn(1)[0])
+            )
+            for stream in streams
+        ]
+        initial = [p for population in populations for p in population]
+        evaluate_population(initial)
+        best = max(initial, key=lambda p: p.fitness())
+        best_genes, best_fitness = best.genes.copy(), best.fitness()
+        
+        genes = [stack_population(population) for population in populations]
+        fitness = [np.array([p.fitness() for p in population]) for population in populations]
+        best_history = []
+        mean_history = []
+        completed = 0
+        stop_reason = GeneticAlgorithm.StopReason.MAX_GENERATIONS
+        
+        shared = SharedReturns(self.universe)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                initializer=_attach_shared_returns,
+                initargs=shared.initargs
+            ) as executor:
+                while completed < self._max_generations:
+                    if self._cancel_event is not None and self._cancel_event.is_set():
+                        stop_reason = GeneticAlgorithm.StopReason.CANCELLED
+                        break
+                    generations = min(self._migration_interval, self._max_generations - completed)
+                    futures = [
+                        executor.submit(
+                            _evolve_island, island_genes, self._risk_free_rate, generations,
+                            self._ga_params, stream.spawn(1)[0]
+                        )
+                        for island_genes, stream in zip(genes, streams)
+                    ]
+                    epoch = [future.result() for future in futures]
+                    
+                    for island, (final_genes, final_fitness, island_best, _) in enumerate(epoch):
+                        genes[island] = final_genes
+                        fitness[island] = final_fitness
+                        candidate = Portfolio(island_best, self.universe, self._risk_free_rate)
+                        if candidate.fitness() > best_fitness:
+                            best_genes, best_fitness = island_best, candidate.fitness()
+                    
+                    # Histórico global: melhor entre as ilhas e média das médias
+                    steps = min(len(results) for *_, results in epoch)
+                    best_history.extend(np.max([results['best_fitness'].to_numpy()[:steps] for *_, results in epoch], axis=0))
+                    mean_history.extend(np.mean([results['mean_fitness'].to_numpy()[:steps] for *_, results in epoch], axis=0))
+                    completed += generations
+                    
+                    if best_fitness >= self._threshold:
+                        stop_reason = GeneticAlgorithm.StopReason.THRESHOLD
+                        break
+                    if completed < self._max_generations:
+                        self._migrate(genes, fitness)
+        finally:
+            shared.close()
+        
+        self.results = pd.DataFrame({
+            "gens": range(len(best_history)),
+            "best_fitness": best_history,
+            "mean_fitness": mean_history
+        })
+        self.results.attrs['stop_reason'] = stop_reason.value
+        return Portfolio(best_genes, self.universe, self._risk_free_rate)
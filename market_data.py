@@ -0,0 +1,76 @@
+"""
+Módulo contendo o resultado unificado da coleta de dados de mercado.
+
+Uma única coleta do ``DataCollector`` traz os fechamentos dos ativos e do
+benchmark; o ``MarketData`` guarda esses fechamentos e expõe os retornos
+dos ativos e a série do benchmark, para que a análise comparativa use o
+mesmo download da otimização em vez de baixar o índice novamente.
+"""
+
+import numpy as np
+import pandas as pd
+from fingerprint import fingerprint_frame
+
+
+class MarketData:
+    """
+    Fechamentos e retornos dos ativos e do benchmark de uma mesma coleta.
+    
+    Colunas com falhas (NaN) são descartadas, como na coleta original, de
+    modo que todas as séries compartilham as mesmas datas.
+    """
+    
+    def __init__(self, closes: pd.DataFrame, benchmark: str) -> None:
+        """
+        Inicializa os dados de mercado.
+        
+        Args:
+            closes: Fechamentos ajustados dos ativos e do benchmark
+            benchmark: Coluna do benchmark em ``closes``
+        """
+        self.closes: pd.DataFrame = closes.dropna(axis=1)
+        self.benchmark: str = benchmark
+        self.returns: pd.DataFrame = self.closes.pct_change().dropna()
+    
+    @property
+    def tickers(self) -> list:
+        """Retorna os tickers dos ativos disponíveis, sem o benchmark."""
+        return [column for column in self.returns.columns if column != self.benchmark]
+    
+    @property
+    def asset_returns(self) -> pd.DataFrame:
+        """Retorna os retornos diários dos ativos, sem o benchmark."""
+        return self.returns[self.tickers]
+    
+    @property
+    def benchmark_returns(self) -> pd.Series:
+        """Retorna os retornos diários do benchmark (None se indisponível)."""
+        if self.benchmark not in self.returns.columns:
+            return None
+        return self.returns[self.benchmark]
+    
+    @property
+    def fingerprint(self) -> str:
+        """Retorna a impressão digital estável dos retornos coletados, incluindo os do benchmark."""
+        return fingerprint_frame(self.returns)
+    
+    def benchmark_value(self, capital: float, days: int) -> pd.Series:
+        """
+        Simula a evolução de um capital aplicado no benchmark.
+        
+        Args:
+            capital: Valor inicial aplicado
+            days: Número de pregões mais recentes considerados
+        
+        Returns:
+            pd.Series: Valor acumulado a cada pregão, indexado por data
+            (None se o benchmark estiver indisponível)
+        """
+        returns = self.benchmark_returns
+        if returns is None:
+            return None
+        window = returns.tail(days)
+        return pd.Series(capital * np.cumprod(1 + window.to_numpy()), index=window.index)
+    
+    def __repr__(self) -> str:
+        return f"MarketData({len(self.tickers)} ativos, benchmark={self.benchmark!r}, {len(self.returns)} pregões)"
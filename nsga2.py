@@ -0,0 +1,148 @@
+"""
+Módulo contendo os operadores do NSGA-II para otimização multiobjetivo.
+
+Em vez de reduzir retorno e CVaR a um único fitness, o NSGA-II ordena a
+população em frentes não dominadas e, dentro de cada frente, prefere os
+indivíduos mais isolados (distância de aglomeração), de modo que uma
+única evolução preserve todo o conjunto de Pareto. As funções recebem a
+matriz (P x M) dos objetivos da população, todos a maximizar, e trabalham
+apenas com índices, sem depender do tipo de cromossomo.
+"""
+
+from typing import List, Tuple
+import numpy as np
+
+
+def dominance_matrix(values: np.ndarray) -> np.ndarray:
+    """
+    Calcula a relação de dominância entre todos os pares de indivíduos.
+    
+    Args:
+        values: Matriz (P x M) de objetivos a maximizar
+    
+    Returns:
+        np.ndarray: Matriz booleana (P x P) em que ``[i, j]`` indica que i domina j
+    """
+    at_least = (values[:, None, :] >= values[None, :, :]).all(axis=2)
+    better = (values[:, None, :] > values[None, :, :]).any(axis=2)
+    return at_least & better
+
+
+def non_dominated_sort(values: np.ndarray) -> List[np.ndarray]:
+    """
+    Separa a população em frentes não dominadas (ordenação rápida de Deb).
+    
+    Args:
+        values: Matriz (P x M) de objetivos a maximizar
+    
+    Returns:
+        List[np.ndarray]: Índices de cada frente, da primeira (não dominada) à última
+    """
+    dominates = dominance_matrix(values)
+    # Quantos indivíduos ainda não classificados dominam cada um
+    dominated_by = dominates.sum(axis=0)
+    assigned = np.zeros(len(values), dtype=bool)
+    fronts = []
+    current = np.flatnonzero(dominated_by == 0)
+    while current.size:
+        fronts.append(current)
+        assigned[current] = True
+        dominated_by = dominated_by - dominates[current].sum(axis=0)
+        current = np.flatnonzero((dominated_by == 0) & ~assigned)
+    return fronts
+
+
+def crowding_distance(values: np.ndarray) -> np.ndarray:
+    """
+    Calcula a distância de aglomeração dos indivíduos de uma frente.
+    
+    Os extremos de cada objetivo recebem distância infinita, para que a
+    frente preserve suas pontas.
+    
+    Args:
+        values: Matriz (F x M) de objetivos dos indivíduos da frente
+    
+    Returns:
+        np.ndarray: Distância de cada indivíduo (maior = mais isolado)
+    """
+    size, n_objectives = values.shape
+    distance = np.zeros(size)
+    if size <= 2:
+        distance[:] = np.inf
+        return distance
+    for objective in range(n_objectives):
+        order = np.argsort(values[:, objective], kind='stable')
+        ordered = values[order, objective]
+        distance[order[[0, -1]]] = np.inf
+        span = ordered[-1] - ordered[0]
+        if span > 0:
+            distance[order[1:-1]] += (ordered[2:] - ordered[:-2]) / span
+    return distance
+
+
+def rank_and_crowding(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula a frente e a distância de aglomeração de cada indivíduo.
+    
+    Args:
+        values: Matriz (P x M) de objetivos a maximizar
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Índice da frente (0 = não dominada) e
+        distância de aglomeração dentro da frente
+    """
+    ranks = np.empty(len(values), dtype=np.intp)
+    crowding = np.empty(len(values))
+    for rank, front in enumerate(non_dominated_sort(values)):
+        ranks[front] = rank
+        crowding[front] = crowding_distance(values[front])
+    return ranks, crowding
+
+
+def select_survivors(values: np.ndarray, size: int) -> np.ndarray:
+    """
+    Escolhe os sobreviventes de uma população combinada (pais e filhos).
+    
+    As frentes entram inteiras enquanto couberem; a primeira que não cabe
+    contribui com seus indivíduos de maior distância de aglomeração.
+    
+    Args:
+        values: Matriz (P x M) de objetivos a maximizar
+        size: Número de sobreviventes
+    
+    Returns:
+        np.ndarray: Índices dos sobreviventes, da melhor frente à pior
+    """
+    survivors = []
+    for front in non_dominated_sort(values):
+        missing = size - len(survivors)
+        if missing <= 0:
+            break
+        if len(front) <= missing:
+            survivors.extend(front.tolist())
+        else:
+            order = np.argsort(-crowding_distance(values[front]), kind='stable')
+            survivors.extend(front[order[:missing]].tolist())
+    return np.array(survivors, dtype=np.intp)
+
+
+def crowded_tournament(ranks: np.ndarray, crowding: np.ndarray, n_winners: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Seleciona indivíduos por torneio binário com o operador de aglomeração.
+    
+    Vence o indivíduo da melhor frente; na mesma frente, o mais isolado.
+    
+    Args:
+        ranks: Frente de cada indivíduo
+        crowding: Distância de aglomeração de cada indivíduo
+        n_winners: Número de indivíduos selecionados
+        rng: Gerador de números aleatórios
+    
+    Returns:
+        np.ndarray: Índices dos vencedores
+    """
+    first, second = rng.integers(len(ranks), size=(2, n_winners))
+    first_wins = (ranks[first] < ranks[second]) | (
+        (ranks[first] == ranks[second]) & (crowding[first] >= crowding[second])
+    )
+    return np.where(first_wins, first, second)
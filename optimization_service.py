@@ -0,0 +1,504 @@
+"""
+Módulo contendo o serviço de otimização de carteiras.
+
+O serviço reúne o fluxo completo de uma otimização (coleta dos dados,
+montagem do universo, consulta ao cache de resultados, evolução do
+algoritmo genético, frente de Pareto do NSGA-II ou solução exata por
+programação linear, métricas finais e, opcionalmente, fronteira eficiente)
+sem depender da interface. O
+``OptimizationJob`` executa esse fluxo em uma thread própria, acumulando o
+histórico de cada geração para acompanhamento ao vivo e permitindo o
+cancelamento a qualquer momento.
+"""
+
+from enum import Enum
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List
+from uuid import uuid4
+import numpy as np
+import pandas as pd
+from data_collector import DataCollector
+from frontier import best_on_front, ga_frontier, lp_frontier, pareto_front, pareto_table, risk_aversion_grid
+from download_scheduler import DownloadScheduler
+from genetic_algorithm import GeneticAlgorithm
+from instrumentation import GenerationHooks, GenerationStats
+from island_model import IslandModel
+from lp_solver import STOP_REASON as LP_STOP_REASON, solve_mean_cvar
+from parallel import ParallelEvaluator
+from portfolio import Portfolio, evaluate_population, population_diversity
+from price_sources import YFinanceSource
+from price_store import PriceStore
+from profiles import PARAMETROS_PARETO
+from result_cache import ResultCache, make_key
+from universe import ReturnsUniverse
+from vectorized_operators import VectorizedGeneticAlgorithm
+
+# Pregões mais recentes usados na simulação da carteira e do benchmark
+SIMULATION_DAYS = 120
+
+# Motores de otimização aceitos em ``params['motor']``
+ENGINE_GA = "genetico"
+ENGINE_LP = "programacao_linear"
+ENGINE_NSGA2 = "nsga2"
+
+# Tipos de seleção aceitos em ``params['selecao']`` (o NSGA-II é um motor próprio)
+SELECTION_TYPES = tuple(
+    selection.value for selection in GeneticAlgorithm.SelectionType
+    if selection != GeneticAlgorithm.SelectionType.NSGA2
+)
+
+
+def match_tickers(tickers: List[str], columns: pd.Index) -> Dict[str, str]:
+    """
+    Associa cada ticker pedido à coluna correspondente dos retornos.
+    
+    Args:
+        tickers: Códigos pedidos, com ou sem o sufixo .SA
+        columns: Colunas disponíveis nos retornos coletados
+    
+    Returns:
+        Dict[str, str]: Coluna de cada ticker com dados, na ordem pedida
+    """
+    mapping = {}
+    for ticker in tickers:
+        ticker_sa = ticker if ticker.endswith('.SA') else ticker + ".SA"
+        if ticker_sa in columns:
+            mapping[ticker] = ticker_sa
+        elif ticker in columns:
+            mapping[ticker] = ticker
+    return mapping
+
+
+def cvar_weight(params: dict) -> float:
+    """
+    Retorna o peso do CVaR no fitness de uma otimização.
+    
+    É o mesmo peso em todos os motores (algoritmo genético, programação
+    linear e escolha da carteira da frente de Pareto) e no fitness
+    informado no resultado.
+    
+    Args:
+        params: Parâmetros da otimização
+    
+    Returns:
+        float: ``risk_aversion`` do perfil ou, na sua ausência, ``risk_free_rate``
+    """
+    return params.get('risk_aversion', params['risk_free_rate'])
+
+
+def default_collector(tickers: List[str]) -> DataCollector:
+    """Cria o coletor padrão: armazém local e download em lotes do Yahoo Finance."""
+    return DataCollector(tickers, store=PriceStore(), source=DownloadScheduler(YFinanceSource()))
+
+
+def run_optimization(
+    tickers: List[str],
+    params: dict,
+    capital: float,
+    collector: DataCollector = None,
+    cache: ResultCache = None,
+    hooks: GenerationHooks = None,
+    cancel_event: Event = None,
+    on_phase: Callable[[str], None] = None
+) -> dict:
+    """
+    Executa uma otimização completa da carteira.
+    
+    Args:
+        tickers: Códigos das ações selecionadas
+        params: Parâmetros do algoritmo genético (``population_size``,
+            ``max_generations``, ``threshold``, ``crossover_rate``,
+            ``mutation_rate``, ``risk_free_rate`` e, opcionalmente, os
+            critérios de convergência, a ``semente``, o ``motor``:
+            ``ENGINE_GA``, padrão, ``ENGINE_LP`` para a solução exata ou
+            ``ENGINE_NSGA2`` para a frente de Pareto compartilhada,
+            ``selecao``, valor de ``GeneticAlgorithm.SelectionType`` usado
+            pelo algoritmo genético (padrão: torneio), ``comparar_otimo``,
+            que resolve também o programa linear nos motores evolutivos,
+            ``risk_aversion``, peso do CVaR no fitness de todos os motores
+            (padrão: ``risk_free_rate``; ver ``cvar_weight``),
+            ``pontos_fronteira``, número de pontos da fronteira eficiente,
+            ``processos``, número de processos que avaliam o fitness do
+            algoritmo genético em paralelo (padrão: avaliação no processo
+            atual), e ``ilhas``, número de subpopulações do algoritmo
+            genético no ``IslandModel`` (padrão: população única))
+        capital: Valor inicial do investimento
+        collector: Coletor de dados (padrão: ``default_collector``)
+        cache: Cache de resultados consultado antes da evolução
+        hooks: Ganchos notificados a cada geração (não usados no modelo de
+            ilhas, cujas gerações correm em outros processos)
+        cancel_event: Evento que encerra a evolução quando sinalizado
+        on_phase: Função chamada com a descrição de cada etapa
+    
+    Returns:
+        dict: Pesos, fitness, fitness ótimo (programação linear; None
+        nos motores evolutivos sem ``comparar_otimo``),
+        métricas de risco/retorno, histórico da evolução, evolução do
+        capital e do benchmark, motivo de parada, fronteira eficiente
+        (None se não pedida), frente de Pareto (None fora do NSGA-II) e
+        avisos da coleta
+    
+    Raises:
+        ValueError: Menos de duas ações com dados disponíveis, motor ou
+            tipo de seleção desconhecido
+    """
+    engine = params.get('motor', ENGINE_GA)
+    if engine not in (ENGINE_GA, ENGINE_LP, ENGINE_NSGA2):
+        raise ValueError(f"Motor de otimização desconhecido: {engine}")
+    selection = params.get('selecao', GeneticAlgorithm.SelectionType.TOURNAMENT.value)
+    if selection not in SELECTION_TYPES:
+        raise ValueError(f"Tipo de seleção desconhecido: {selection}")
+    notify = on_phase or (lambda phase: None)
+    weight = cvar_weight(params)
+    
+    notify("📊 Carregando dados históricos das ações...")
+    collector = collector or default_collector(tickers)
+    market = collector.download_market_data()
+    
+    mapping = match_tickers(tickers, market.returns.columns)
+    if len(mapping) < 2:
+        raise ValueError(f"Dados insuficientes. Apenas {len(mapping)} ações disponíveis de {len(tickers)} selecionadas.")
+    
+    # Universo compartilhado por população, algoritmo e métricas finais
+    universe = ReturnsUniverse.from_returns(market.returns, tickers=list(mapping.values()), benchmark=collector.benchmark)
+    report = collector.last_report
+    warnings = {
+        'acoes_nao_carregadas': [ticker for ticker in tickers if ticker not in mapping],
+        'falhas_download': dict(report.failed) if report is not None else {}
+    }
+    
+    # Mesmos dados, ativos, parâmetros e semente: reaproveita o resultado anterior
+    # (o número de processos não altera o resultado e fica fora da chave). A
+    # impressão digital da coleta inclui o benchmark, cuja evolução faz parte do resultado
+    key_params = {name: value for name, value in params.items() if name != 'processos'}
+    key = make_key(market.fingerprint, universe.tickers, {**key_params, 'capital_inicial': capital}, params.get('semente'))
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return {**cached, **warnings, 'em_cache': True}
+    
+    # Ótimo exato do mesmo fitness: motor alternativo e, se pedido, referência para o AG
+    optimum = None
+    if engine == ENGINE_LP or params.get('comparar_otimo'):
+        notify("📐 Resolvendo o problema média-CVaR por programação linear...")
+        optimum = solve_mean_cvar(universe, weight)
+    
+    pareto = None
+    if engine == ENGINE_LP:
+        best = Portfolio(optimum.weights, universe, risk_free_rate=weight)
+        history = {'melhor': [], 'media': []}
+        generations, stop_reason = 0, LP_STOP_REASON
+    elif engine == ENGINE_NSGA2:
+        front = pareto_front_cached(universe, params, cache, hooks, cancel_event, notify)
+        # Cada perfil escolhe a carteira da frente pela sua aversão ao risco
+        chosen = best_on_front(universe, front['pesos'], weight)
+        best = Portfolio(front['pesos'][chosen], universe, risk_free_rate=weight)
+        pareto = pareto_table(universe, front['pesos'])
+        history = front['fitness_hist']
+        generations, stop_reason = front['geracoes_executadas'], front['motivo_parada']
+    elif (params.get('ilhas') or 1) > 1:
+        notify("🏝️ Evoluindo as ilhas do algoritmo genético...")
+        # A população é repartida entre as ilhas; cada ilha envia seus dois melhores a cada migração
+        island_size = max(-(-params['population_size'] // params['ilhas']), 3)
+        model = IslandModel(
+            universe,
+            islands=params['ilhas'],
+            island_size=island_size,
+            max_generations=params['max_generations'],
+            mutation_rate=params['mutation_rate'],
+            crossover_rate=params['crossover_rate'],
+            threshold=params['threshold'],
+            risk_free_rate=weight,
+            selection_type=GeneticAlgorithm.SelectionType(selection),
+            max_workers=params.get('processos'),
+            seed=params.get('semente'),
+            cancel_event=cancel_event
+        )
+        best = model.run()
+        history = {
+            'melhor': model.results['best_fitness'].tolist(),
+            'media': model.results['mean_fitness'].tolist()
+        }
+        generations, stop_reason = len(model.results), model.results.attrs['stop_reason']
+    else:
+        notify("🧬 Inicializando população do algoritmo genético...")
+        # Um único gerador semeado para população e operadores: execução reprodutível
+        rng = np.random.default_rng(params.get('semente'))
+        population = Portfolio.random_population(
+            universe,
+            params['population_size'],
+            risk_free_rate=weight,
+            rng=rng
+        )
+        
+        notify("🔄 Executando evolução do algoritmo genético...")
+        # Fitness avaliado em um pool de processos, quando pedido mais de um
+        workers = params.get('processos') or 1
+        evaluator = ParallelEvaluator(universe, max_workers=workers) if workers > 1 else None
+        try:
+            # Operadores vetorizados sobre a matriz de pesos da população
+            ga = VectorizedGeneticAlgorithm(
+                population=population,
+                fitness_key=lambda p: p.fitness(),
+                batch_fitness=evaluator or evaluate_population,
+                max_generations=params['max_generations'],
+                mutation_rate=params['mutation_rate'],
+                crossover_rate=params['crossover_rate'],
+                selection_type=GeneticAlgorithm.SelectionType(selection),
+                threshold=params['threshold'],
+                stagnation_window=params.get('stagnation_window'),
+                stagnation_epsilon=params.get('stagnation_epsilon', 0.0),
+                gap_tolerance=params.get('gap_tolerance'),
+                diversity_floor=params.get('diversity_floor'),
+                diversity=population_diversity,
+                hooks=hooks,
+                rng=rng,
+                cancel_event=cancel_event
+            )
+            best = ga.run()
+        finally:
+            if evaluator is not None:
+                evaluator.close()
+        history = {
+            'melhor': ga.results['best_fitness'].tolist(),
+            'media': ga.results['mean_fitness'].tolist()
+        }
+        generations, stop_reason = len(ga.results), ga.stop_reason.value
+    
+    frontier = None
+    points = params.get('pontos_fronteira') or 0
+    if points and stop_reason != GeneticAlgorithm.StopReason.CANCELLED.value:
+        notify("🗺️ Traçando a fronteira eficiente...")
+        rates = risk_aversion_grid(points)
+        if engine == ENGINE_LP:
+            frontier = lp_frontier(universe, rates)
+        else:
+            frontier = ga_frontier(
+                universe,
+                rates,
+                params,
+                cancel_event=cancel_event,
+                on_point=lambda point, total: notify(f"🗺️ Traçando a fronteira eficiente (ponto {point + 1} de {total})...")
+            )
+            if cancel_event is not None and cancel_event.is_set():
+                # Cancelada durante o traçado: a fronteira traz os pontos concluídos
+                stop_reason = GeneticAlgorithm.StopReason.CANCELLED.value
+    
+    notify("📈 Calculando métricas finais...")
+    fitness = best.fitness()
+    raw_weights = best.weights
+    weights = pd.Series({ticker: raw_weights[column] for ticker, column in mapping.items()})
+    
+    # Métricas adicionais - pesos já alinhados à ordem do universo
+    normalized = best.normalized_genes()
+    portfolio_returns = pd.Series(universe.matrix @ normalized, index=universe.dates)
+    volatility = np.sqrt(normalized @ universe.cov @ normalized) * np.sqrt(252)
+    
+    portfolio_value = pd.Series(capital * np.cumprod(1 + portfolio_returns.tail(SIMULATION_DAYS)))
+    # Benchmark calculado sobre a mesma coleta dos ativos
+    benchmark_value = market.benchmark_value(capital, SIMULATION_DAYS)
+    if benchmark_value is not None:
+        benchmark_value = benchmark_value.reset_index(drop=True)
+    
+    result = {
+        'pesos': weights,
+        'fitness': fitness,
+        'fitness_otimo': optimum.fitness if optimum is not None else None,
+        'retorno_esperado': best.ExpReturn,
+        'volatilidade': volatility,
+        'cvar': best.cvar,
+        'fitness_hist': history,
+        'valor_portfolio': portfolio_value,
+        'valor_bovespa': benchmark_value if benchmark_value is not None else [],
+        'datas': portfolio_value.index,
+        'geracoes_executadas': generations,
+        'convergiu': fitness >= params['threshold'],
+        'motivo_parada': stop_reason,
+        'fronteira': frontier,
+        'pareto': pareto,
+        'versao_dados': market.fingerprint
+    }
+    # Execuções canceladas não são memorizadas: o resultado está incompleto
+    if cache is not None and stop_reason != GeneticAlgorithm.StopReason.CANCELLED.value:
+        cache.put(key, result)
+    return {**result, **warnings, 'em_cache': False}
+
+
+def pareto_front_cached(
+    universe: ReturnsUniverse,
+    params: dict,
+    cache: ResultCache = None,
+    hooks: GenerationHooks = None,
+    cancel_event: Event = None,
+    notify: Callable[[str], None] = None
+) -> dict:
+    """
+    Obtém a frente de Pareto do universo, consultando o cache antes do NSGA-II.
+    
+    A chave da frente depende apenas dos retornos do universo (a frente não
+    usa o benchmark), dos ativos, de ``PARAMETROS_PARETO`` e da semente, não
+    do perfil: perfis diferentes
+    reaproveitam a mesma frente, cada um escolhendo a carteira de maior
+    fitness para a sua aversão ao risco.
+    
+    Args:
+        universe: Universo de ativos
+        params: Parâmetros da otimização (usa ``semente`` e ``cvar_weight``)
+        cache: Cache de resultados (opcional)
+        hooks: Ganchos notificados a cada geração
+        cancel_event: Evento que encerra a evolução quando sinalizado
+        notify: Função chamada com a descrição da etapa
+    
+    Returns:
+        dict: Pesos da frente (``pesos``, F x N), histórico do fitness
+        escalar da evolução, gerações executadas e motivo de parada
+    """
+    key = make_key(universe.fingerprint, universe.tickers, {'frente_pareto': PARAMETROS_PARETO}, params.get('semente'))
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    if notify is not None:
+        notify("🧬 Evoluindo a frente de Pareto (NSGA-II)...")
+    weights, ga = pareto_front(
+        universe,
+        PARAMETROS_PARETO,
+        risk_free_rate=cvar_weight(params),
+        rng=np.random.default_rng(params.get('semente')),
+        hooks=hooks,
+        cancel_event=cancel_event
+    )
+    front = {
+        'pesos': weights,
+        'fitness_hist': {
+            'melhor': ga.results['best_fitness'].tolist(),
+            'media': ga.results['mean_fitness'].tolist()
+        },
+        'geracoes_executadas': len(ga.results),
+        'motivo_parada': ga.stop_reason.value
+    }
+    if cache is not None and ga.stop_reason != GeneticAlgorithm.StopReason.CANCELLED:
+        cache.put(key, front)
+    return front
+
+
+class OptimizationJob(GenerationHooks):
+    """
+    Otimização executada em segundo plano, em uma thread própria.
+    
+    O job é também o gancho de gerações do algoritmo genético: cada geração
+    concluída é acrescentada a ``history``, que pode ser lido por outra
+    thread (a interface) enquanto a evolução prossegue.
+    """
+    
+    class Status(Enum):
+        """Estados de um job de otimização."""
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        CANCELLED = "cancelled"
+        FAILED = "failed"
+    
+    def __init__(self, tickers: List[str], params: dict, capital: float, **service_options) -> None:
+        """
+        Inicializa o job sem iniciá-lo.
+        
+        Args:
+            tickers: Códigos das ações selecionadas
+            params: Parâmetros do algoritmo genético
+            capital: Valor inicial do investimento
+            service_options: Opções repassadas a ``run_optimization``
+                (``collector``, ``cache``)
+        """
+        self.id: str = uuid4().hex[:8]
+        self.tickers = list(tickers)
+        self.params = dict(params)
+        self.capital = capital
+        self.status = OptimizationJob.Status.PENDING
+        self.phase: str = "⏳ Aguardando início..."
+        self.result: dict = None
+        self.error: Exception = None
+        self._service_options = service_options
+        self._history: List[GenerationStats] = []
+        self._lock = Lock()
+        self._cancel_event = Event()
+        self._thread: Thread = None
+    
+    @property
+    def history(self) -> List[GenerationStats]:
+        """Retorna uma cópia das métricas das gerações já concluídas."""
+        with self._lock:
+            return list(self._history)
+    
+    @property
+    def done(self) -> bool:
+        """Indica se o job terminou (com sucesso, cancelado ou com erro)."""
+        return self.status in (
+            OptimizationJob.Status.DONE, OptimizationJob.Status.CANCELLED, OptimizationJob.Status.FAILED
+        )
+    
+    def on_generation_end(self, stats: GenerationStats) -> None:
+        """Acrescenta as métricas da geração ao histórico."""
+        with self._lock:
+            self._history.append(stats)
+    
+    def _set_phase(self, phase: str) -> None:
+        """Atualiza a descrição da etapa corrente."""
+        self.phase = phase
+    
+    def _run(self) -> None:
+        """Corpo da thread: executa a otimização e registra o desfecho."""
+        try:
+            self.result = run_optimization(
+                self.tickers,
+                self.params,
+                self.capital,
+                hooks=self,
+                cancel_event=self._cancel_event,
+                on_phase=self._set_phase,
+                **self._service_options
+            )
+            cancelled = self.result['motivo_parada'] == GeneticAlgorithm.StopReason.CANCELLED.value
+            self.status = OptimizationJob.Status.CANCELLED if cancelled else OptimizationJob.Status.DONE
+        except Exception as e:
+            self.error = e
+            self.status = OptimizationJob.Status.FAILED
+    
+    def start(self) -> 'OptimizationJob':
+        """
+        Inicia a otimização em uma thread de segundo plano.
+        
+        Returns:
+            OptimizationJob: O próprio job, para encadeamento
+        
+        Raises:
+            RuntimeError: Job já iniciado
+        """
+        if self._thread is not None:
+            raise RuntimeError("O job de otimização já foi iniciado.")
+        self.status = OptimizationJob.Status.RUNNING
+        self._thread = Thread(target=self._run, name=f"otimizacao-{self.id}", daemon=True)
+        self._thread.start()
+        return self
+    
+    def cancel(self) -> None:
+        """Pede o encerramento da evolução ao fim da geração corrente."""
+        self._cancel_event.set()
+    
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Aguarda o término do job.
+        
+        Args:
+            timeout: Tempo máximo de espera, em segundos (padrão: sem limite)
+        
+        Returns:
+            bool: Se o job terminou dentro do tempo
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+    
+    def __repr__(self) -> str:
+        return f"OptimizationJob({self.id}, {self.status.value}, {len(self._history)} gerações)"
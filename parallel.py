@@ -0,0 +1,154 @@
+"""
+Módulo para avaliação paralela de fitness em um pool de processos.
+
+A matriz de retornos do universo é copiada uma única vez para um bloco de
+``multiprocessing.shared_memory``; cada processo do pool a acessa sem cópia,
+e apenas as matrizes de pesos de cada lote trafegam entre os processos.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Tuple
+import os
+import numpy as np
+from universe import ReturnsUniverse
+from portfolio import Portfolio, pending_groups, normalized_weights_matrix, score_weights, store_evaluations
+
+# Estado de cada processo do pool, preenchido por _attach_shared_returns
+_worker_memory: shared_memory.SharedMemory = None
+_worker_universe: ReturnsUniverse = None
+
+
+class SharedReturns:
+    """
+    Matriz de retornos de um universo publicada em memória compartilhada.
+    
+    O processo que cria o bloco é responsável por liberá-lo com ``close()``.
+    """
+    
+    def __init__(self, universe: ReturnsUniverse) -> None:
+        """
+        Copia a matriz de retornos do universo para memória compartilhada.
+        
+        Args:
+            universe: Universo cujos retornos serão compartilhados
+        """
+        matrix = universe.matrix
+        self.tickers: Tuple[str, ...] = universe.tickers
+        self.shape: Tuple[int, int] = matrix.shape
+        self.mean: np.ndarray = universe.mean
+        self._memory = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        shared = np.ndarray(self.shape, dtype=np.float64, buffer=self._memory.buf)
+        shared[:] = matrix
+    
+    @property
+    def name(self) -> str:
+        """Retorna o nome do bloco de memória compartilhada."""
+        return self._memory.name
+    
+    @property
+    def initargs(self) -> tuple:
+        """Retorna os argumentos de ``_attach_shared_returns`` para os processos do pool."""
+        return (self.name, self.tickers, self.shape, self.mean)
+    
+    def close(self) -> None:
+        """Libera o bloco de memória compartilhada."""
+        self._memory.close()
+        self._memory.unlink()
+
+
+def _attach_shared_returns(name: str, tickers: Tuple[str, ...], shape: Tuple[int, int], mean: np.ndarray) -> None:
+    """
+    Inicializador dos processos do pool: monta o universo sobre a matriz compartilhada.
+    
+    Args:
+        name: Nome do bloco de memória compartilhada
+        tickers: Códigos dos ativos, na ordem das colunas
+        shape: Dimensões (T x N) da matriz de retornos
+        mean: Vetor de retornos médios dos ativos
+    """
+    global _worker_memory, _worker_universe
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    matrix = np.ndarray(shape, dtype=np.float64, buffer=_worker_memory.buf)
+    _worker_universe = ReturnsUniverse.from_matrix(tickers, matrix, mean=mean)
+
+
+def worker_universe() -> ReturnsUniverse:
+    """Retorna o universo montado no processo atual pelo inicializador do pool."""
+    return _worker_universe
+
+
+def _score_chunk(weights_matrix: np.ndarray, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Avalia um lote de pesos contra a matriz compartilhada do processo.
+    
+    Args:
+        weights_matrix: Matriz (P x N) de pesos normalizados
+        alpha: Taxa de confiança para cálculo do VaR
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Retornos esperados e CVaRs do lote
+    """
+    return score_weights(_worker_universe.matrix, _worker_universe.mean, weights_matrix, alpha)
+
+
+class ParallelEvaluator:
+    """
+    Avaliador de população que distribui o fitness entre vários processos.
+    
+    Pode ser passado diretamente como ``batch_fitness`` do
+    ``GeneticAlgorithm``. Deve ser encerrado com ``close()`` ou usado como
+    gerenciador de contexto, para finalizar o pool e liberar a memória.
+    """
+    
+    def __init__(self, universe: ReturnsUniverse, max_workers: int = None, alpha: float = 0.95) -> None:
+        """
+        Inicializa o pool de processos.
+        
+        Args:
+            universe: Universo compartilhado pela população
+            max_workers: Número de processos (padrão: número de CPUs)
+            alpha: Taxa de confiança para cálculo do VaR
+        """
+        self.universe = universe
+        self.alpha = alpha
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._shared = SharedReturns(universe)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_attach_shared_returns,
+            initargs=self._shared.initargs
+        )
+    
+    def __call__(self, portfolios: List[Portfolio]) -> None:
+        """
+        Avalia em paralelo os portfólios ainda sem fitness em cache.
+        
+        Args:
+            portfolios: Portfólios a serem avaliados
+        
+        Raises:
+            ValueError: Portfólio de um universo diferente do avaliador
+        """
+        for group in pending_groups(portfolios, self.alpha):
+            if group[0].universe is not self.universe:
+                raise ValueError("Portfólio pertence a um universo diferente do avaliador paralelo.")
+            
+            weights_matrix = normalized_weights_matrix(group)
+            chunks = np.array_split(weights_matrix, min(self.max_workers, len(group)))
+            results = list(self._executor.map(_score_chunk, chunks, [self.alpha] * len(chunks)))
+            
+            exp_returns = np.concatenate([exp for exp, _ in results])
+            cvars = np.concatenate([cvar for _, cvar in results])
+            store_evaluations(group, self.alpha, exp_returns, cvars)
+    
+    def close(self) -> None:
+        """Encerra o pool de processos e libera a memória compartilhada."""
+        self._executor.shutdown(wait=True)
+        self._shared.close()
+    
+    def __enter__(self) -> 'ParallelEvaluator':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
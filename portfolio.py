@@ -6,75 +6,214 @@ para uso em algoritmos genéticos.
 """
 
 from functools import reduce
-from random import random, uniform
+from threading import local
 import numpy as np
 import pandas as pd
 from chromosome import Chromosome
-from typing import TypeVar, Tuple
+from universe import ReturnsUniverse
+from tail_risk import var_cvar, var_cvar_batch
+from typing import TypeVar, Tuple, List, Dict, Union
 
 T = TypeVar('T', bound='Chromosome')
 
+# Gerador usado pelos portfólios criados sem gerador explícito
+_default_rng = np.random.default_rng()
+
+
+class _FitnessCounters(local):
+    """
+    Contadores de avaliações de fitness, um conjunto por thread.
+    
+    Cada otimização roda na sua própria thread (``OptimizationJob``), de modo
+    que execuções simultâneas não misturam suas contagens.
+    """
+    
+    def __init__(self) -> None:
+        self.evaluations = 0
+        self.cache_hits = 0
+
+
+_counters = _FitnessCounters()
+
 class Portfolio(Chromosome):
     """
     Classe que representa um portfólio de ativos como cromossomo genético.
     
     Esta classe implementa um portfólio de investimentos que pode ser
     otimizado usando algoritmos genéticos.
+    
+    O fitness é memoizado por instância junto com ``ExpReturn`` e ``cvar``:
+    o algoritmo genético consulta o mesmo cromossomo várias vezes por
+    geração (torneio, elitismo, estatísticas), e o resultado só muda quando
+    ``mutate()`` altera os pesos.
+    
+    Os genes são um vetor float64 alinhado à ordem de tickers de um
+    ``ReturnsUniverse`` compartilhado; quando a população é avaliada em lote,
+    cada vetor passa a ser uma linha (view) da matriz da população.
+    
+    A aleatoriedade da mutação vem do gerador recebido na construção e
+    herdado pelos filhos do cruzamento, de modo que uma população criada
+    com um gerador semeado evolui de forma reprodutível.
     """
     
-    def __init__(self, weights: dict, returns: pd.DataFrame, risk_free_rate: float = 0.2) -> None:
+    __slots__ = ('_genes', 'universe', 'risk_free_rate', '_rng', '_fitness_cache', 'ExpReturn', 'cvar')
+    
+    def __init__(
+        self,
+        weights: Union[dict, np.ndarray],
+        returns: Union[pd.DataFrame, ReturnsUniverse],
+        risk_free_rate: float = 0.2,
+        rng: np.random.Generator = None
+    ) -> None:
         """
         Inicializa um portfólio.
         
         Args:
-            weights: Dicionário com pesos dos ativos
-            returns: DataFrame com retornos históricos dos ativos
+            weights: Dicionário com pesos dos ativos ou vetor alinhado ao universo
+            returns: Universo de ativos compartilhado ou DataFrame com retornos
+                históricos (neste caso o universo é criado a partir das chaves de
+                ``weights``)
             risk_free_rate: Taxa livre de risco
+            rng: Gerador de números aleatórios da mutação (padrão: gerador
+                compartilhado, não semeado)
         """
-        self._weights = weights
-        self.returns = returns
+        if isinstance(returns, ReturnsUniverse):
+            self.universe = returns
+        else:
+            self.universe = ReturnsUniverse(weights.keys(), returns)
+        
+        if isinstance(weights, dict):
+            self._genes = self.universe.to_array(weights)
+        else:
+            # Mantém a view quando o vetor já é float64 (linha da matriz da população)
+            self._genes = np.asarray(weights, dtype=np.float64)
         self.risk_free_rate = risk_free_rate
+        self._rng = rng
+        self._fitness_cache = {}
+    
+    @property
+    def returns(self) -> pd.DataFrame:
+        """Retorna o DataFrame de retornos históricos do universo."""
+        return self.universe.returns
+    
+    @property
+    def rng(self) -> np.random.Generator:
+        """Retorna o gerador de números aleatórios do portfólio."""
+        return self._rng if self._rng is not None else _default_rng
+    
+    @property
+    def genes(self) -> np.ndarray:
+        """Retorna o vetor de pesos brutos (não normalizados)."""
+        return self._genes
+    
+    @property
+    def _weights(self) -> dict:
+        """Retorna os pesos brutos como dicionário, para inspeção."""
+        return dict(zip(self.universe.tickers, self._genes.tolist()))
     
     @property
     def weights(self) -> dict:
-        """Retorna um dicionário com os pesos normalizados dos ativos."""
-        total = sum(self._weights.values())
+        """Retorna um dicionário com os pesos normalizados dos ativos (uso em exibição)."""
+        return dict(zip(self.universe.tickers, self.normalized_genes().tolist()))
+    
+    def normalized_genes(self) -> np.ndarray:
+        """
+        Retorna o vetor de pesos normalizados para soma igual a 1.
+        
+        Raises:
+            ValueError: Se a soma dos pesos for zero
+        """
+        total = self._genes.sum()
         if total == 0:
             raise ValueError("A soma dos valores no dicionário é zero. Não é possível normalizar os pesos.")
-        
-        normalized_weight = {k: v / total for k, v in self._weights.items()}
-        return normalized_weight
+        return self._genes / total
     
     def fitness(self, alpha: float = 0.95) -> float:
         """
         Calcula a aptidão do portfólio baseada em retorno e risco.
         
+        O retorno esperado e o CVaR ficam em cache por nível de confiança até
+        a próxima mutação; chamadas repetidas apenas recompõem a aptidão.
+        
         Args:
             alpha: Taxa de confiança para cálculo do VaR
             
         Returns:
             float: Valor de aptidão do portfólio
-        """        
-        # Converte os pesos do portfólio em um array numpy para cálculos vetorizados   
-        weights_array = np.array(list(self.weights.values()))
-        # Calcula o retorno médio de cada ativo no portfólio      
-        mean_return = self.returns.mean()
-        # Calcula os retornos do portfólio como um todo, usando produto escalar (média ponderada)
-        portfolio_returns = self.returns.dot(weights_array)
-        # Calcula o retorno esperado como a média dos retornos do portfólio
-        self.ExpReturn = portfolio_returns.mean()
+        """
+        cached = self._fitness_cache.get(alpha)
+        if cached is None:
+            cached = self._evaluate(alpha)
+            self._fitness_cache[alpha] = cached
+            _counters.evaluations += 1
+        else:
+            _counters.cache_hits += 1
         
-        # Calcula o valor de risco (VaR) usando o percentil correto
-        # Para VaR com confiança de 95%, usamos o percentil 5 (os piores 5% dos retornos)
-        portfolio_var = np.percentile(portfolio_returns, (1-alpha)*100)
+        self.ExpReturn, self.cvar = cached
+        # Maximiza o retorno ajustado pela taxa de aversão ao risco e penaliza pelo CVaR:
+        # o CVaR é o retorno médio da cauda (negativo em perdas), então é somado
+        return (1 - self.risk_free_rate) * self.ExpReturn + self.risk_free_rate * self.cvar
+    
+    def objectives(self, alpha: float = 0.95) -> Tuple[float, float]:
+        """
+        Retorna os objetivos da otimização multiobjetivo, ambos a maximizar.
+        
+        Args:
+            alpha: Taxa de confiança para cálculo do VaR
+            
+        Returns:
+            Tuple[float, float]: Retorno esperado e CVaR (retorno médio da cauda)
+        """
+        self.fitness(alpha)
+        return self.ExpReturn, self.cvar
+    
+    def _evaluate(self, alpha: float) -> Tuple[float, float]:
+        """
+        Calcula retorno esperado e CVaR do portfólio sobre todo o histórico.
+        
+        Args:
+            alpha: Taxa de confiança para cálculo do VaR
+            
+        Returns:
+            Tuple[float, float]: Retorno esperado e CVaR
+        """
+        weights_array = self.normalized_genes()
+        # Calcula os retornos do portfólio como um todo, usando produto escalar (média ponderada)
+        portfolio_returns = self.universe.matrix @ weights_array
+        # O retorno esperado é a média dos retornos de cada ativo ponderada pelos
+        # pesos; as médias são pré-calculadas uma única vez pelo universo
+        exp_return = self.universe.mean @ weights_array
         
         # Calcula o Conditional Value at Risk (CVaR), que é a média dos retornos abaixo do VaR
+        # (para 95% de confiança, os piores 5% dos retornos), isolados por partição em O(T)
         # Isso representa a perda média esperada nos piores cenários
-        self.cvar = portfolio_returns[portfolio_returns <= portfolio_var].mean()
+        _, cvar = var_cvar(portfolio_returns, alpha)
+        return exp_return, cvar
+    
+    def invalidate_cache(self) -> None:
+        """Descarta o fitness memoizado após alterações nos pesos."""
+        self._fitness_cache.clear()
+    
+    @classmethod
+    def fitness_stats(cls) -> dict:
+        """
+        Retorna os contadores de avaliações de fitness da thread atual.
         
-        # Retorna a função de aptidão final que equilibra retorno e risco
-        # Maximiza o retorno ajustado pela taxa de aversão ao risco e penaliza pelo CVaR
-        return (1 - self.risk_free_rate) * mean_return.dot(weights_array) - self.risk_free_rate * self.cvar
+        Returns:
+            dict: Avaliações calculadas, avaliações evitadas pelo cache e taxa de acerto
+        """
+        total = _counters.evaluations + _counters.cache_hits
+        return {
+            'evaluations': _counters.evaluations,
+            'cache_hits': _counters.cache_hits,
+            'hit_rate': _counters.cache_hits / total if total else 0.0
+        }
+    
+    @classmethod
+    def reset_fitness_stats(cls) -> None:
+        """Zera os contadores de avaliações de fitness da thread atual."""
+        _counters.evaluations = 0
+        _counters.cache_hits = 0
 
     def crossover(self, other: T) -> Tuple[T, T]:
         """
@@ -86,21 +225,31 @@ class Portfolio(Chromosome):
         Returns:
             Tuple[T, T]: Dois portfólios resultantes do crossover
         """
-        w1 = self.weights
-        w2 = other.weights
+        w1 = self.normalized_genes()
+        w2 = other.normalized_genes()
 
         mid = len(w1) // 2
 
-        new_w1 = {k: w1[k] for k in list(w1.keys())[:mid]}
-        new_w1.update({k: w2[k] for k in list(w2.keys())[mid:]})
+        new_w1 = np.concatenate((w1[:mid], w2[mid:]))
+        new_w2 = np.concatenate((w2[:mid], w1[mid:]))
 
-        new_w2 = {k: w2[k] for k in list(w2.keys())[:mid]}
-        new_w2.update({k: w1[k] for k in list(w1.keys())[mid:]})
-
-        child1 = Portfolio(weights=new_w1, returns=self.returns, risk_free_rate=self.risk_free_rate)
-        child2 = Portfolio(weights=new_w2, returns=self.returns, risk_free_rate=self.risk_free_rate)
+        child1 = Portfolio(weights=new_w1, returns=self.universe, risk_free_rate=self.risk_free_rate, rng=self._rng)
+        child2 = Portfolio(weights=new_w2, returns=self.universe, risk_free_rate=self.risk_free_rate, rng=self._rng)
         return child1, child2
 
+    def copy(self) -> 'Portfolio':
+        """
+        Cria uma cópia do portfólio com genes próprios.
+        
+        O fitness memoizado continua válido, pois os genes são os mesmos.
+        
+        Returns:
+            Portfolio: Novo portfólio do mesmo universo e taxa
+        """
+        clone = Portfolio(self._genes.copy(), self.universe, risk_free_rate=self.risk_free_rate, rng=self._rng)
+        clone._fitness_cache = dict(self._fitness_cache)
+        return clone
+
     def mutate(self, mutation_rate: float = 0.2) -> None:
         """
         Realiza a mutação em um portfólio.
@@ -108,25 +257,203 @@ class Portfolio(Chromosome):
         Args:
             mutation_rate: Taxa de mutação
         """
-        for key in self._weights:
-            if random() < mutation_rate:
-                self._weights[key] = max(0, self._weights[key] + uniform(-0.1, 0.1))
+        genes = self._genes
+        rng = self.rng
+        mask = rng.random(len(genes)) < mutation_rate
+        if mask.any():
+            genes[mask] = np.maximum(0, genes[mask] + rng.uniform(-0.1, 0.1, int(mask.sum())))
+            self.invalidate_cache()
     
     @classmethod
-    def random_instance(cls, weights, returns, risk_free_rate=0.2):
+    def random_instance(cls, weights, returns, risk_free_rate=0.2, rng: np.random.Generator = None):
         """
         Cria uma instância aleatória de portfólio.
         
         Args:
             weights: Dicionário base de pesos
-            returns: DataFrame de retornos
+            returns: Universo de ativos ou DataFrame de retornos
             risk_free_rate: Taxa livre de risco
+            rng: Gerador de números aleatórios (padrão: gerador compartilhado)
             
         Returns:
             Portfolio: Nova instância aleatória
         """
-        random_weights = {k: uniform(0, 1) for k in weights}
-        return Portfolio(weights=random_weights, returns=returns, risk_free_rate=risk_free_rate)
+        generator = rng if rng is not None else _default_rng
+        random_weights = dict(zip(weights, generator.uniform(0, 1, len(weights)).tolist()))
+        return Portfolio(weights=random_weights, returns=returns, risk_free_rate=risk_free_rate, rng=rng)
+    
+    @classmethod
+    def random_population(
+        cls,
+        universe: ReturnsUniverse,
+        size: int,
+        risk_free_rate: float = 0.2,
+        rng: np.random.Generator = None
+    ) -> List['Portfolio']:
+        """
+        Cria uma população aleatória sobre uma única matriz de pesos.
+        
+        Args:
+            universe: Universo de ativos compartilhado
+            size: Número de portfólios
+            risk_free_rate: Taxa livre de risco
+            rng: Gerador de números aleatórios, herdado pelos portfólios
+                (padrão: gerador compartilhado)
+            
+        Returns:
+            List[Portfolio]: Portfólios cujos genes são linhas da mesma matriz
+        """
+        generator = rng if rng is not None else _default_rng
+        population_matrix = generator.uniform(0, 1, (size, universe.size))
+        return [
+            Portfolio(weights=row, returns=universe, risk_free_rate=risk_free_rate, rng=rng)
+            for row in population_matrix
+        ]
     
     def __repr__(self) -> str:
         return f"Portfolio({self.weights}, {self.returns}, {self.risk_free_rate})"
+
+
+def evaluate_population(portfolios: List[Portfolio], alpha: float = 0.95) -> None:
+    """
+    Avalia uma população inteira de portfólios em lote.
+    
+    Os genes de todos os portfólios que compartilham o mesmo universo são
+    empilhados em uma matriz (P x N), e as séries de retorno são obtidas com
+    um único produto ``retornos @ W.T``. VaR e CVaR de todas as colunas saem
+    de uma única partição ao longo do eixo do tempo. Os resultados alimentam
+    o cache de cada portfólio, de modo que as chamadas seguintes a
+    ``fitness(alpha)`` não recalculam nada.
+    
+    Args:
+        portfolios: Portfólios a serem avaliados
+        alpha: Taxa de confiança para cálculo do VaR
+    """
+    for group in pending_groups(portfolios, alpha):
+        universe = group[0].universe
+        weights_matrix = normalized_weights_matrix(group)
+        exp_returns, cvars = score_weights(universe.matrix, universe.mean, weights_matrix, alpha)
+        store_evaluations(group, alpha, exp_returns, cvars)
+
+
+def pending_groups(portfolios: List[Portfolio], alpha: float) -> List[List[Portfolio]]:
+    """
+    Agrupa por universo os portfólios ainda sem fitness em cache.
+    
+    Args:
+        portfolios: Portfólios a serem avaliados
+        alpha: Taxa de confiança para cálculo do VaR
+        
+    Returns:
+        List[List[Portfolio]]: Um grupo por universo
+    """
+    groups: Dict[int, List[Portfolio]] = {}
+    for portfolio in portfolios:
+        if alpha not in portfolio._fitness_cache:
+            groups.setdefault(id(portfolio.universe), []).append(portfolio)
+    return list(groups.values())
+
+
+def normalized_weights_matrix(portfolios: List[Portfolio]) -> np.ndarray:
+    """
+    Empilha os genes dos portfólios e normaliza cada linha para soma 1.
+    
+    Args:
+        portfolios: Portfólios de um mesmo universo
+        
+    Returns:
+        np.ndarray: Matriz (P x N) de pesos normalizados
+        
+    Raises:
+        ValueError: Se algum portfólio tiver soma de pesos igual a zero
+    """
+    genes_matrix = stack_population(portfolios)
+    totals = genes_matrix.sum(axis=1, keepdims=True)
+    if np.any(totals == 0):
+        raise ValueError("A soma dos valores no dicionário é zero. Não é possível normalizar os pesos.")
+    return genes_matrix / totals
+
+
+def score_weights(
+    returns_matrix: np.ndarray,
+    mean_returns: np.ndarray,
+    weights_matrix: np.ndarray,
+    alpha: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula retorno esperado e CVaR de vários vetores de pesos.
+    
+    Args:
+        returns_matrix: Matriz (T x N) de retornos dos ativos
+        mean_returns: Vetor (N) com o retorno médio de cada ativo
+        weights_matrix: Matriz (P x N) de pesos normalizados
+        alpha: Taxa de confiança para cálculo do VaR
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Retornos esperados e CVaRs (P)
+    """
+    # Séries de retorno de todos os portfólios: (T x N) @ (N x P) = (T x P)
+    portfolio_returns = returns_matrix @ weights_matrix.T
+    exp_returns = weights_matrix @ mean_returns
+    _, cvars = var_cvar_batch(portfolio_returns, alpha)
+    return exp_returns, cvars
+
+
+def store_evaluations(
+    portfolios: List[Portfolio],
+    alpha: float,
+    exp_returns: np.ndarray,
+    cvars: np.ndarray
+) -> None:
+    """
+    Grava no cache de cada portfólio os resultados de uma avaliação em lote.
+    
+    Args:
+        portfolios: Portfólios avaliados, na ordem das linhas
+        alpha: Taxa de confiança usada na avaliação
+        exp_returns: Retornos esperados
+        cvars: CVaRs
+    """
+    for portfolio, exp_return, cvar in zip(portfolios, exp_returns, cvars):
+        portfolio._fitness_cache[alpha] = (exp_return, cvar)
+    _counters.evaluations += len(portfolios)
+
+
+def stack_population(portfolios: List[Portfolio]) -> np.ndarray:
+    """
+    Empilha os genes dos portfólios em uma matriz compartilhada.
+    
+    Cada portfólio passa a referenciar sua linha da matriz, de modo que as
+    mutações seguintes atuam diretamente sobre ela.
+    
+    Args:
+        portfolios: Portfólios de um mesmo universo
+        
+    Returns:
+        np.ndarray: Matriz (P x N) com os genes brutos
+    """
+    genes_matrix = np.vstack([p._genes for p in portfolios])
+    for portfolio, row in zip(portfolios, genes_matrix):
+        portfolio._genes = row
+    return genes_matrix
+
+
+def population_diversity(portfolios: List[Portfolio]) -> float:
+    """
+    Mede a diversidade da população no espaço de pesos.
+    
+    A diversidade é a distância euclidiana média entre os pesos normalizados
+    de cada portfólio e o centroide da população: zero indica que todos os
+    portfólios têm a mesma alocação.
+    
+    Args:
+        portfolios: Portfólios de um mesmo universo
+        
+    Returns:
+        float: Distância média ao centroide
+    """
+    if not portfolios:
+        return 0.0
+    weights_matrix = normalized_weights_matrix(portfolios)
+    deviations = weights_matrix - weights_matrix.mean(axis=0)
+    return float(np.linalg.norm(deviations, axis=1).mean())
@@ -0,0 +1,212 @@
+"""
+Módulo contendo as fontes de preços usadas pelo ``DataCollector``.
+
+Uma fonte de preços é qualquer objeto com ``fetch_closes(tickers, start,
+end)`` que devolve os fechamentos ajustados, uma coluna por ticker. Há
+três implementações: o Yahoo Finance (``YFinanceSource``), um diretório
+local de arquivos CSV/Parquet (``LocalFileSource``), para rodar sem rede
+sobre uma cópia dos preços, e um gerador sintético determinístico
+(``SyntheticSource``), para testes e experimentos reprodutíveis.
+"""
+
+from datetime import datetime
+from typing import Callable, List, Protocol
+import os
+import zlib
+import numpy as np
+import pandas as pd
+
+# Chave de ``DataFrame.attrs`` com o motivo da falha de cada ticker omitido
+ERRORS_ATTR = 'erros'
+
+
+class PriceSource(Protocol):
+    """Interface das fontes de preços de fechamento."""
+    
+    def fetch_closes(self, tickers: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Obtém os fechamentos ajustados dos tickers no intervalo [start, end).
+        
+        Args:
+            tickers: Códigos completos dos ativos (com sufixo)
+            start: Data de início (inclusiva)
+            end: Data de fim (exclusiva)
+        
+        Returns:
+            pd.DataFrame: Fechamentos indexados por data, uma coluna por
+            ticker obtido; tickers indisponíveis são omitidos e, quando a
+            fonte conhece o motivo, ele fica em ``attrs[ERRORS_ATTR]``
+        """
+        ...
+
+
+class YFinanceSource:
+    """Fonte de preços que baixa os fechamentos ajustados do Yahoo Finance."""
+    
+    def __init__(self, download: Callable = None) -> None:
+        """
+        Inicializa a fonte.
+        
+        Args:
+            download: Função com a assinatura de ``yf.download`` (padrão:
+                o próprio ``yf.download``, importado apenas quando usado)
+        """
+        self._download = download
+    
+    def fetch_closes(self, tickers: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+        """
+        Baixa os fechamentos ajustados em uma única requisição.
+        
+        Os tickers que não puderam ser extraídos da resposta são omitidos,
+        com a exceção correspondente em ``attrs[ERRORS_ATTR]``; uma resposta
+        vazia (intervalo sem pregões) não registra erros.
+        """
+        download = self._download
+        if download is None:
+            import yfinance as yf
+            download = yf.download
+        
+        data = download(tickers, start=start, end=end, group_by="ticker", auto_adjust=True)
+        adj_close = pd.DataFrame()
+        if data is None or data.empty:
+            return adj_close
+        
+        errors = {}
+        for ticker in tickers:
+            try:
+                if len(tickers) == 1:
+                    adj_close[ticker] = data['Close']
+                else:
+                    adj_close[ticker] = data[ticker]['Close']
+            except (KeyError, TypeError) as e:
+                errors[ticker] = f"{type(e).__name__}: {e}"
+        adj_close.attrs[ERRORS_ATTR] = errors
+        return adj_close
+
+
+class LocalFileSource:
+    """
+    Fonte de preços que lê um diretório de arquivos por ticker.
+    
+    Cada ticker corresponde a ``<diretório>/<ticker>.parquet`` ou
+    ``<diretório>/<ticker>.csv``, indexado por data, com uma coluna
+    ``Close`` (ou uma única coluna de preços).
+    """
+    
+    EXTENSIONS = ('.parquet', '.csv')
+    
+    def __init__(self, directory: str) -> None:
+        """
+        Inicializa a fonte.
+        
+        Args:
+            directory: Diretório com os arquivos de preços
+        
+        Raises:
+            FileNotFoundError: Diretório inexistente
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Diretório de preços não encontrado: {directory}")
+        self.directory = directory
+    
+    def _read(self, ticker: str) -> pd.Series:
+        """Lê a série de fechamento de um ticker, ou None se não houver arquivo."""
+        for extension in self.EXTENSIONS:
+            path = os.path.join(self.directory, ticker + extension)
+            if not os.path.exists(path):
+                continue
+            if extension == '.parquet':
+                frame = pd.read_parquet(path)
+            else:
+                frame = pd.read_csv(path, index_col=0, parse_dates=True)
+            column = frame['Close'] if 'Close' in frame.columns else frame.iloc[:, 0]
+            column.index = pd.DatetimeIndex(column.index)
+            return column.astype(np.float64).sort_index()
+        return None
+    
+    def fetch_closes(self, tickers: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+        """Lê os fechamentos dos arquivos locais no intervalo pedido."""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        adj_close = {}
+        for ticker in tickers:
+            series = self._read(ticker)
+            if series is not None:
+                adj_close[ticker] = series[(series.index >= start) & (series.index < end)]
+        return pd.DataFrame(adj_close)
+
+
+class SyntheticSource:
+    """
+    Fonte de preços sintéticos determinísticos (movimento browniano geométrico).
+    
+    A trajetória de cada ticker depende apenas da semente e do próprio
+    ticker, e é ancorada em uma data fixa: o mesmo pregão tem sempre o
+    mesmo preço, qualquer que seja o intervalo ou o conjunto pedido.
+    """
+    
+    EPOCH = pd.Timestamp('2000-01-03')
+    
+    def __init__(
+        self,
+        seed: int = 0,
+        drift: float = 0.0003,
+        volatility: float = 0.02,
+        initial_price: float = 100.0
+    ) -> None:
+        """
+        Inicializa a fonte.
+        
+        Args:
+            seed: Semente dos preços gerados
+            drift: Retorno logarítmico médio diário
+            volatility: Desvio padrão diário dos retornos logarítmicos
+            initial_price: Preço na data de referência
+        """
+        self.seed = seed
+        self.drift = drift
+        self.volatility = volatility
+        self.initial_price = initial_price
+    
+    def _path(self, ticker: str, dates: pd.DatetimeIndex) -> np.ndarray:
+        """Gera os preços de um ticker para todos os pregões desde a data de referência."""
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode('utf-8'))])
+        shocks = rng.normal(self.drift, self.volatility, len(dates))
+        shocks[0] = 0.0
+        return self.initial_price * np.exp(np.cumsum(shocks))
+    
+    def fetch_closes(self, tickers: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+        """Gera os fechamentos sintéticos em dias úteis do intervalo pedido."""
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        if end <= max(start, self.EPOCH):
+            return pd.DataFrame(columns=list(tickers), dtype=np.float64)
+        
+        dates = pd.bdate_range(self.EPOCH, end - pd.Timedelta(days=1))
+        window = dates >= start
+        return pd.DataFrame(
+            {ticker: self._path(ticker, dates)[window] for ticker in tickers},
+            index=dates[window]
+        )
+
+
+def save_snapshot(closes: pd.DataFrame, directory: str, file_format: str = 'csv') -> None:
+    """
+    Grava fechamentos em um diretório legível pelo ``LocalFileSource``.
+    
+    Args:
+        closes: Fechamentos indexados por data, uma coluna por ticker
+        directory: Diretório de destino (criado se necessário)
+        file_format: ``'csv'`` ou ``'parquet'``
+    
+    Raises:
+        ValueError: Formato de arquivo não suportado
+    """
+    if file_format not in ('csv', 'parquet'):
+        raise ValueError(f"Formato de arquivo não suportado: {file_format}")
+    os.makedirs(directory, exist_ok=True)
+    for ticker in closes.columns:
+        frame = closes[[ticker]].dropna().rename(columns={ticker: 'Close'})
+        path = os.path.join(directory, f"{ticker}.{file_format}")
+        if file_format == 'parquet':
+            frame.to_parquet(path)
+        else:
+            frame.to_csv(path)
@@ -0,0 +1,265 @@
+"""
+Módulo contendo o armazenamento local de preços de fechamento.
+
+Cada ticker é guardado em um arquivo ``.npy`` próprio com pares
+(data, fechamento), lido por mapeamento em memória, e um ``manifest.json``
+registra o intervalo de datas já coberto por cada arquivo. O armazenamento
+não depende do Streamlit e sobrevive a reinícios do processo, de modo que
+o ``DataCollector`` só recorre à rede para o que ainda não está em disco.
+
+Várias instâncias podem apontar para o mesmo diretório: cada gravação relê
+o manifesto sob uma trava por diretório, sem descartar o que as outras
+instâncias gravaram. Arquivos de preços e manifesto são gravados em um
+temporário exclusivo e trocados com ``os.replace``, de modo que um leitor
+(inclusive um mapeamento em memória aberto) nunca vê um arquivo pela metade.
+"""
+
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import numpy as np
+import pandas as pd
+from atomic_files import replace_atomically
+
+# Registro de cada arquivo: data do pregão e preço de fechamento ajustado
+PRICE_DTYPE = np.dtype([('date', 'datetime64[D]'), ('close', 'float64')])
+
+# Travas de gravação por diretório, compartilhadas entre as instâncias
+_ROOT_LOCKS: Dict[str, Lock] = {}
+_ROOT_LOCKS_GUARD = Lock()
+
+
+def _root_lock(root: str) -> Lock:
+    """Retorna a trava de gravação de um diretório do armazém."""
+    key = os.path.normcase(os.path.abspath(root))
+    with _ROOT_LOCKS_GUARD:
+        return _ROOT_LOCKS.setdefault(key, Lock())
+
+
+def _to_day(value) -> np.datetime64:
+    """Converte uma data qualquer para ``datetime64[D]`` sem fuso horário."""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_localize(None)
+    return np.datetime64(timestamp.date(), 'D')
+
+
+class PriceStore:
+    """
+    Armazém em disco de séries de fechamento, um arquivo por ticker.
+    
+    Os intervalos seguem a convenção do ``yf.download``: ``start`` é
+    inclusivo e ``end`` é exclusivo.
+    """
+    
+    MANIFEST = "manifest.json"
+    
+    def __init__(self, root: str = "data/prices") -> None:
+        """
+        Inicializa o armazém, criando o diretório se necessário.
+        
+        Args:
+            root: Diretório onde ficam os arquivos e o manifesto
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = _root_lock(root)
+        self._manifest: Dict[str, dict] = self._load_manifest()
+    
+    def _load_manifest(self) -> Dict[str, dict]:
+        """Lê o manifesto do disco (vazio se ainda não existir)."""
+        path = os.path.join(self.root, self.MANIFEST)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as file:
+            return json.load(file).get('tickers', {})
+    
+    def _save_manifest(self) -> None:
+        """Grava o manifesto de forma atômica."""
+        replace_atomically(
+            os.path.join(self.root, self.MANIFEST),
+            lambda file: json.dump({'version': 1, 'tickers': self._manifest}, file, indent=2, sort_keys=True)
+        )
+    
+    def _path(self, ticker: str) -> str:
+        """Retorna o caminho do arquivo de um ticker."""
+        return os.path.join(self.root, self._manifest[ticker]['file'])
+    
+    @property
+    def tickers(self) -> Tuple[str, ...]:
+        """Retorna os tickers presentes no armazém."""
+        return tuple(sorted(self._manifest))
+    
+    def coverage(self, ticker: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Retorna o intervalo de datas coberto por um ticker.
+        
+        Args:
+            ticker: Código do ativo
+        
+        Returns:
+            Tuple[pd.Timestamp, pd.Timestamp]: Início (inclusivo) e fim
+            (exclusivo) cobertos, ou None se o ticker não estiver armazenado
+        """
+        entry = self._manifest.get(ticker)
+        if entry is None:
+            return None
+        return pd.Timestamp(entry['start']), pd.Timestamp(entry['end'])
+    
+    def covers(self, ticker: str, start: datetime, end: datetime) -> bool:
+        """
+        Verifica se o armazém cobre todo o intervalo pedido para um ticker.
+        
+        Args:
+            ticker: Código do ativo
+            start: Data de início (inclusiva)
+            end: Data de fim (exclusiva)
+        
+        Returns:
+            bool: True se nenhum pregão do intervalo precisa ser baixado
+        """
+        covered = self.coverage(ticker)
+        if covered is None:
+            return False
+        return _to_day(covered[0]) <= _to_day(start) and _to_day(end) <= _to_day(covered[1])
+    
+    def missing_ranges(self, ticker: str, start: datetime, end: datetime) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Retorna os trechos do intervalo pedido que ainda precisam ser baixados.
+        
+        Como a cobertura de cada ticker é um único intervalo contínuo, faltam
+        no máximo um trecho no início e outro no fim. Um pedido sem contato
+        com a cobertura estende o trecho até ela, mantendo-a contínua.
+        
+        Args:
+            ticker: Código do ativo
+            start: Data de início (inclusiva)
+            end: Data de fim (exclusiva)
+        
+        Returns:
+            List[Tuple[pd.Timestamp, pd.Timestamp]]: Trechos [início, fim) a baixar
+        """
+        start, end = pd.Timestamp(_to_day(start)), pd.Timestamp(_to_day(end))
+        covered = self.coverage(ticker)
+        if covered is None:
+            return [(start, end)] if start < end else []
+        
+        covered_start, covered_end = covered
+        ranges = []
+        if start < covered_start:
+            ranges.append((start, covered_start))
+        if end > covered_end:
+            ranges.append((covered_end, end))
+        return ranges
+    
+    def _records(self, ticker: str) -> np.ndarray:
+        """Retorna os registros de um ticker mapeados em memória."""
+        if self._manifest[ticker]['rows'] == 0:
+            return np.empty(0, dtype=PRICE_DTYPE)
+        return np.load(self._path(ticker), mmap_mode='r')
+    
+    def read(self, ticker: str, start: datetime = None, end: datetime = None) -> pd.Series:
+        """
+        Lê a série de fechamento de um ticker.
+        
+        Args:
+            ticker: Código do ativo
+            start: Data de início (inclusiva; padrão: início armazenado)
+            end: Data de fim (exclusiva; padrão: fim armazenado)
+        
+        Returns:
+            pd.Series: Fechamentos indexados por data
+        
+        Raises:
+            KeyError: Ticker ausente do armazém
+        """
+        if ticker not in self._manifest:
+            raise KeyError(f"Ticker {ticker} não está no armazém de preços.")
+        records = self._records(ticker)
+        dates = records['date']
+        first = 0 if start is None else np.searchsorted(dates, _to_day(start), side='left')
+        last = len(dates) if end is None else np.searchsorted(dates, _to_day(end), side='left')
+        window = records[first:last]
+        return pd.Series(
+            np.array(window['close']),
+            index=pd.DatetimeIndex(window['date'].astype('datetime64[ns]')),
+            name=ticker
+        )
+    
+    def read_many(self, tickers: Iterable[str], start: datetime = None, end: datetime = None) -> pd.DataFrame:
+        """
+        Lê as séries de vários tickers alinhadas por data.
+        
+        Args:
+            tickers: Códigos dos ativos
+            start: Data de início (inclusiva)
+            end: Data de fim (exclusiva)
+        
+        Returns:
+            pd.DataFrame: Fechamentos, uma coluna por ticker armazenado
+        """
+        series = [self.read(ticker, start, end) for ticker in tickers if ticker in self._manifest]
+        if not series:
+            return pd.DataFrame()
+        return pd.concat(series, axis=1).sort_index()
+    
+    def write(self, ticker: str, closes: pd.Series, start: datetime, end: datetime) -> None:
+        """
+        Grava os fechamentos de um ticker para o intervalo baixado.
+        
+        Se o intervalo se sobrepõe ou encosta no já armazenado, as séries são
+        unidas (prevalecendo os valores novos) e a cobertura é estendida;
+        caso contrário, o conteúdo anterior é substituído.
+        
+        Args:
+            ticker: Código do ativo
+            closes: Fechamentos indexados por data
+            start: Data de início do intervalo baixado (inclusiva)
+            end: Data de fim do intervalo baixado (exclusiva)
+        """
+        with self._lock:
+            # Relê o manifesto para unir a gravação ao que outras instâncias
+            # gravaram desde a abertura desta
+            self._manifest = self._load_manifest()
+            self._write(ticker, closes, _to_day(start), _to_day(end))
+    
+    def _write(self, ticker: str, closes: pd.Series, start: np.datetime64, end: np.datetime64) -> None:
+        """Une e grava os fechamentos de um ticker (chamado sob a trava)."""
+        closes = closes.dropna()
+        new = np.empty(len(closes), dtype=PRICE_DTYPE)
+        dates = pd.DatetimeIndex(closes.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        new['date'] = dates.to_numpy().astype('datetime64[D]')
+        new['close'] = closes.to_numpy(dtype=np.float64)
+        new = new[(new['date'] >= start) & (new['date'] < end)]
+        
+        covered = self.coverage(ticker)
+        if covered is not None:
+            old_start, old_end = _to_day(covered[0]), _to_day(covered[1])
+            if old_start <= end and start <= old_end:
+                old = np.array(self._records(ticker))
+                old = old[(old['date'] < start) | (old['date'] >= end)]
+                new = np.concatenate([old, new])
+                start, end = min(start, old_start), max(end, old_end)
+        
+        new = new[np.argsort(new['date'], kind='stable')]
+        file_name = ticker.replace('/', '_') + ".npy"
+        self._manifest[ticker] = {
+            'file': file_name,
+            'start': str(start),
+            'end': str(end),
+            'rows': int(len(new))
+        }
+        # O arquivo é trocado, nunca reescrito no lugar: mapeamentos abertos
+        # continuam vendo a versão anterior, inteira
+        replace_atomically(os.path.join(self.root, file_name), lambda file: np.save(file, new), binary=True)
+        self._save_manifest()
+    
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._manifest
+    
+    def __repr__(self) -> str:
+        return f"PriceStore({self.root!r}, {len(self._manifest)} tickers)"
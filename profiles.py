@@ -0,0 +1,133 @@
+"""
+Módulo contendo os perfis de investimento e seus parâmetros de otimização.
+
+Os perfis são compartilhados pela interface web e pela linha de comando:
+cada um descreve o investidor e define os parâmetros do algoritmo genético
+usados na otimização. No modo NSGA-II, todos os perfis compartilham uma
+única frente de Pareto, evoluída com ``PARAMETROS_PARETO``. A aversão ao
+risco de cada perfil é o peso do CVaR no fitness de todos os motores: no
+algoritmo genético, na programação linear e na escolha da carteira da
+frente.
+"""
+
+# Estrutura de dados dos perfis de investimento
+PERFIS_INVESTIMENTO = {
+    'Conservador': {
+        'descricao': 'Perfil focado em preservação de capital com menor volatilidade',
+        'caracteristicas': [
+            'Prioriza setores defensivos (Utilities, Saúde, Consumo Básico)',
+            'Menor exposição a setores cíclicos',
+            'Parâmetros do algoritmo ajustados para estabilidade'
+        ],
+        'parametros': {
+            'taxa_livre_risco': 0.1075,
+            'aversao_risco': 0.5,
+            'geracoes': 30,
+            'tamanho_populacao': 50,
+            'taxa_mutacao': 0.15,
+            'taxa_crossover': 0.7,
+            'threshold_fitness': 0.15,
+            'janela_estagnacao': 8,
+            'epsilon_estagnacao': 1e-5,
+            'tolerancia_gap': 1e-5,
+            'diversidade_minima': 0.01,
+            'max_ativos': 12,
+            'min_ativos': 8
+        },
+        'cor': '#28a745'
+    },
+    'Moderado': {
+        'descricao': 'Perfil equilibrado entre risco e retorno',
+        'caracteristicas': [
+            'Diversificação balanceada entre setores',
+            'Combinação de ativos defensivos e crescimento',
+            'Parâmetros moderados para exploração e estabilidade'
+        ],
+        'parametros': {
+            'taxa_livre_risco': 0.1075,
+            'aversao_risco': 0.25,
+            'geracoes': 40,
+            'tamanho_populacao': 75,
+            'taxa_mutacao': 0.2,
+            'taxa_crossover': 0.8,
+            'threshold_fitness': 0.12,
+            'janela_estagnacao': 10,
+            'epsilon_estagnacao': 1e-5,
+            'tolerancia_gap': 1e-5,
+            'diversidade_minima': 0.01,
+            'max_ativos': 15,
+            'min_ativos': 10
+        },
+        'cor': '#ffc107'
+    },
+    'Arrojado': {
+        'descricao': 'Perfil agressivo focado em maximização de retornos',
+        'caracteristicas': [
+            'Maior exposição a setores de crescimento e cíclicos',
+            'Aceita maior volatilidade em busca de retornos superiores',
+            'Parâmetros otimizados para exploração máxima'
+        ],
+        'parametros': {
+            'taxa_livre_risco': 0.1075,
+            'aversao_risco': 0.05,
+            'geracoes': 50,
+            'tamanho_populacao': 100,
+            'taxa_mutacao': 0.25,
+            'taxa_crossover': 0.85,
+            'threshold_fitness': 0.10,
+            'janela_estagnacao': 12,
+            'epsilon_estagnacao': 1e-5,
+            'tolerancia_gap': 1e-5,
+            'diversidade_minima': 0.01,
+            'max_ativos': 18,
+            'min_ativos': 12
+        },
+        'cor': '#dc3545'
+    }
+}
+
+
+# Parâmetros do NSGA-II, comuns a todos os perfis: a mesma frente de Pareto
+# (em cache) atende a cada perfil pela sua aversão ao risco
+PARAMETROS_PARETO = {
+    'population_size': 120,
+    'max_generations': 60,
+    'crossover_rate': 0.85,
+    'mutation_rate': 0.2
+}
+
+
+def optimization_params(profile: str, semente: int = None, **overrides) -> dict:
+    """
+    Monta os parâmetros do algoritmo genético de um perfil de investimento.
+    
+    Args:
+        profile: Nome do perfil em ``PERFIS_INVESTIMENTO``
+        semente: Semente da execução (opcional)
+        overrides: Parâmetros que substituem os do perfil (ignorados se None)
+    
+    Returns:
+        dict: Parâmetros no formato esperado por ``run_optimization``
+    
+    Raises:
+        KeyError: Perfil inexistente
+    """
+    if profile not in PERFIS_INVESTIMENTO:
+        raise KeyError(f"Perfil de investimento inexistente: {profile}")
+    parametros = PERFIS_INVESTIMENTO[profile]['parametros']
+    params = {
+        'population_size': parametros['tamanho_populacao'],
+        'max_generations': parametros['geracoes'],
+        'threshold': parametros['threshold_fitness'],
+        'crossover_rate': parametros['taxa_crossover'],
+        'mutation_rate': parametros['taxa_mutacao'],
+        'risk_free_rate': parametros['taxa_livre_risco'],
+        'risk_aversion': parametros['aversao_risco'],
+        'stagnation_window': parametros['janela_estagnacao'],
+        'stagnation_epsilon': parametros['epsilon_estagnacao'],
+        'gap_tolerance': parametros['tolerancia_gap'],
+        'diversity_floor': parametros['diversidade_minima'],
+        'semente': semente
+    }
+    params.update({key: value for key, value in overrides.items() if value is not None})
+    return params
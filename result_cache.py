@@ -0,0 +1,171 @@
+"""
+Módulo contendo o cache de resultados de otimização.
+
+Uma otimização é identificada pela impressão digital dos retornos, pelos
+tickers (ordenados), pelos hiperparâmetros do algoritmo genético e pela
+semente. O ``ResultCache`` guarda os resultados em memória, com descarte
+do menos usado recentemente (LRU), e em disco, de modo que pedidos
+repetidos do painel ou de clientes da API voltem sem nova execução, mesmo
+após reiniciar o processo.
+"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from typing import Any, Iterable
+import json
+import os
+import pickle
+from atomic_files import replace_atomically
+
+# Versão do formato dos resultados; incrementada sempre que o significado
+# do fitness ou dos resultados muda, para não reaproveitar entradas antigas
+CACHE_VERSION = 3
+
+
+def make_key(fingerprint: str, tickers: Iterable[str], params: dict, seed: int = None) -> str:
+    """
+    Calcula a chave de cache de uma otimização.
+    
+    Args:
+        fingerprint: Impressão digital dos dados de retornos
+        tickers: Tickers otimizados (a ordem não altera a chave)
+        params: Hiperparâmetros do algoritmo genético
+        seed: Semente da execução
+    
+    Returns:
+        str: Chave hexadecimal estável entre processos
+    """
+    payload = json.dumps(
+        {
+            'version': CACHE_VERSION,
+            'data': fingerprint,
+            'tickers': sorted(tickers),
+            'params': params,
+            'seed': seed
+        },
+        sort_keys=True,
+        default=str
+    )
+    return blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Cache de resultados de otimização em memória (LRU) e em disco.
+    
+    Cada resultado é gravado em ``<diretório>/<chave>.pkl``; uma consulta
+    que não está em memória é procurada no disco e, se encontrada, volta
+    para a memória. O cache pode ser compartilhado entre threads.
+    
+    Os arquivos são lidos com ``pickle``: o diretório deve ser acessível
+    apenas pela própria aplicação.
+    """
+    
+    SUFFIX = ".pkl"
+    
+    def __init__(self, capacity: int = 32, directory: str = "data/results") -> None:
+        """
+        Inicializa o cache.
+        
+        Args:
+            capacity: Número máximo de resultados mantidos em memória
+            directory: Diretório dos resultados em disco (None para usar
+                apenas a memória)
+        
+        Raises:
+            ValueError: Capacidade menor que um
+        """
+        if capacity < 1:
+            raise ValueError("A capacidade do cache deve ser de pelo menos um resultado.")
+        self.capacity = capacity
+        self.directory = directory
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, key: str) -> str:
+        """Retorna o caminho do arquivo de um resultado."""
+        return os.path.join(self.directory, key + self.SUFFIX)
+    
+    def _remember(self, key: str, value: Any) -> None:
+        """Guarda um resultado em memória, descartando o menos usado se necessário."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+    
+    def _load(self, key: str) -> Any:
+        """Lê um resultado do disco, ou None se não houver arquivo legível."""
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), 'rb') as handle:
+                return pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Arquivo truncado ou de uma versão incompatível: tratado como ausente
+            return None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Consulta um resultado pela chave.
+        
+        Args:
+            key: Chave calculada por ``make_key``
+            default: Valor devolvido quando a chave não está no cache
+        
+        Returns:
+            Any: Resultado armazenado ou ``default``
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            value = self._load(key)
+            if value is None:
+                self.misses += 1
+                return default
+            self._remember(key, value)
+            self.hits += 1
+            return value
+    
+    def put(self, key: str, value: Any) -> None:
+        """
+        Armazena um resultado em memória e em disco.
+        
+        Args:
+            key: Chave calculada por ``make_key``
+            value: Resultado da otimização
+        """
+        with self._lock:
+            self._remember(key, value)
+            if self.directory is not None:
+                replace_atomically(
+                    self._path(key),
+                    lambda handle: pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL),
+                    binary=True
+                )
+    
+    def clear(self) -> None:
+        """Remove todos os resultados, da memória e do disco."""
+        with self._lock:
+            self._entries.clear()
+            if self.directory is not None:
+                for name in os.listdir(self.directory):
+                    if name.endswith(self.SUFFIX):
+                        os.remove(os.path.join(self.directory, name))
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or (self.directory is not None and os.path.exists(self._path(key)))
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __repr__(self) -> str:
+        return f"ResultCache({len(self._entries)}/{self.capacity} em memória, diretório={self.directory!r})"
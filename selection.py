@@ -0,0 +1,157 @@
+"""
+Módulo contendo os operadores de seleção sobre o vetor de fitness.
+
+Cada operador recebe o vetor (P) de fitness da geração, calculado uma única
+vez, e devolve apenas índices, sem voltar a avaliar cromossomos. Roleta e
+ranking sorteiam sobre a soma acumulada das probabilidades com
+``searchsorted``; truncamento e elitismo usam ``argpartition`` para obter
+os k melhores em O(P), sem ordenar a população inteira.
+"""
+
+import numpy as np
+
+# Pressão seletiva do ranking linear (entre 1, uniforme, e 2, máxima)
+RANK_PRESSURE = 1.5
+
+# Fração da população elegível como pai na seleção por truncamento
+TRUNCATION_FRACTION = 0.5
+
+
+def top_k(fitness: np.ndarray, k: int) -> np.ndarray:
+    """
+    Encontra os k indivíduos de maior fitness.
+    
+    Args:
+        fitness: Vetor (P) de fitness
+        k: Número de indivíduos (limitado ao tamanho da população)
+    
+    Returns:
+        np.ndarray: Índices dos k melhores, em ordem decrescente de fitness
+    """
+    k = min(max(k, 0), len(fitness))
+    if k == 0:
+        return np.array([], dtype=np.intp)
+    best = np.argpartition(-fitness, k - 1)[:k]
+    return best[np.argsort(-fitness[best], kind='stable')]
+
+
+def _pairs(indices: np.ndarray) -> np.ndarray:
+    """Agrupa os índices sorteados em pares de pais (K x 2)."""
+    return indices.reshape(-1, 2)
+
+
+def tournament_selection(
+    fitness: np.ndarray,
+    n_pairs: int,
+    competitors: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Seleção por torneio de vários pares de pais de uma só vez.
+    
+    Cada torneio sorteia ``competitors`` índices (com reposição) e os dois
+    de maior fitness formam um par de pais; com um único competidor, ele é
+    usado como os dois pais.
+    
+    Args:
+        fitness: Vetor (P) de fitness da população
+        n_pairs: Número de pares de pais
+        competitors: Número de competidores por torneio
+        rng: Gerador de números aleatórios
+    
+    Returns:
+        np.ndarray: Matriz (n_pairs x 2) com os índices dos pais
+    """
+    entrants = rng.integers(len(fitness), size=(n_pairs, competitors))
+    ranking = np.argsort(-fitness[entrants], axis=1, kind='stable')
+    winners = np.take_along_axis(entrants, ranking[:, :2], axis=1)
+    if competitors == 1:
+        winners = np.repeat(winners, 2, axis=1)
+    return winners
+
+
+def roulette_selection(fitness: np.ndarray, n_pairs: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Seleção por roleta com amostragem universal estocástica.
+    
+    O fitness é deslocado para que o pior indivíduo tenha peso zero (o
+    fitness pode ser negativo); com todos iguais, a roleta é uniforme. Um
+    único sorteio posiciona ``2 * n_pairs`` ponteiros igualmente espaçados,
+    o que reduz a variância em relação a sorteios independentes, e os
+    escolhidos são embaralhados antes de formar os pares.
+    
+    Args:
+        fitness: Vetor (P) de fitness da população
+        n_pairs: Número de pares de pais
+        rng: Gerador de números aleatórios
+    
+    Returns:
+        np.ndarray: Matriz (n_pairs x 2) com os índices dos pais
+    """
+    weights = fitness - fitness.min()
+    total = weights.sum()
+    if not total > 0:
+        weights = np.ones(len(fitness))
+        total = float(len(fitness))
+    cumulative = np.cumsum(weights) / total
+    n_picks = 2 * n_pairs
+    pointers = (rng.random() + np.arange(n_picks)) / n_picks
+    chosen = np.minimum(np.searchsorted(cumulative, pointers, side='right'), len(fitness) - 1)
+    return _pairs(rng.permutation(chosen))
+
+
+def rank_selection(
+    fitness: np.ndarray,
+    n_pairs: int,
+    rng: np.random.Generator,
+    pressure: float = RANK_PRESSURE
+) -> np.ndarray:
+    """
+    Seleção por ranking linear.
+    
+    A probabilidade depende apenas da posição no ranking, não da escala do
+    fitness: o melhor recebe ``pressure / P`` e o pior ``(2 - pressure) / P``.
+    
+    Args:
+        fitness: Vetor (P) de fitness da população
+        n_pairs: Número de pares de pais
+        rng: Gerador de números aleatórios
+        pressure: Pressão seletiva, entre 1 e 2
+    
+    Returns:
+        np.ndarray: Matriz (n_pairs x 2) com os índices dos pais
+    """
+    size = len(fitness)
+    order = np.argsort(fitness, kind='stable')
+    if size > 1:
+        probabilities = (2 - pressure) / size + 2 * np.arange(size) * (pressure - 1) / (size * (size - 1))
+    else:
+        probabilities = np.ones(1)
+    cumulative = np.cumsum(probabilities)
+    positions = np.searchsorted(cumulative, rng.random(2 * n_pairs) * cumulative[-1], side='right')
+    return _pairs(order[np.minimum(positions, size - 1)])
+
+
+def truncation_selection(
+    fitness: np.ndarray,
+    n_pairs: int,
+    rng: np.random.Generator,
+    fraction: float = TRUNCATION_FRACTION
+) -> np.ndarray:
+    """
+    Seleção por truncamento.
+    
+    Apenas a fração de maior fitness pode ser escolhida, com probabilidade
+    uniforme entre os elegíveis.
+    
+    Args:
+        fitness: Vetor (P) de fitness da população
+        n_pairs: Número de pares de pais
+        rng: Gerador de números aleatórios
+        fraction: Fração elegível da população (ao menos um indivíduo)
+    
+    Returns:
+        np.ndarray: Matriz (n_pairs x 2) com os índices dos pais
+    """
+    eligible = top_k(fitness, max(1, int(len(fitness) * fraction)))
+    return _pairs(eligible[rng.integers(len(eligible), size=2 * n_pairs)])
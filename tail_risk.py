@@ -0,0 +1,87 @@
+"""
+Módulo contendo estimadores de risco de cauda (VaR e CVaR históricos).
+
+Em vez de ordenar toda a série com ``np.percentile``, os estimadores usam
+``np.partition`` para separar em tempo linear as k piores observações e
+calculam VaR e CVaR apenas a partir dessa fatia. Há uma versão para uma
+única série e outra em lote, para muitos portfólios de uma vez.
+"""
+
+from typing import Tuple
+import numpy as np
+
+# Casas decimais da posição do percentil: descarta o erro de ponto flutuante
+# de ``1 - alpha`` (ex.: 0.09999999999999998) antes de truncar a posição
+POSITION_DECIMALS = 9
+
+
+def _percentile_position(n_obs: int, alpha: float) -> float:
+    """Posição (base zero) do percentil ``1 - alpha`` na série ordenada."""
+    return round((1 - alpha) * (n_obs - 1), POSITION_DECIMALS)
+
+
+def tail_size(n_obs: int, alpha: float) -> int:
+    """
+    Calcula quantas observações compõem a cauda de perdas.
+    
+    A contagem corresponde às observações menores ou iguais ao percentil
+    ``(1 - alpha)`` com interpolação linear, o mesmo critério usado por
+    ``np.percentile``.
+    
+    Args:
+        n_obs: Número de observações da série
+        alpha: Nível de confiança (ex.: 0.95)
+    
+    Returns:
+        int: Número k de piores observações
+    
+    Raises:
+        ValueError: Série vazia ou nível de confiança fora de [0, 1]
+    """
+    if n_obs <= 0:
+        raise ValueError("A série de retornos está vazia. Não é possível calcular o risco de cauda.")
+    if not 0 <= alpha <= 1:
+        raise ValueError("O nível de confiança deve estar entre 0 e 1.")
+    return int(np.floor(_percentile_position(n_obs, alpha))) + 1
+
+
+def var_cvar(returns: np.ndarray, alpha: float = 0.95) -> Tuple[float, float]:
+    """
+    Calcula VaR e CVaR históricos de uma única série de retornos.
+    
+    Args:
+        returns: Série de retornos (1D)
+        alpha: Nível de confiança
+    
+    Returns:
+        Tuple[float, float]: VaR (percentil ``1 - alpha``) e CVaR (média das
+        k piores observações), ambos em unidades de retorno
+    """
+    var, cvar = var_cvar_batch(np.asarray(returns, dtype=np.float64).reshape(-1, 1), alpha)
+    return float(var[0]), float(cvar[0])
+
+
+def var_cvar_batch(returns: np.ndarray, alpha: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula VaR e CVaR históricos de cada coluna de uma matriz de retornos.
+    
+    Uma única chamada a ``np.partition`` ao longo do eixo do tempo coloca as
+    k piores observações de todas as colunas nas primeiras linhas, junto com
+    a (k+1)-ésima, necessária para interpolar o VaR.
+    
+    Args:
+        returns: Matriz (T x P) com uma série de retornos por coluna
+        alpha: Nível de confiança
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: VaR e CVaR de cada coluna
+    """
+    n_obs = returns.shape[0]
+    k = tail_size(n_obs, alpha)
+    position = _percentile_position(n_obs, alpha)
+    upper = min(k, n_obs - 1)
+    
+    ordered = np.partition(returns, (k - 1, upper), axis=0)
+    var = ordered[k - 1] + (ordered[upper] - ordered[k - 1]) * (position - (k - 1))
+    cvar = ordered[:k].mean(axis=0)
+    return var, cvar
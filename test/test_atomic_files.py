@@ -0,0 +1,44 @@
+"""
+Testes para o módulo atomic_files.py
+
+Este módulo contém testes para a gravação atômica de arquivos por um
+temporário exclusivo.
+"""
+
+import pytest
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atomic_files import replace_atomically
+
+
+class TestReplaceAtomically:
+    """Testes para a substituição atômica de arquivos."""
+    
+    def test_grava_sem_deixar_temporario(self, tmp_path):
+        """Testa que o arquivo final é gravado e nenhum temporário sobra."""
+        path = tmp_path / "dados.txt"
+        
+        replace_atomically(str(path), lambda file: file.write("primeiro"))
+        replace_atomically(str(path), lambda file: file.write(b"segundo"), binary=True)
+        
+        assert path.read_text(encoding='utf-8') == "segundo"
+        assert os.listdir(tmp_path) == ["dados.txt"]
+    
+    def test_erro_preserva_arquivo_anterior(self, tmp_path):
+        """Testa que uma falha na gravação mantém o conteúdo anterior."""
+        path = tmp_path / "dados.txt"
+        path.write_text("original", encoding='utf-8')
+        
+        def fail(file):
+            file.write("parcial")
+            raise RuntimeError("disco cheio")
+        
+        with pytest.raises(RuntimeError):
+            replace_atomically(str(path), fail)
+        
+        assert path.read_text(encoding='utf-8') == "original"
+        assert os.listdir(tmp_path) == ["dados.txt"]
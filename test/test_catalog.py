@@ -0,0 +1,119 @@
+"""
+Testes para o módulo catalog.py
+
+Este módulo contém testes para o cadastro indexado das empresas: consultas
+por ticker, filtros por setor e tabela de exibição.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import COMPANIES_FILE, CompanyCatalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCompanyCatalog:
+    """Testes para as consultas e filtros do cadastro."""
+    
+    def setup_method(self):
+        self.companies = pd.DataFrame({
+            'Nome': ['Itaú', 'Petrobras', 'Bradesco', 'Sem Cadastro', 'Itaú Duplicado'],
+            'Ticker': ['ITUB4', 'PETR4', 'BBDC4', 'XPTO3', 'ITUB4'],
+            'Setor': ['Serviços Financeiros', 'Energia', 'Serviços Financeiros', np.nan, 'Energia'],
+            'Preço': [30.5, 38.0, 14.2, 1.0, 99.0]
+        })
+        self.catalog = CompanyCatalog(self.companies)
+    
+    def test_consultas_por_ticker(self):
+        """Testa nome, setor e descrição de tickers cadastrados e ausentes."""
+        assert len(self.catalog) == 4
+        assert self.catalog.name('PETR4') == 'Petrobras'
+        assert self.catalog.sector('BBDC4') == 'Serviços Financeiros'
+        assert self.catalog.sector('XPTO3') == CompanyCatalog.NO_SECTOR
+        assert self.catalog.label('ITUB4') == 'ITUB4 - Itaú (Serviços Financeiros)'
+        assert self.catalog.label('ABCD3') == 'ABCD3 - ABCD3 (Sem Setor)'
+        assert 'ITUB4' in self.catalog and 'ABCD3' not in self.catalog
+    
+    def test_setores_ordenados_sem_vazios(self):
+        """Testa que a lista de setores é ordenada e ignora empresas sem setor."""
+        assert self.catalog.sector_names == ['Energia', 'Serviços Financeiros']
+    
+    def test_filtro_por_setor(self):
+        """Testa o filtro por um ou mais setores, na ordem do arquivo."""
+        assert self.catalog.tickers_in('Serviços Financeiros') == ['ITUB4', 'BBDC4']
+        assert self.catalog.tickers_in(['Serviços Financeiros', 'Energia']) == ['ITUB4', 'PETR4', 'BBDC4']
+        assert self.catalog.tickers_in() == ['ITUB4', 'PETR4', 'BBDC4', 'XPTO3']
+        assert self.catalog.tickers_in([]) == []
+    
+    def test_setor_inexistente(self):
+        """Testa que um setor fora do cadastro gera KeyError."""
+        with pytest.raises(KeyError, match="Varejo"):
+            self.catalog.tickers_in('Varejo')
+    
+    def test_contagem_por_setor(self):
+        """Testa a distribuição por setor, com tickers fora do cadastro sem setor."""
+        counts = self.catalog.sector_counts(['ITUB4', 'BBDC4', 'PETR4', 'XPTO3', 'ABCD3'])
+        
+        assert counts.to_dict() == {'Serviços Financeiros': 2, 'Sem Setor': 2, 'Energia': 1}
+        assert counts.iloc[0] == 2
+    
+    def test_tabela_de_exibicao(self):
+        """Testa as colunas e os valores da tabela de um setor."""
+        table = self.catalog.table('Serviços Financeiros')
+        
+        assert list(table.columns) == ['Código', 'Nome', 'Setor', 'Preço (R$)']
+        assert table['Código'].tolist() == ['ITUB4', 'BBDC4']
+        assert table['Preço (R$)'].tolist() == [30.5, 14.2]
+    
+    def test_coluna_obrigatoria_ausente(self):
+        """Testa que a falta de uma coluna obrigatória gera KeyError."""
+        with pytest.raises(KeyError, match="Setor"):
+            CompanyCatalog(self.companies.drop(columns='Setor'))
+    
+    def test_preco_opcional(self):
+        """Testa que o cadastro sem preços é aceito, com preços ausentes."""
+        catalog = CompanyCatalog(self.companies.drop(columns='Preço'))
+        
+        assert np.isnan(catalog.prices).all()
+
+
+class TestCompanyCatalogFromCsv:
+    """Testes para a leitura do cadastro a partir do arquivo CSV."""
+    
+    def test_arquivo_do_projeto(self):
+        """Testa a leitura do cadastro de empresas da B3 distribuído no projeto."""
+        catalog = CompanyCatalog.from_csv(os.path.join(ROOT, COMPANIES_FILE))
+        
+        assert len(catalog) > 100
+        assert 'PETR4' in catalog
+        assert set(catalog.tickers_in(catalog.sector_names)) <= set(catalog.tickers)
+    
+    def test_arquivo_vazio(self, tmp_path):
+        """Testa que um arquivo sem linhas gera EmptyDataError."""
+        path = tmp_path / "empresas.csv"
+        path.write_text("Nome,Ticker,Setor,Preço\n", encoding='utf-8')
+        
+        with pytest.raises(pd.errors.EmptyDataError):
+            CompanyCatalog.from_csv(str(path))
+    
+    def test_grande_cadastro(self):
+        """Testa que consultas e filtros funcionam em um cadastro com milhares de ativos."""
+        size = 5000
+        companies = pd.DataFrame({
+            'Nome': [f"Empresa {i}" for i in range(size)],
+            'Ticker': [f"T{i:04d}34" for i in range(size)],
+            'Setor': [f"Setor {i % 12}" for i in range(size)],
+            'Preço': np.arange(size, dtype=float)
+        })
+        catalog = CompanyCatalog(companies)
+        
+        assert len(catalog.tickers_in('Setor 3')) == len(range(3, size, 12))
+        assert catalog.sector('T4999' + '34') == 'Setor 7'
+        assert catalog.sector_counts(catalog.tickers).sum() == size
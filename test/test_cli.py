@@ -0,0 +1,197 @@
+"""
+Testes para o módulo cli.py
+
+Este módulo contém testes para a linha de comando de otimização, usando a
+fonte sintética de preços (sem rede).
+"""
+
+import pytest
+import json
+import subprocess
+import pandas as pd
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cli
+from cli import main, select_tickers
+from download_scheduler import DownloadScheduler
+from price_sources import ERRORS_ATTR, SyntheticSource
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BASE_ARGS = [
+    "--synthetic", "1", "--no-store", "--no-cache",
+    "--start", "2023-01-01", "--end", "2023-12-31",
+    "--population-size", "10", "--generations", "3"
+]
+
+
+class TestSelectTickers:
+    """Testes para a seleção de tickers por lista e por setor."""
+    
+    def setup_method(self):
+        self.companies = pd.DataFrame({
+            'Nome': ['A', 'B', 'C'],
+            'Ticker': ['ITUB4', 'BBDC4', 'PETR4'],
+            'Setor': ['Serviços Financeiros', 'Serviços Financeiros', 'Energia']
+        })
+    
+    def test_setor_e_lista_sem_repeticao(self, tmp_path):
+        """Testa a união de tickers explícitos com as empresas de um setor."""
+        path = tmp_path / "empresas.csv"
+        self.companies.to_csv(path, index=False)
+        
+        tickers = select_tickers(['BBDC4', 'VALE3'], ['Serviços Financeiros'], str(path))
+        
+        assert tickers == ['BBDC4', 'VALE3', 'ITUB4']
+    
+    def test_setor_inexistente(self, tmp_path):
+        """Testa que um setor fora do cadastro gera ValueError."""
+        path = tmp_path / "empresas.csv"
+        self.companies.to_csv(path, index=False)
+        
+        with pytest.raises(ValueError, match="Varejo"):
+            select_tickers(None, ['Varejo'], str(path))
+
+
+class TestMain:
+    """Testes para a execução completa pela linha de comando."""
+    
+    def test_saida_json(self, tmp_path):
+        """Testa a gravação dos pesos e métricas em JSON."""
+        output = tmp_path / "resultado.json"
+        
+        code = main(["--tickers", "PETR4", "VALE3", "ITUB4", "--output", str(output)] + BASE_ARGS)
+        document = json.loads(output.read_text(encoding='utf-8'))
+        
+        assert code == 0
+        assert list(document['pesos']) == ['PETR4', 'VALE3', 'ITUB4']
+        assert sum(document['pesos'].values()) == pytest.approx(1.0)
+        assert document['geracoes_executadas'] <= 3
+        assert document['parametros']['population_size'] == 10
+        assert document['perfil'] == "Moderado"
+        assert document['fitness_otimo'] is None
+    
+    def test_comparacao_com_otimo(self, tmp_path):
+        """Testa que --compare-optimum informa o fitness ótimo no motor genético."""
+        output = tmp_path / "resultado.json"
+        
+        code = main(["--tickers", "PETR4", "VALE3", "ITUB4", "--compare-optimum", "--output", str(output)] + BASE_ARGS)
+        document = json.loads(output.read_text(encoding='utf-8'))
+        
+        assert code == 0
+        assert document['fitness'] <= document['fitness_otimo'] + 1e-12
+    
+    def test_saida_csv(self, tmp_path):
+        """Testa a gravação de uma linha por ativo em CSV."""
+        output = tmp_path / "saida" / "resultado.csv"
+        
+        code = main(["--tickers", "PETR4", "VALE3", "--output", str(output), "--profile", "Arrojado"] + BASE_ARGS)
+        frame = pd.read_csv(output)
+        
+        assert code == 0
+        assert list(frame['ticker']) == ['PETR4', 'VALE3']
+        assert (frame['perfil'] == "Arrojado").all()
+        assert frame['fitness'].nunique() == 1
+    
+    def test_motor_programacao_linear(self, tmp_path):
+        """Testa a escolha do motor exato pela linha de comando."""
+        output = tmp_path / "resultado.json"
+        
+        code = main(["--tickers", "PETR4", "VALE3", "ITUB4", "--engine", "programacao_linear", "--output", str(output)] + BASE_ARGS)
+        document = json.loads(output.read_text(encoding='utf-8'))
+        
+        assert code == 0
+        assert document['geracoes_executadas'] == 0
+        assert document['fitness'] == pytest.approx(document['fitness_otimo'])
+    
+    def test_avaliacao_em_varios_processos(self, tmp_path):
+        """Testa que --workers repassa o número de processos à otimização."""
+        output = tmp_path / "resultado.json"
+        
+        code = main(["--tickers", "PETR4", "VALE3", "ITUB4", "--workers", "2", "--output", str(output)] + BASE_ARGS)
+        document = json.loads(output.read_text(encoding='utf-8'))
+        
+        assert code == 0
+        assert document['parametros']['processos'] == 2
+        assert sum(document['pesos'].values()) == pytest.approx(1.0)
+    
+    def test_modelo_de_ilhas(self, tmp_path):
+        """Testa que --islands executa o algoritmo genético no modelo de ilhas."""
+        output = tmp_path / "resultado.json"
+        
+        code = main(["--tickers", "PETR4", "VALE3", "ITUB4", "--islands", "2", "--output", str(output)] + BASE_ARGS)
+        document = json.loads(output.read_text(encoding='utf-8'))
+        
+        assert code == 0
+        assert document['parametros']['ilhas'] == 2
+        assert document['geracoes_executadas'] <= 3
+        assert sum(document['pesos'].values()) == pytest.approx(1.0)
+    
+    def test_motor_nsga2(self, tmp_path):
+        """Testa que o motor NSGA-II grava a frente de Pareto no JSON."""
+        output = tmp_path / "resultado.json"
+        
+        code = main(["--tickers", "PETR4", "VALE3", "ITUB4", "--engine", "nsga2", "--output", str(output)] + BASE_ARGS)
+        document = json.loads(output.read_text(encoding='utf-8'))
+        
+        assert code == 0
+        assert len(document['pareto']) >= 1
+        assert {'retorno_esperado', 'cvar', 'PETR4.SA'} <= set(document['pareto'][0])
+    
+    def test_falha_de_um_ticker_na_saida_padrao(self, monkeypatch, capsys):
+        """Testa que, com um ticker falhando, a saída padrão traz apenas o JSON."""
+        class NoisySource:
+            # Imita o yfinance: imprime progresso e omite um ticker da resposta
+            def fetch_closes(self, tickers, start, end):
+                print("[*********************100%***********************]")
+                closes = SyntheticSource(seed=1).fetch_closes([t for t in tickers if t != 'VALE3.SA'], start, end)
+                closes.attrs[ERRORS_ATTR] = {'VALE3.SA': "KeyError: 'VALE3.SA'"} if 'VALE3.SA' in tickers else {}
+                return closes
+        
+        monkeypatch.setattr(cli, 'YFinanceSource', NoisySource)
+        monkeypatch.setattr(cli, 'DownloadScheduler', lambda source: DownloadScheduler(source, retries=0))
+        args = [arg for arg in BASE_ARGS if arg not in ("--synthetic", "1")]
+        
+        code = main(["--tickers", "PETR4", "VALE3", "ITUB4"] + args)
+        captured = capsys.readouterr()
+        document = json.loads(captured.out)
+        
+        assert code == 0
+        assert document['falhas_download'] == {'VALE3.SA': "KeyError: 'VALE3.SA'"}
+        assert list(document['pesos']) == ['PETR4', 'ITUB4']
+        assert "100%" in captured.err
+        assert "VALE3.SA" in captured.err
+    
+    def test_fonte_sintetica_nao_grava_no_armazem(self, tmp_path, monkeypatch):
+        """Testa que preços sintéticos não entram no armazém padrão, lido pela interface."""
+        monkeypatch.chdir(tmp_path)
+        args = [arg for arg in BASE_ARGS if arg != "--no-store"]
+        
+        code = main(["--tickers", "PETR4", "VALE3", "ITUB4", "--output", str(tmp_path / "saida.json")] + args)
+        
+        assert code == 0
+        assert not (tmp_path / "data" / "prices").exists()
+    
+    def test_sem_tickers(self):
+        """Testa que a ausência de tickers e setores é um erro de uso."""
+        with pytest.raises(SystemExit) as error:
+            main(BASE_ARGS)
+        
+        assert error.value.code == 2
+    
+    def test_erro_na_otimizacao(self, capsys):
+        """Testa o código de saída e a mensagem quando a otimização falha."""
+        code = main(["--tickers", "PETR4"] + BASE_ARGS)
+        
+        assert code == 1
+        assert "Dados insuficientes" in capsys.readouterr().err
+    
+    def test_nao_importa_interface(self):
+        """Testa que a linha de comando não carrega Streamlit nem matplotlib."""
+        check = "import sys, cli; sys.exit(int('streamlit' in sys.modules or 'matplotlib' in sys.modules))"
+        
+        assert subprocess.run([sys.executable, "-c", check], cwd=ROOT).returncode == 0
@@ -16,6 +16,23 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from data_collector import add_suffix, create_tickers_array, DataCollector, _download_data_cached
+from price_store import PriceStore
+from price_sources import SyntheticSource
+from download_scheduler import DownloadScheduler
+
+
+class FailingSource:
+    """Fonte que omite da resposta os tickers indicados, como uma falha parcial do yfinance."""
+    
+    def __init__(self, source, failing, before=None):
+        self.source = source
+        self.failing = failing
+        self.before = before
+    
+    def fetch_closes(self, tickers, start, end):
+        if self.before is not None and pd.Timestamp(start) >= pd.Timestamp(self.before):
+            return self.source.fetch_closes(tickers, start, end)
+        return self.source.fetch_closes([t for t in tickers if t not in self.failing], start, end)
 
 
 class TestUtilityFunctions:
@@ -61,6 +78,19 @@ class TestUtilityFunctions:
         assert result == expected
 
 
+class RecordingSource:
+    """Fonte que registra os intervalos pedidos e multiplica os preços por um fator."""
+    
+    def __init__(self, source, factor=1.0):
+        self.source = source
+        self.factor = factor
+        self.requests = []
+    
+    def fetch_closes(self, tickers, start, end):
+        self.requests.append((pd.Timestamp(start), pd.Timestamp(end)))
+        return self.source.fetch_closes(tickers, start, end) * self.factor
+
+
 class TestDataCollectorInitialization:
         
     def test_inicializar_com_valores_padrao(self):
@@ -221,6 +251,153 @@ class TestDownloadDataCached:
     
 
 
+class TestDataCollectorPriceStore:
+    
+    def setup_method(self):
+        self.start = datetime(2024, 1, 1)
+        self.end = datetime(2024, 1, 20)
+        dates = pd.bdate_range(start='2024-01-01', periods=10)
+        self.downloaded = pd.DataFrame({
+            ('PETR4.SA', 'Close'): np.linspace(30, 32, 10),
+            ('VALE3.SA', 'Close'): np.linspace(60, 58, 10),
+            ('^BVSP', 'Close'): np.linspace(120000, 121000, 10)
+        }, index=dates)
+    
+    @patch('data_collector.yf.download')
+    def test_download_grava_no_armazem(self, mock_yf_download, tmp_path):
+        mock_yf_download.return_value = self.downloaded
+        store = PriceStore(str(tmp_path))
+        collector = DataCollector(["PETR4", "VALE3"], start=self.start, end=self.end, store=store)
+        
+        result = collector.download_data()
+        
+        assert list(result.columns) == ['PETR4.SA', 'VALE3.SA', '^BVSP']
+        assert len(result) == 9
+        # A cobertura vai até o último pregão recebido (12/01), não até o fim pedido
+        assert all(store.coverage(ticker) == (pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-13')) for ticker in result.columns)
+    
+    @patch('data_collector.yf.download')
+    def test_armazem_evita_novo_download(self, mock_yf_download, tmp_path):
+        mock_yf_download.return_value = self.downloaded
+        # Intervalo terminado no dia seguinte ao último pregão recebido: totalmente coberto
+        end = datetime(2024, 1, 13)
+        first = DataCollector(["PETR4", "VALE3"], start=self.start, end=end, store=PriceStore(str(tmp_path)))
+        expected = first.download_data()
+        mock_yf_download.reset_mock()
+        
+        # Nova instância do armazém, como após reiniciar a aplicação
+        second = DataCollector(["PETR4", "VALE3"], start=self.start, end=end, store=PriceStore(str(tmp_path)))
+        result = second.download_data()
+        
+        mock_yf_download.assert_not_called()
+        pd.testing.assert_frame_equal(result, expected)
+    
+    @patch('data_collector.yf.download')
+    def test_baixa_apenas_tickers_ausentes(self, mock_yf_download, tmp_path):
+        mock_yf_download.return_value = self.downloaded
+        store = PriceStore(str(tmp_path))
+        DataCollector(["PETR4"], start=self.start, end=self.end, store=store).download_data()
+        
+        DataCollector(["PETR4", "VALE3"], start=self.start, end=self.end, store=store).download_data()
+        
+        assert mock_yf_download.call_args[0][0] == ['VALE3.SA']
+
+    @patch('data_collector.yf.download')
+    def test_busca_incremental_apenas_do_trecho_final(self, mock_yf_download, tmp_path):
+        mock_yf_download.return_value = self.downloaded
+        store = PriceStore(str(tmp_path))
+        DataCollector(["PETR4", "VALE3"], start=self.start, end=datetime(2024, 1, 13), store=store).download_data()
+        
+        dates = pd.bdate_range(start='2024-01-15', periods=4)
+        mock_yf_download.return_value = pd.DataFrame({
+            (ticker, 'Close'): np.linspace(1, 2, 4) for ticker in ['PETR4.SA', 'VALE3.SA', '^BVSP']
+        }, index=dates)
+        result = DataCollector(["PETR4", "VALE3"], start=self.start, end=self.end, store=store).download_data()
+        
+        # Uma única requisição com o trecho novo de todos os tickers
+        args, kwargs = mock_yf_download.call_args
+        assert mock_yf_download.call_count == 2
+        assert args[0] == ['PETR4.SA', 'VALE3.SA', '^BVSP']
+        # O trecho inclui dias já armazenados, para conferir a base de ajuste
+        assert kwargs['start'] == pd.Timestamp('2024-01-06')
+        assert kwargs['end'] == pd.Timestamp('2024-01-20')
+        assert len(result) == 13
+        assert store.covers('PETR4.SA', self.start, datetime(2024, 1, 19))
+    
+    @patch('data_collector.yf.download')
+    def test_resposta_vazia_nao_estende_cobertura(self, mock_yf_download, tmp_path):
+        mock_yf_download.return_value = self.downloaded
+        store = PriceStore(str(tmp_path))
+        DataCollector(["PETR4"], start=self.start, end=self.end, store=store).download_data()
+        
+        # Resposta vazia (fim de semana ou falha): o trecho é pedido de novo na próxima execução
+        mock_yf_download.return_value = pd.DataFrame()
+        DataCollector(["PETR4"], start=self.start, end=datetime(2024, 1, 22), store=store).download_data()
+        mock_yf_download.reset_mock()
+        DataCollector(["PETR4"], start=self.start, end=datetime(2024, 1, 22), store=store).download_data()
+        
+        assert mock_yf_download.call_count == 1
+        assert store.coverage('PETR4.SA')[1] == pd.Timestamp('2024-01-13')
+    
+    def test_fonte_fora_do_ar_e_depois_disponivel(self, tmp_path):
+        store = PriceStore(str(tmp_path))
+        offline = Mock()
+        offline.fetch_closes.return_value = pd.DataFrame()
+        start, end = datetime(2024, 1, 1), datetime(2024, 3, 1)
+        
+        empty = DataCollector(["PETR4", "VALE3"], start=start, end=end, store=store, source=offline).download_market_data()
+        result = DataCollector(["PETR4", "VALE3"], start=start, end=end, store=store, source=SyntheticSource(seed=1)).download_market_data()
+        
+        assert empty.closes.empty
+        assert store.tickers == ('PETR4.SA', 'VALE3.SA', '^BVSP')
+        assert result.closes.shape == (44, 3)
+    
+    def test_falha_de_um_ticker_nao_grava_cobertura(self, tmp_path):
+        store = PriceStore(str(tmp_path))
+        scheduler = DownloadScheduler(FailingSource(SyntheticSource(seed=1), {'VALE3.SA'}), retries=0)
+        
+        DataCollector(["PETR4", "VALE3"], start=datetime(2024, 1, 1), end=datetime(2024, 3, 1), store=store, source=scheduler).download_market_data()
+        
+        assert 'VALE3.SA' not in store
+        assert 'VALE3.SA' in scheduler.last_report.failed
+    
+    def test_relatorio_combina_os_trechos(self, tmp_path):
+        store = PriceStore(str(tmp_path))
+        DataCollector(["PETR4", "VALE3"], start=datetime(2024, 2, 1), end=datetime(2024, 3, 1), store=store, source=SyntheticSource(seed=1)).download_market_data()
+        # VALE3 falha apenas no trecho inicial; o trecho final, baixado depois, vem completo
+        scheduler = DownloadScheduler(FailingSource(SyntheticSource(seed=1), {'VALE3.SA'}, before=datetime(2024, 2, 1)), retries=0)
+        collector = DataCollector(["PETR4", "VALE3"], start=datetime(2024, 1, 1), end=datetime(2024, 4, 1), store=store, source=scheduler)
+        
+        collector.download_market_data()
+        
+        assert scheduler.last_report.ok
+        assert list(collector.last_report.failed) == ['VALE3.SA']
+        assert 'PETR4.SA' in collector.last_report.succeeded
+        assert collector.last_report.attempts == 2
+    
+    def test_sobreposicao_coincidente_baixa_apenas_o_trecho(self, tmp_path):
+        store = PriceStore(str(tmp_path))
+        DataCollector(["PETR4"], start=datetime(2024, 1, 1), end=datetime(2024, 3, 1), store=store, source=SyntheticSource(seed=1)).download_market_data()
+        source = RecordingSource(SyntheticSource(seed=1))
+        
+        DataCollector(["PETR4"], start=datetime(2024, 1, 1), end=datetime(2024, 4, 1), store=store, source=source).download_market_data()
+        
+        assert source.requests == [(pd.Timestamp('2024-02-23'), pd.Timestamp('2024-04-01'))]
+    
+    def test_historico_reajustado_e_substituido(self, tmp_path):
+        store = PriceStore(str(tmp_path))
+        DataCollector(["PETR4"], start=datetime(2024, 1, 1), end=datetime(2024, 3, 1), store=store, source=SyntheticSource(seed=1)).download_market_data()
+        # Desdobramento 2:1: o Yahoo passa a devolver todo o histórico pela metade
+        split = RecordingSource(SyntheticSource(seed=1), factor=0.5)
+        
+        result = DataCollector(["PETR4"], start=datetime(2024, 1, 1), end=datetime(2024, 4, 1), store=store, source=split).download_market_data()
+        
+        expected = SyntheticSource(seed=1).fetch_closes(['PETR4.SA'], datetime(2024, 1, 1), datetime(2024, 4, 1))['PETR4.SA'] * 0.5
+        np.testing.assert_allclose(result.closes['PETR4.SA'].to_numpy(), expected.to_numpy())
+        assert result.returns['PETR4.SA'].min() > -0.2
+        assert split.requests[-1] == (pd.Timestamp('2024-01-01'), pd.Timestamp('2024-04-01'))
+
+
 class TestEdgeCases:
     
     def test_coletor_dados_com_valores_none(self):
@@ -0,0 +1,187 @@
+"""
+Testes para o módulo download_scheduler.py
+
+Este módulo contém testes para o agendador de downloads em lotes, usando
+fontes locais substitutas que simulam falhas e respostas incompletas.
+"""
+
+import pytest
+import threading
+import pandas as pd
+from unittest.mock import Mock
+from datetime import datetime
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from download_scheduler import DownloadScheduler, DownloadReport
+from price_sources import SyntheticSource, YFinanceSource
+from price_store import PriceStore
+from data_collector import DataCollector
+
+
+class FlakySource:
+    """Fonte sintética que falha ou omite tickers de forma controlada."""
+    
+    def __init__(self, failures=0, missing=(), broken=()):
+        self.inner = SyntheticSource(seed=4)
+        self.failures = failures
+        self.missing = set(missing)
+        self.broken = set(broken)
+        self.calls = []
+        self.lock = threading.Lock()
+    
+    def fetch_closes(self, tickers, start, end):
+        with self.lock:
+            self.calls.append(list(tickers))
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("conexão recusada")
+        if self.broken & set(tickers):
+            raise ValueError("resposta malformada")
+        closes = self.inner.fetch_closes(tickers, start, end)
+        # Tickers "missing" só aparecem na segunda requisição em que são pedidos
+        omitted = [t for t in tickers if t in self.missing]
+        with self.lock:
+            self.missing -= set(omitted)
+        return closes.drop(columns=omitted)
+
+
+def make_tickers(n):
+    return [f'ATIVO{i}.SA' for i in range(n)]
+
+
+class TestDownloadScheduler:
+    """Testes para o download em lotes com novas tentativas."""
+    
+    def setup_method(self):
+        self.start = datetime(2024, 1, 1)
+        self.end = datetime(2024, 2, 1)
+        self.sleeps = []
+    
+    def make_scheduler(self, source, **kwargs):
+        params = dict(chunk_size=3, max_workers=2, retries=2, backoff=0.5, sleep=self.sleeps.append)
+        params.update(kwargs)
+        return DownloadScheduler(source, **params)
+    
+    def test_divide_em_lotes(self):
+        """Testa que nenhum lote excede o tamanho configurado."""
+        source = FlakySource()
+        scheduler = self.make_scheduler(source)
+        
+        closes = scheduler.fetch_closes(make_tickers(8), self.start, self.end)
+        
+        assert sorted(len(call) for call in source.calls) == [2, 3, 3]
+        assert list(closes.columns) == make_tickers(8)
+        assert scheduler.last_report.ok
+        assert scheduler.last_report.attempts == 3
+    
+    def test_repete_lote_apos_falha(self):
+        """Testa a nova tentativa com espera exponencial após exceções."""
+        source = FlakySource(failures=2)
+        scheduler = self.make_scheduler(source, chunk_size=10, max_workers=1)
+        
+        closes = scheduler.fetch_closes(make_tickers(4), self.start, self.end)
+        
+        assert list(closes.columns) == make_tickers(4)
+        assert self.sleeps == [0.5, 1.0]
+        assert scheduler.last_report.attempts == 3
+    
+    def test_repete_apenas_tickers_ausentes(self):
+        """Testa que só os tickers omitidos da resposta são pedidos de novo."""
+        source = FlakySource(missing=['ATIVO1.SA'])
+        scheduler = self.make_scheduler(source, chunk_size=10)
+        
+        closes = scheduler.fetch_closes(make_tickers(3), self.start, self.end)
+        
+        assert source.calls == [make_tickers(3), ['ATIVO1.SA']]
+        assert list(closes.columns) == make_tickers(3)
+    
+    def test_relatorio_de_falhas(self):
+        """Testa que lotes que sempre falham aparecem no relatório com o motivo."""
+        source = FlakySource(broken=['ATIVO4.SA'])
+        scheduler = self.make_scheduler(source)
+        
+        closes = scheduler.fetch_closes(make_tickers(6), self.start, self.end)
+        report = scheduler.last_report
+        
+        assert list(closes.columns) == make_tickers(3)
+        assert report.succeeded == make_tickers(3)
+        assert set(report.failed) == {'ATIVO3.SA', 'ATIVO4.SA', 'ATIVO5.SA'}
+        assert report.failed['ATIVO4.SA'] == "ValueError: resposta malformada"
+        assert not report.ok
+    
+    def test_motivo_informado_pela_fonte(self):
+        """Testa que a exceção de um ticker informada pela fonte vira o motivo da falha."""
+        dates = pd.bdate_range('2024-01-01', periods=3)
+        download = Mock(return_value=pd.DataFrame({('ATIVO0.SA', 'Close'): [1.0, 2.0, 3.0]}, index=dates))
+        scheduler = self.make_scheduler(YFinanceSource(download), retries=0)
+        
+        closes = scheduler.fetch_closes(make_tickers(2), self.start, self.end)
+        
+        assert list(closes.columns) == ['ATIVO0.SA']
+        assert scheduler.last_report.failed['ATIVO1.SA'].startswith("KeyError")
+    
+    def test_intervalo_sem_pregoes_nao_e_repetido(self):
+        """Testa que uma resposta sem pregões não gera novas tentativas."""
+        source = FlakySource()
+        scheduler = self.make_scheduler(source)
+        
+        closes = scheduler.fetch_closes(make_tickers(2), datetime(2024, 1, 6), datetime(2024, 1, 8))
+        
+        assert closes.empty
+        assert len(source.calls) == 1
+        assert self.sleeps == []
+        assert scheduler.last_report.failed['ATIVO0.SA'] == "sem pregões no intervalo"
+    
+    def test_parametros_invalidos(self):
+        """Testa a validação dos parâmetros do agendador."""
+        with pytest.raises(ValueError):
+            DownloadScheduler(FlakySource(), chunk_size=0)
+        with pytest.raises(ValueError):
+            DownloadScheduler(FlakySource(), max_workers=0)
+        with pytest.raises(ValueError):
+            DownloadScheduler(FlakySource(), retries=-1)
+
+
+class TestDownloadReport:
+    """Testes para o relatório de download."""
+    
+    def test_relatorio_vazio_e_ok(self):
+        """Testa o estado inicial do relatório."""
+        report = DownloadReport()
+        
+        assert report.ok
+        assert report.succeeded == []
+    
+    def test_combinacao_preserva_falhas(self):
+        """Testa que um ticker que falhou em um dos relatórios continua entre as falhas."""
+        head = DownloadReport(['PETR4.SA'], {'VALE3.SA': "sem dados na resposta"}, attempts=2, elapsed=1.0)
+        tail = DownloadReport(['PETR4.SA', 'VALE3.SA'], attempts=1, elapsed=0.5)
+        
+        report = head.merge(tail)
+        
+        assert report.succeeded == ['PETR4.SA']
+        assert report.failed == {'VALE3.SA': "sem dados na resposta"}
+        assert report.attempts == 3
+        assert report.elapsed == 1.5
+
+
+class TestDataCollectorComAgendador:
+    """Testes para o agendador usado como fonte do DataCollector."""
+    
+    def test_coleta_com_armazem(self, tmp_path):
+        """Testa a coleta de retornos pelo agendador gravando no armazém."""
+        scheduler = DownloadScheduler(FlakySource(failures=1), chunk_size=1, sleep=lambda _: None)
+        store = PriceStore(str(tmp_path))
+        collector = DataCollector(
+            ["PETR4", "VALE3"], start=datetime(2024, 1, 1), end=datetime(2024, 2, 1),
+            store=store, source=scheduler
+        )
+        
+        result = collector.download_data()
+        
+        assert list(result.columns) == ['PETR4.SA', 'VALE3.SA', '^BVSP']
+        assert scheduler.last_report.ok
@@ -0,0 +1,100 @@
+"""
+Testes para o módulo fingerprint.py
+
+Este módulo contém testes para a impressão digital dos dados de retornos
+e para o seu uso pelo universo de ativos e pelos dados de mercado.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fingerprint
+from fingerprint import fingerprint_array, fingerprint_frame
+from universe import ReturnsUniverse
+from market_data import MarketData
+
+
+def make_returns(seed=0, periods=30):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2024-01-01', periods=periods)
+    return pd.DataFrame(rng.normal(0, 0.01, (periods, 3)), index=dates, columns=['PETR4.SA', 'VALE3.SA', 'ITUB4.SA'])
+
+
+class TestFingerprint:
+    """Testes para a impressão digital de matrizes e DataFrames."""
+    
+    def test_estavel_para_o_mesmo_conteudo(self):
+        """Testa que cópias do mesmo conteúdo têm a mesma impressão digital."""
+        returns = make_returns()
+        
+        assert fingerprint_frame(returns) == fingerprint_frame(returns.copy())
+        assert len(fingerprint_frame(returns)) == 2 * fingerprint.DIGEST_SIZE
+    
+    def test_sensivel_a_valores_colunas_e_datas(self):
+        """Testa que alterar valores, rótulos ou datas muda a impressão digital."""
+        returns = make_returns()
+        changed = returns.copy()
+        changed.iloc[5, 1] += 1e-12
+        
+        fingerprints = {
+            fingerprint_frame(returns),
+            fingerprint_frame(changed),
+            fingerprint_frame(returns.rename(columns={'VALE3.SA': 'VALE5.SA'})),
+            fingerprint_frame(returns[['VALE3.SA', 'PETR4.SA', 'ITUB4.SA']]),
+            fingerprint_frame(returns.shift(1, freq='B'))
+        }
+        
+        assert len(fingerprints) == 5
+    
+    def test_formato_da_matriz(self):
+        """Testa que o mesmo buffer com formatos diferentes gera impressões diferentes."""
+        values = np.arange(12, dtype=np.float64)
+        
+        assert fingerprint_array(values.reshape(3, 4)) != fingerprint_array(values.reshape(4, 3))
+    
+    def test_matriz_maior_que_um_bloco(self, monkeypatch):
+        """Testa que a leitura em blocos equivale à leitura de uma vez."""
+        returns = make_returns(periods=200)
+        expected = fingerprint_frame(returns)
+        monkeypatch.setattr(fingerprint, 'CHUNK_BYTES', 64)
+        
+        assert fingerprint_frame(returns) == expected
+    
+    def test_matriz_nao_contigua(self):
+        """Testa que uma visão não contígua equivale à sua cópia contígua."""
+        values = np.asfortranarray(make_returns().to_numpy())
+        
+        assert fingerprint_array(values) == fingerprint_array(np.ascontiguousarray(values))
+
+
+class TestFingerprintUniverso:
+    """Testes para a impressão digital do universo e dos dados de mercado."""
+    
+    def test_universo_igual_ao_dataframe(self):
+        """Testa que o universo usa a impressão digital dos seus retornos."""
+        returns = make_returns()
+        universe = ReturnsUniverse.from_returns(returns)
+        
+        assert universe.fingerprint == fingerprint_frame(returns)
+    
+    def test_universo_depende_da_ordem_dos_tickers(self):
+        """Testa que a ordem dos genes faz parte da impressão digital."""
+        returns = make_returns()
+        
+        first = ReturnsUniverse.from_returns(returns, tickers=['PETR4.SA', 'VALE3.SA'])
+        second = ReturnsUniverse.from_returns(returns, tickers=['VALE3.SA', 'PETR4.SA'])
+        
+        assert first.fingerprint != second.fingerprint
+    
+    def test_dados_de_mercado(self):
+        """Testa a impressão digital dos retornos coletados."""
+        closes = (1 + make_returns()).cumprod()
+        market = MarketData(closes, '^BVSP')
+        
+        assert market.fingerprint == fingerprint_frame(market.returns)
@@ -0,0 +1,149 @@
+"""
+Testes para o módulo frontier.py
+
+Este módulo contém testes para a fronteira eficiente média-CVaR, pela
+programação linear e pelo algoritmo genético com partida a quente.
+"""
+
+import pytest
+import threading
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frontier import risk_aversion_grid, frontier_table, lp_frontier, ga_frontier
+from lp_solver import solve_mean_cvar
+from portfolio import Portfolio
+from universe import ReturnsUniverse
+
+PARAMS = {
+    'population_size': 30,
+    'max_generations': 20,
+    'crossover_rate': 0.8,
+    'mutation_rate': 0.2,
+    'semente': 7
+}
+
+
+def make_universe(seed=3, n_obs=200):
+    rng = np.random.default_rng(seed)
+    returns = pd.DataFrame({
+        'PETR4.SA': rng.normal(0.0010, 0.020, n_obs),
+        'VALE3.SA': rng.normal(0.0015, 0.030, n_obs),
+        'ITUB4.SA': rng.normal(0.0005, 0.012, n_obs),
+        'BBDC4.SA': rng.normal(0.0002, 0.010, n_obs)
+    }, index=pd.bdate_range('2023-01-02', periods=n_obs))
+    return ReturnsUniverse.from_returns(returns)
+
+
+class TestRiskAversionGrid:
+    """Testes para a grade de pesos do CVaR."""
+    
+    def test_grade_padrao(self):
+        """Testa a grade padrão entre máximo retorno e mínimo CVaR."""
+        grid = risk_aversion_grid()
+        
+        assert len(grid) == 50
+        assert grid[0] == 0.0 and grid[-1] == 1.0
+    
+    @pytest.mark.parametrize("points, low, high", [(0, 0.0, 1.0), (5, -0.1, 1.0), (5, 0.8, 0.2)])
+    def test_grade_invalida(self, points, low, high):
+        """Testa que grades vazias ou fora de [0, 1] geram ValueError."""
+        with pytest.raises(ValueError):
+            risk_aversion_grid(points, low, high)
+
+
+class TestFrontierTable:
+    """Testes para a tabela de métricas da fronteira."""
+    
+    def test_metricas_iguais_as_do_portfolio(self):
+        """Testa que as métricas em lote coincidem com as de cada Portfolio."""
+        universe = make_universe()
+        weights = np.random.default_rng(0).dirichlet(np.ones(universe.size), size=3)
+        table = frontier_table(universe, [0.1, 0.5, 0.9], weights)
+        
+        for row, rate in zip(table.itertuples(), [0.1, 0.5, 0.9]):
+            portfolio = Portfolio(weights[row.Index], universe, risk_free_rate=rate)
+            assert row.fitness == pytest.approx(portfolio.fitness(), abs=1e-12)
+            assert row.cvar == pytest.approx(portfolio.cvar, abs=1e-12)
+        assert list(table.columns[5:]) == list(universe.tickers)
+
+
+class TestLpFrontier:
+    """Testes para a fronteira exata por programação linear."""
+    
+    def test_pontos_otimos_e_monotonos(self):
+        """Testa que cada ponto é o ótimo isolado e que o risco cai com a aversão."""
+        universe = make_universe()
+        rates = risk_aversion_grid(6)
+        table = lp_frontier(universe, rates)
+        
+        for rate, fitness in zip(rates, table['fitness']):
+            assert fitness == pytest.approx(solve_mean_cvar(universe, rate).fitness, abs=1e-10)
+        assert (np.diff(table['cvar']) >= -1e-10).all()
+        assert (np.diff(table['retorno_esperado']) <= 1e-10).all()
+        assert np.allclose(table[list(universe.tickers)].sum(axis=1), 1.0)
+
+
+class TestGaFrontier:
+    """Testes para a fronteira pelo algoritmo genético com partida a quente."""
+    
+    def test_proxima_da_fronteira_exata(self):
+        """Testa que a fronteira do AG fica próxima e abaixo da exata."""
+        universe = make_universe()
+        rates = risk_aversion_grid(8)
+        exact = lp_frontier(universe, rates)
+        table = ga_frontier(universe, rates, PARAMS)
+        
+        gaps = exact['fitness'] - table['fitness']
+        assert (gaps >= -1e-12).all()
+        assert gaps.max() < 1e-3
+    
+    def test_reprodutivel_pela_semente(self):
+        """Testa que a mesma semente reproduz a mesma fronteira."""
+        universe = make_universe()
+        rates = risk_aversion_grid(4)
+        
+        first = ga_frontier(universe, rates, PARAMS)
+        second = ga_frontier(universe, rates, PARAMS)
+        
+        pd.testing.assert_frame_equal(first, second)
+    
+    def test_partida_a_quente_reaproveita_avaliacoes(self):
+        """Testa que os pontos seguintes custam menos avaliações que o primeiro."""
+        universe = make_universe()
+        Portfolio.reset_fitness_stats()
+        ga_frontier(universe, [0.5], PARAMS)
+        single = Portfolio.fitness_stats()['evaluations']
+        
+        Portfolio.reset_fitness_stats()
+        ga_frontier(universe, risk_aversion_grid(11), PARAMS)
+        
+        assert Portfolio.fitness_stats()['evaluations'] < 3 * single
+    
+    def test_cancelamento_entre_pontos(self):
+        """Testa que o cancelamento encerra o traçado com os pontos concluídos."""
+        universe = make_universe()
+        rates = risk_aversion_grid(5)
+        cancel_event = threading.Event()
+        
+        def on_point(point, total):
+            if point == 2:
+                cancel_event.set()
+        
+        table = ga_frontier(universe, rates, PARAMS, cancel_event=cancel_event, on_point=on_point)
+        
+        assert list(table['aversao_risco']) == pytest.approx(rates[:2])
+    
+    def test_cancelamento_previo(self):
+        """Testa que um evento já sinalizado não traça nenhum ponto."""
+        cancel_event = threading.Event()
+        cancel_event.set()
+        
+        table = ga_frontier(make_universe(), risk_aversion_grid(3), PARAMS, cancel_event=cancel_event)
+        
+        assert table.empty
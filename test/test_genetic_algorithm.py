@@ -7,6 +7,7 @@ de seleção e otimização.
 """
 
 import pytest
+import threading
 from unittest.mock import patch, MagicMock, Mock
 import pandas as pd
 import numpy as np
@@ -144,6 +145,139 @@ class TestSelectionType:
     def test_tipo_selecao_disponivel(self):
         selection_types = list(GeneticAlgorithm.SelectionType)
         assert GeneticAlgorithm.SelectionType.TOURNAMENT in selection_types
+        assert GeneticAlgorithm.SelectionType.NSGA2 in selection_types
+    
+    def test_tipos_de_selecao_por_fitness(self):
+        assert GeneticAlgorithm.SelectionType.ROULETTE.value == "roulette"
+        assert GeneticAlgorithm.SelectionType.RANK.value == "rank"
+        assert GeneticAlgorithm.SelectionType.TRUNCATION.value == "truncation"
+
+
+class TestFitnessSelection:
+    
+    TYPES = [
+        GeneticAlgorithm.SelectionType.TOURNAMENT,
+        GeneticAlgorithm.SelectionType.ROULETTE,
+        GeneticAlgorithm.SelectionType.RANK,
+        GeneticAlgorithm.SelectionType.TRUNCATION
+    ]
+    
+    def make_ga(self, selection_type, size=10, **kwargs):
+        params = dict(
+            population=[MockChromosome(i) for i in range(size)],
+            threshold=float('inf'),
+            max_generations=5,
+            mutation_rate=0.1,
+            crossover_rate=0.8,
+            selection_type=selection_type,
+            rng=5
+        )
+        params.update(kwargs)
+        return GeneticAlgorithm(**params)
+    
+    @pytest.mark.parametrize("selection_type", TYPES)
+    def test_pares_de_pais(self, selection_type):
+        ga = self.make_ga(selection_type, size=7)
+        
+        parents = ga._select_parents()
+        
+        assert len(parents) == 4
+        assert all(p in ga.population for pair in parents for p in pair)
+    
+    @pytest.mark.parametrize("selection_type", TYPES)
+    def test_executa_e_preserva_tamanho(self, selection_type):
+        ga = self.make_ga(selection_type)
+        
+        best = ga.run()
+        
+        assert len(ga.population) == 10
+        assert best.fitness() >= 9
+    
+    @pytest.mark.parametrize("selection_type", TYPES)
+    def test_fitness_calculado_uma_vez_por_individuo(self, selection_type):
+        ga = self.make_ga(selection_type, size=20)
+        calls = []
+        ga._fitness_key = lambda c: calls.append(c) or c.fitness()
+        
+        ga._select_parents()
+        
+        assert len(calls) == 20
+    
+    def test_truncamento_escolhe_apenas_metade_superior(self):
+        ga = self.make_ga(GeneticAlgorithm.SelectionType.TRUNCATION)
+        
+        parents = ga._select_parents()
+        
+        assert min(p.fitness() for pair in parents for p in pair) >= 5
+
+
+class TestNsga2Selection:
+    
+    @staticmethod
+    def objectives(chromosome):
+        # Objetivos conflitantes: valores próximos de 0 e de 5 são não dominados entre si
+        return (-abs(chromosome.value), -abs(chromosome.value - 5))
+    
+    def make_ga(self, values, **kwargs):
+        params = dict(
+            population=[MockChromosome(v) for v in values],
+            threshold=float('inf'),
+            max_generations=5,
+            mutation_rate=0.5,
+            crossover_rate=0.5,
+            selection_type=GeneticAlgorithm.SelectionType.NSGA2,
+            objectives=self.objectives,
+            rng=1
+        )
+        params.update(kwargs)
+        return GeneticAlgorithm(**params)
+    
+    def test_exige_funcao_de_objetivos(self):
+        with pytest.raises(ValueError, match="NSGA-II"):
+            self.make_ga([1.0, 2.0], objectives=None)
+    
+    def test_pares_de_pais(self):
+        ga = self.make_ga([float(v) for v in range(-3, 9)])
+        
+        parents = ga._select_parents()
+        
+        assert len(parents) == 6
+        assert all(isinstance(p, MockChromosome) for pair in parents for p in pair)
+    
+    def test_filhos_nao_compartilham_objetos_com_pais(self):
+        ga = self.make_ga([float(v) for v in range(10)], crossover_rate=0.0)
+        originals = list(ga.population)
+        
+        children = ga._crossover(ga._select_parents())
+        
+        assert not {id(c) for c in children} & {id(p) for p in originals}
+    
+    def test_frente_de_pareto_final(self):
+        ga = self.make_ga([float(v) for v in range(-5, 15)], max_generations=10)
+        
+        ga.run()
+        values = [c.value for c in ga.pareto_front]
+        
+        assert len(ga.population) == 20
+        assert ga.pareto_front
+        assert all(-0.5 <= v <= 5.5 for v in values)
+    
+    def test_sobreviventes_preservam_nao_dominados(self):
+        ga = self.make_ga([0.0, 2.5, 5.0, 20.0, 30.0, -10.0])
+        previous = list(ga.population)
+        ga._population = [MockChromosome(40.0) for _ in range(6)]
+        
+        survivors = ga._select_survivors(previous)
+        
+        assert len(survivors) == 6
+        assert {c.value for c in previous[:3]} <= {c.value for c in survivors}
+    
+    def test_torneio_continua_sem_nsga2(self):
+        ga = self.make_ga([1.0, 2.0, 3.0], selection_type=GeneticAlgorithm.SelectionType.TOURNAMENT)
+        
+        ga.run()
+        
+        assert ga.pareto_front is None
 
 
 class TestTournamentSelection:
@@ -156,40 +290,42 @@ class TestTournamentSelection:
             threshold=9.0,
             max_generations=10,
             mutation_rate=0.1,
-            crossover_rate=0.8
+            crossover_rate=0.8,
+            rng=3
         )
     
     def test_escolher_torneio_retorna_tupla(self):
-        result = self.ga._pick_tournament()
-        assert isinstance(result, tuple)
-        assert len(result) == 2
+        parents = self.ga._select_parents()
+        assert len(parents) == 5
+        assert all(isinstance(pair, tuple) and len(pair) == 2 for pair in parents)
     
     def test_escolher_torneio_retorna_cromossomos(self):
-        parent1, parent2 = self.ga._pick_tournament()
-        assert isinstance(parent1, MockChromosome)
-        assert isinstance(parent2, MockChromosome)
+        for parent1, parent2 in self.ga._select_parents():
+            assert isinstance(parent1, MockChromosome)
+            assert isinstance(parent2, MockChromosome)
+            assert any(parent1 is chromosome for chromosome in self.population)
     
     def test_escolher_torneio_seleciona_melhor(self):
-        # Com população pequena e muitos competidores, deve selecionar os melhores
-        parent1, parent2 = self.ga._pick_tournament(competitors=8)
-        
-        # Os pais devem ter fitness alto
-        assert parent1.fitness() >= 5.0
-        assert parent2.fitness() >= 5.0
+        # Com muitos competidores (sorteados com reposição), os pais são os melhores
+        self.ga._competitors = 200
+        for parent1, parent2 in self.ga._select_parents():
+            assert parent1.fitness() == 9
+            assert parent2.fitness() >= 8
     
     def test_escolher_torneio_com_competidores_diferentes(self):
         # Testa com 2 competidores
-        result_2 = self.ga._pick_tournament(competitors=2)
-        assert len(result_2) == 2
+        self.ga._competitors = 2
+        assert len(self.ga._select_parents()) == 5
         
         # Testa com 5 competidores
-        result_5 = self.ga._pick_tournament(competitors=5)
-        assert len(result_5) == 2
+        self.ga._competitors = 5
+        assert len(self.ga._select_parents()) == 5
     
     def test_escolher_torneio_com_competidor_unico(self):
-        result = self.ga._pick_tournament(competitors=1)
-        assert len(result) == 2
-        # Com 1 competidor, pode retornar o mesmo cromossomo duas vezes
+        self.ga._competitors = 1
+        # Com 1 competidor, ele é usado como os dois pais
+        for parent1, parent2 in self.ga._select_parents():
+            assert parent1 is parent2
 
 
 class TestReduceReplace:
@@ -327,6 +463,42 @@ class TestElitism:
         assert len(result) == 2
         # Deve preservar pelo menos o melhor
         assert 5.0 in [x.fitness() for x in result]
+    
+    def test_aplicar_elitismo_com_populacao_anterior(self):
+        previous = [MockChromosome(i) for i in range(20, 30)]
+        new_population = [MockChromosome(i) for i in range(10)]
+        
+        result = self.ga._apply_elitism(new_population, previous)
+        
+        assert [x.fitness() for x in result] == [29, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+    
+    def test_execucao_preserva_melhor_da_geracao_anterior(self):
+        ga = GeneticAlgorithm(
+            population=[MockChromosome(i) for i in range(10)],
+            threshold=float('inf'),
+            max_generations=1,
+            mutation_rate=0.0,
+            crossover_rate=1.0,
+            rng=0
+        )
+        
+        ga.run()
+        
+        assert 9 in [x.fitness() for x in ga.population]
+    
+    def test_elite_nao_sofre_mutacao(self):
+        ga = GeneticAlgorithm(
+            population=[MockChromosome(i) for i in range(10)],
+            threshold=float('inf'),
+            max_generations=1,
+            mutation_rate=1.0,
+            crossover_rate=1.0,
+            rng=0
+        )
+        
+        ga.run()
+        
+        assert ga.population[0].fitness() == 9
 
 
 class TestMutation:
@@ -478,6 +650,152 @@ class TestGeneticAlgorithmRun:
         assert isinstance(result, MockChromosome)
 
 
+class TestBatchFitness:
+    
+    @patch('builtins.print')
+    def test_avaliador_em_lote_chamado_por_geracao(self, mock_print):
+        batch_fitness = Mock()
+        ga = GeneticAlgorithm(
+            population=[MockChromosome(i) for i in range(6)],
+            threshold=100.0,
+            max_generations=3,
+            mutation_rate=0.1,
+            crossover_rate=0.8,
+            batch_fitness=batch_fitness
+        )
+        
+        ga.run()
+        
+        # Uma avaliação inicial e duas por geração (após reprodução e mutação)
+        assert batch_fitness.call_count == 1 + 2 * 3
+        for call in batch_fitness.call_args_list:
+            assert len(call.args[0]) == 6
+    
+    @patch('builtins.print')
+    def test_sem_avaliador_em_lote(self, mock_print):
+        ga = GeneticAlgorithm(
+            population=[MockChromosome(i) for i in range(4)],
+            threshold=100.0,
+            max_generations=2,
+            mutation_rate=0.1,
+            crossover_rate=0.8
+        )
+        
+        assert isinstance(ga.run(), MockChromosome)
+
+
+class TestSeededRng:
+    
+    def make_ga(self, rng):
+        return GeneticAlgorithm(
+            population=[MockChromosome(i) for i in range(8)],
+            threshold=100.0,
+            max_generations=3,
+            mutation_rate=0.5,
+            crossover_rate=0.5,
+            rng=rng
+        )
+    
+    def test_mesma_semente_mesmos_pais(self):
+        first = self.make_ga(11)._select_parents()
+        second = self.make_ga(np.random.default_rng(11))._select_parents()
+        
+        assert [(a.value, b.value) for a, b in first] == [(a.value, b.value) for a, b in second]
+    
+    def test_sementes_diferentes(self):
+        draws = {tuple(self.make_ga(seed)._rng.integers(1000, size=8)) for seed in range(3)}
+        
+        assert len(draws) == 3
+    
+    def test_gerador_informado_e_usado(self):
+        rng = np.random.default_rng(0)
+        
+        assert self.make_ga(rng)._rng is rng
+
+
+class TestStopCriteria:
+    
+    def make_ga(self, population, **criteria):
+        return GeneticAlgorithm(
+            population=population,
+            threshold=100.0,
+            max_generations=50,
+            mutation_rate=0.0,
+            crossover_rate=0.0,
+            **criteria
+        )
+    
+    @patch('builtins.print')
+    def test_motivo_limite_de_geracoes(self, mock_print):
+        ga = self.make_ga([MockChromosome(i) for i in range(4)])
+        ga._max_generations = 3
+        
+        ga.run()
+        
+        assert ga.stop_reason == GeneticAlgorithm.StopReason.MAX_GENERATIONS
+        assert ga.results.attrs['stop_reason'] == "max_generations"
+    
+    @patch('builtins.print')
+    def test_motivo_limiar(self, mock_print):
+        ga = self.make_ga([MockChromosome(i) for i in range(4)])
+        ga._threshold = 2.0
+        
+        ga.run()
+        
+        assert ga.stop_reason == GeneticAlgorithm.StopReason.THRESHOLD
+        assert ga.results.attrs['stop_reason'] == "threshold"
+    
+    @patch('builtins.print')
+    def test_parada_por_estagnacao(self, mock_print):
+        # Sem cruzamento nem mutação o melhor fitness nunca melhora
+        ga = self.make_ga([MockChromosome(i) for i in range(6)], stagnation_window=4)
+        
+        ga.run()
+        
+        assert ga.stop_reason == GeneticAlgorithm.StopReason.STAGNATION
+        assert len(ga.results) == 5
+    
+    @patch('builtins.print')
+    def test_parada_por_gap_de_fitness(self, mock_print):
+        ga = self.make_ga([MockChromosome(1.0) for _ in range(5)], gap_tolerance=1e-9)
+        
+        ga.run()
+        
+        assert ga.stop_reason == GeneticAlgorithm.StopReason.FITNESS_GAP
+        assert len(ga.results) == 1
+    
+    @patch('builtins.print')
+    def test_parada_por_diversidade(self, mock_print):
+        diversity = Mock(side_effect=[1.0, 0.5, 0.0])
+        ga = self.make_ga([MockChromosome(i) for i in range(4)], diversity_floor=0.1, diversity=diversity)
+        
+        ga.run()
+        
+        assert ga.stop_reason == GeneticAlgorithm.StopReason.DIVERSITY
+        assert diversity.call_count == 3
+    
+    @patch('builtins.print')
+    def test_parada_por_cancelamento(self, mock_print):
+        cancel_event = threading.Event()
+        hooks = Mock()
+        hooks.on_generation_end.side_effect = lambda stats: cancel_event.set() if stats.generation == 1 else None
+        ga = self.make_ga([MockChromosome(i) for i in range(4)], hooks=hooks, cancel_event=cancel_event)
+        
+        ga.run()
+        
+        assert ga.stop_reason == GeneticAlgorithm.StopReason.CANCELLED
+        assert ga.results.attrs['stop_reason'] == "cancelled"
+        assert len(ga.results) == 3
+    
+    def test_piso_de_diversidade_sem_funcao(self):
+        with pytest.raises(ValueError, match="diversidade"):
+            self.make_ga([MockChromosome(1.0)], diversity_floor=0.1)
+    
+    def test_janela_de_estagnacao_invalida(self):
+        with pytest.raises(ValueError, match="estagnação"):
+            self.make_ga([MockChromosome(1.0)], stagnation_window=0)
+
+
 class TestShowResults:
     
     def setup_method(self):
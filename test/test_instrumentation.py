@@ -0,0 +1,177 @@
+"""
+Testes para o módulo instrumentation.py
+
+Este módulo contém testes para as métricas por geração, os ganchos do
+algoritmo genético e o gravador em formato JSON lines.
+"""
+
+import pytest
+import io
+import json
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrumentation import GenerationStats, GenerationHooks, JsonLinesHooks, PHASES
+from genetic_algorithm import GeneticAlgorithm
+from universe import ReturnsUniverse
+from portfolio import Portfolio, evaluate_population, population_diversity
+
+
+class RecordingHooks(GenerationHooks):
+    """Ganchos que registram todas as notificações recebidas."""
+    
+    def __init__(self):
+        self.starts = []
+        self.evaluations = []
+        self.stats = []
+    
+    def on_generation_start(self, generation):
+        self.starts.append(generation)
+    
+    def on_evaluate(self, generation, population_size, seconds):
+        self.evaluations.append((generation, population_size, seconds))
+    
+    def on_generation_end(self, stats):
+        self.stats.append(stats)
+
+
+def make_population(size=10):
+    np.random.seed(13)
+    universe = ReturnsUniverse.from_returns(pd.DataFrame(
+        np.random.normal(0.001, 0.02, (120, 4)),
+        columns=['PETR4.SA', 'VALE3.SA', 'ITUB4.SA', 'BBDC4.SA']
+    ))
+    return Portfolio.random_population(universe, size)
+
+
+def make_ga(hooks, generations=3, **kwargs):
+    return GeneticAlgorithm(
+        population=make_population(),
+        threshold=10.0,
+        max_generations=generations,
+        mutation_rate=0.3,
+        crossover_rate=0.8,
+        batch_fitness=evaluate_population,
+        hooks=hooks,
+        **kwargs
+    )
+
+
+class TestGenerationStats:
+    """Testes para as métricas de uma geração."""
+    
+    def test_tempo_total(self):
+        """Testa que o tempo total soma as fases."""
+        stats = GenerationStats(0, 1.0, 0.5, timings={'selection': 0.25, 'mutation': 0.5})
+        
+        assert stats.elapsed == pytest.approx(0.75)
+    
+    def test_dicionario_serializavel(self):
+        """Testa que as métricas podem ser serializadas em JSON."""
+        stats = GenerationStats(2, 1.0, 0.5, timings={'selection': 0.1}, evaluations=4, cache_hit_rate=0.5)
+        
+        data = json.loads(json.dumps(stats.to_dict()))
+        
+        assert data['generation'] == 2
+        assert data['timings'] == {'selection': 0.1}
+        assert data['diversity'] is None
+
+
+class TestGeneticAlgorithmHooks:
+    """Testes para as notificações do algoritmo genético."""
+    
+    def test_ganchos_chamados_por_geracao(self):
+        """Testa a sequência de notificações de uma execução."""
+        hooks = RecordingHooks()
+        
+        make_ga(hooks).run()
+        
+        assert hooks.starts == [0, 1, 2]
+        assert [s.generation for s in hooks.stats] == [0, 1, 2]
+        # Avaliação inicial e duas por geração
+        assert [g for g, _, _ in hooks.evaluations] == [-1, 0, 0, 1, 1, 2, 2]
+        assert all(size == 10 for _, size, _ in hooks.evaluations)
+    
+    def test_tempos_de_todas_as_fases(self):
+        """Testa que cada geração reporta o tempo de todas as fases."""
+        hooks = RecordingHooks()
+        
+        make_ga(hooks).run()
+        
+        for stats in hooks.stats:
+            assert set(stats.timings) == set(PHASES)
+            assert all(seconds >= 0 for seconds in stats.timings.values())
+    
+    def test_contadores_de_fitness(self):
+        """Testa a contagem de avaliações e a taxa de acerto do cache."""
+        hooks = RecordingHooks()
+        
+        make_ga(hooks).run()
+        
+        for stats in hooks.stats:
+            assert 0 < stats.evaluations <= 20
+            assert 0.0 < stats.cache_hit_rate <= 1.0
+    
+    def test_diversidade_reportada(self):
+        """Testa que a diversidade é reportada quando configurada."""
+        hooks = RecordingHooks()
+        
+        make_ga(hooks, diversity=population_diversity).run()
+        
+        assert all(stats.diversity >= 0 for stats in hooks.stats)
+    
+    def test_sem_diversidade_configurada(self):
+        """Testa que a diversidade fica ausente sem função configurada."""
+        hooks = RecordingHooks()
+        
+        make_ga(hooks).run()
+        
+        assert all(stats.diversity is None for stats in hooks.stats)
+    
+    @patch('builtins.print')
+    def test_run_nao_imprime(self, mock_print):
+        """Testa que a execução não escreve na saída padrão."""
+        make_ga(None).run()
+        
+        mock_print.assert_not_called()
+
+
+class TestJsonLinesHooks:
+    """Testes para o gravador em formato JSON lines."""
+    
+    def test_uma_linha_por_geracao(self):
+        """Testa que cada geração gera uma linha JSON válida."""
+        stream = io.StringIO()
+        
+        make_ga(JsonLinesHooks(stream)).run()
+        
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 3
+        records = [json.loads(line) for line in lines]
+        assert [r['generation'] for r in records] == [0, 1, 2]
+        assert set(records[0]['timings']) == set(PHASES)
+    
+    def test_fluxo_externo_nao_e_fechado(self):
+        """Testa que um fluxo recebido pronto não é fechado."""
+        stream = io.StringIO()
+        
+        with JsonLinesHooks(stream):
+            pass
+        
+        assert not stream.closed
+    
+    def test_grava_em_arquivo(self, tmp_path):
+        """Testa a gravação em um arquivo, acrescentando entre execuções."""
+        path = tmp_path / "metricas.jsonl"
+        
+        for _ in range(2):
+            with JsonLinesHooks(str(path)) as hooks:
+                make_ga(hooks, generations=2).run()
+        
+        assert len(path.read_text(encoding='utf-8').splitlines()) == 4
@@ -0,0 +1,160 @@
+"""
+Testes para o módulo island_model.py
+
+Este módulo contém testes para o modelo de ilhas, incluindo as topologias
+de migração e a execução completa em processos auxiliares.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+from universe import ReturnsUniverse
+from portfolio import Portfolio
+from island_model import IslandModel
+from genetic_algorithm import GeneticAlgorithm
+
+
+def make_universe(n_assets=5, n_obs=150):
+    np.random.seed(9)
+    returns_data = pd.DataFrame(
+        np.random.normal(0.001, 0.02, (n_obs, n_assets)),
+        columns=[f'ATIVO{i}.SA' for i in range(n_assets)]
+    )
+    return ReturnsUniverse.from_returns(returns_data)
+
+
+def make_model(topology, islands=3, migrants=1, **kwargs):
+    params = dict(
+        universe=make_universe(),
+        islands=islands,
+        island_size=4,
+        max_generations=10,
+        mutation_rate=0.2,
+        crossover_rate=0.8,
+        threshold=1.0,
+        migration_interval=5,
+        migrants=migrants,
+        topology=topology
+    )
+    params.update(kwargs)
+    return IslandModel(**params)
+
+
+class TestMigration:
+
+    def setup_method(self):
+        # Ilha i tem genes constantes iguais a i; o melhor está na primeira linha
+        self.genes = [np.full((4, 5), float(i)) for i in range(3)]
+        self.fitness = [np.array([10.0 * i + 3, 10.0 * i + 2, 10.0 * i + 1, 10.0 * i]) for i in range(3)]
+        for i in range(3):
+            self.genes[i][0] += 0.5
+    
+    def test_migracao_em_anel(self):
+        model = make_model(IslandModel.Topology.RING)
+        model._migrate(self.genes, self.fitness)
+        
+        # Ilha 0 recebe o melhor da ilha 2, ilha 1 recebe da ilha 0
+        np.testing.assert_array_equal(self.genes[0][-1], np.full(5, 2.5))
+        np.testing.assert_array_equal(self.genes[1][-1], np.full(5, 0.5))
+        np.testing.assert_array_equal(self.genes[2][-1], np.full(5, 1.5))
+        # Os demais indivíduos permanecem
+        np.testing.assert_array_equal(self.genes[0][0], np.full(5, 0.5))
+    
+    def test_migracao_totalmente_conectada(self):
+        model = make_model(IslandModel.Topology.FULLY_CONNECTED)
+        model._migrate(self.genes, self.fitness)
+        
+        # Cada ilha recebe o melhor entre todas as outras
+        np.testing.assert_array_equal(self.genes[0][-1], np.full(5, 2.5))
+        np.testing.assert_array_equal(self.genes[1][-1], np.full(5, 2.5))
+        np.testing.assert_array_equal(self.genes[2][-1], np.full(5, 1.5))
+    
+    def test_sem_migrantes(self):
+        model = make_model(IslandModel.Topology.RING, migrants=0)
+        before = [g.copy() for g in self.genes]
+        model._migrate(self.genes, self.fitness)
+        
+        for original, current in zip(before, self.genes):
+            np.testing.assert_array_equal(original, current)
+
+
+class TestIslandModelValidation:
+
+    def test_migrantes_maior_que_ilha(self):
+        with pytest.raises(ValueError):
+            make_model(IslandModel.Topology.RING, migrants=4)
+    
+    def test_sem_ilhas(self):
+        with pytest.raises(ValueError):
+            make_model(IslandModel.Topology.RING, islands=0)
+    
+    def test_intervalo_invalido(self):
+        with pytest.raises(ValueError):
+            make_model(IslandModel.Topology.RING, migration_interval=0)
+
+
+class TestIslandModelRun:
+
+    @pytest.mark.parametrize("topology", list(IslandModel.Topology))
+    @patch('builtins.print')
+    def test_executar_retorna_melhor_portfolio(self, mock_print, topology):
+        model = make_model(topology, islands=2, max_workers=2)
+        best = model.run()
+        
+        assert isinstance(best, Portfolio)
+        assert best.universe is model.universe
+        assert len(model.results) == 10
+        assert best.fitness() >= model.results['best_fitness'].iloc[0] - 1e-12
+    
+    @patch('builtins.print')
+    def test_executar_sem_geracoes(self, mock_print):
+        model = make_model(IslandModel.Topology.RING, max_generations=0)
+        best = model.run()
+        
+        assert isinstance(best, Portfolio)
+        assert len(model.results) == 0
+    
+    @patch('builtins.print')
+    def test_mesma_semente_independe_do_numero_de_processos(self, mock_print):
+        serial = make_model(IslandModel.Topology.RING, islands=3, max_workers=1, seed=21)
+        parallel = make_model(IslandModel.Topology.RING, islands=3, max_workers=3, seed=21)
+        
+        best_serial = serial.run()
+        best_parallel = parallel.run()
+        
+        np.testing.assert_array_equal(best_serial.genes, best_parallel.genes)
+        pd.testing.assert_frame_equal(serial.results, parallel.results)
+    
+    @patch('builtins.print')
+    def test_cancelamento_entre_epocas(self, mock_print):
+        cancel_event = threading.Event()
+        cancel_event.set()
+        model = make_model(IslandModel.Topology.RING, cancel_event=cancel_event)
+        
+        best = model.run()
+        
+        assert isinstance(best, Portfolio)
+        assert len(model.results) == 0
+        assert model.results.attrs['stop_reason'] == GeneticAlgorithm.StopReason.CANCELLED.value
+    
+    @patch('builtins.print')
+    def test_tipo_de_selecao_das_ilhas(self, mock_print):
+        model = make_model(IslandModel.Topology.RING, islands=2, max_workers=1, selection_type=GeneticAlgorithm.SelectionType.ROULETTE)
+        
+        best = model.run()
+        
+        assert len(model.results) == 10
+        assert best.fitness() >= model.results['best_fitness'].iloc[0] - 1e-12
+
+
+if __name__ == '__main__':
+    # Configuração para executar os testes
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,96 @@
+"""
+Testes para o módulo lp_solver.py
+
+Este módulo contém testes para a solução exata do problema média-CVaR por
+programação linear, comparando-a ao fitness de Portfolio.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lp_solver import solve_mean_cvar
+from portfolio import Portfolio, evaluate_population
+from tail_risk import var_cvar
+from universe import ReturnsUniverse
+
+
+class TestSolveMeanCvar:
+    """Testes para o ótimo exato do fitness média-CVaR."""
+    
+    def setup_method(self):
+        """Configuração inicial para cada teste."""
+        rng = np.random.default_rng(5)
+        dates = pd.bdate_range('2023-01-02', periods=250)
+        self.returns = pd.DataFrame({
+            'PETR4.SA': rng.normal(0.0010, 0.020, 250),
+            'VALE3.SA': rng.normal(0.0015, 0.030, 250),
+            'ITUB4.SA': rng.normal(0.0005, 0.012, 250),
+            'BBDC4.SA': rng.normal(0.0002, 0.010, 250)
+        }, index=dates)
+        self.universe = ReturnsUniverse.from_returns(self.returns)
+    
+    def test_pesos_validos(self):
+        """Testa que os pesos ótimos são não negativos e somam 1."""
+        solution = solve_mean_cvar(self.universe, 0.5)
+        
+        assert solution.weights.shape == (4,)
+        assert (solution.weights >= 0).all()
+        assert solution.weights.sum() == pytest.approx(1.0)
+        assert set(solution.weights_by_ticker(self.universe)) == set(self.universe.tickers)
+    
+    def test_fitness_igual_ao_do_portfolio(self):
+        """Testa que o fitness da solução é o mesmo calculado pelo Portfolio."""
+        solution = solve_mean_cvar(self.universe, 0.3)
+        portfolio = Portfolio(solution.weights, self.universe, risk_free_rate=0.3)
+        
+        assert portfolio.fitness() == pytest.approx(solution.fitness, abs=1e-12)
+        assert portfolio.cvar == pytest.approx(solution.cvar, abs=1e-12)
+        assert solution.var >= solution.cvar
+    
+    def test_var_calculado_dos_pesos(self):
+        """Testa que o VaR vem dos pesos ótimos mesmo com taxa zero."""
+        solution = solve_mean_cvar(self.universe, 0.0)
+        var, cvar = var_cvar(self.universe.matrix @ solution.weights, 0.95)
+        
+        assert solution.var == pytest.approx(var, abs=1e-12)
+        assert solution.cvar == pytest.approx(cvar, abs=1e-12)
+    
+    @pytest.mark.parametrize("risk_free_rate", [0.0, 0.1075, 0.5, 1.0])
+    def test_supera_carteiras_aleatorias(self, risk_free_rate):
+        """Testa que nenhuma carteira aleatória supera o ótimo exato."""
+        solution = solve_mean_cvar(self.universe, risk_free_rate)
+        population = Portfolio.random_population(
+            self.universe, 2000, risk_free_rate=risk_free_rate, rng=np.random.default_rng(1)
+        )
+        evaluate_population(population)
+        
+        assert max(p.fitness() for p in population) <= solution.fitness + 1e-10
+    
+    def test_sem_aversao_concentra_no_maior_retorno(self):
+        """Testa que sem peso do CVaR toda a carteira vai para o ativo de maior retorno médio."""
+        solution = solve_mean_cvar(self.universe, 0.0)
+        
+        assert np.argmax(solution.weights) == np.argmax(self.universe.mean)
+        assert solution.weights.max() == pytest.approx(1.0)
+    
+    def test_cvar_minimo_em_duas_acoes(self):
+        """Testa o CVaR mínimo contra uma busca em grade com dois ativos."""
+        universe = ReturnsUniverse.from_returns(self.returns, tickers=['PETR4.SA', 'ITUB4.SA'])
+        solution = solve_mean_cvar(universe, 1.0)
+        grid = [Portfolio(np.array([w, 1 - w]), universe, risk_free_rate=1.0).fitness() for w in np.linspace(0, 1, 1001)]
+        
+        assert solution.fitness >= max(grid) - 1e-12
+        assert solution.fitness - max(grid) < 1e-4
+    
+    def test_nivel_de_confianca(self):
+        """Testa que o alpha informado é o usado no CVaR da solução."""
+        solution = solve_mean_cvar(self.universe, 0.5, alpha=0.99)
+        portfolio = Portfolio(solution.weights, self.universe, risk_free_rate=0.5)
+        
+        assert portfolio.fitness(alpha=0.99) == pytest.approx(solution.fitness, abs=1e-12)
@@ -0,0 +1,92 @@
+"""
+Testes para o módulo market_data.py
+
+Este módulo contém testes para o resultado unificado da coleta de dados
+de mercado e para a sua obtenção pelo DataCollector.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data import MarketData
+from price_sources import SyntheticSource
+from data_collector import DataCollector
+
+
+class TestMarketData:
+    """Testes para os retornos dos ativos e do benchmark."""
+    
+    def setup_method(self):
+        dates = pd.bdate_range('2024-01-01', periods=5)
+        self.closes = pd.DataFrame({
+            'PETR4.SA': [10.0, 11.0, 12.1, 12.1, 13.31],
+            'VALE3.SA': [20.0, np.nan, 21.0, 22.0, 23.0],
+            '^BVSP': [100.0, 101.0, 99.99, 100.0, 102.0]
+        }, index=dates)
+        self.market = MarketData(self.closes, '^BVSP')
+    
+    def test_descarta_colunas_incompletas(self):
+        """Testa que colunas com falhas são descartadas, como na coleta."""
+        assert list(self.market.closes.columns) == ['PETR4.SA', '^BVSP']
+        assert self.market.tickers == ['PETR4.SA']
+        assert len(self.market.returns) == 4
+    
+    def test_retornos_dos_ativos_sem_benchmark(self):
+        """Testa a separação entre retornos dos ativos e do benchmark."""
+        np.testing.assert_allclose(self.market.asset_returns['PETR4.SA'], [0.1, 0.1, 0.0, 0.1])
+        assert '^BVSP' not in self.market.asset_returns.columns
+        assert self.market.benchmark_returns.index.equals(self.market.asset_returns.index)
+    
+    def test_valor_do_benchmark(self):
+        """Testa a evolução do capital aplicado nos últimos pregões do benchmark."""
+        value = self.market.benchmark_value(1000.0, 2)
+        
+        np.testing.assert_allclose(value.to_numpy(), [1000.0 * 100.0 / 99.99, 1020.0 / 0.9999], rtol=1e-12)
+        assert list(value.index) == list(self.closes.index[-2:])
+    
+    def test_janela_maior_que_os_dados(self):
+        """Testa que uma janela maior que a série usa todos os pregões."""
+        value = self.market.benchmark_value(1000.0, 100)
+        
+        assert len(value) == 4
+        assert value.iloc[-1] == pytest.approx(1020.0)
+    
+    def test_benchmark_ausente(self):
+        """Testa o comportamento quando o benchmark não foi obtido."""
+        market = MarketData(self.closes.drop(columns='^BVSP'), '^BVSP')
+        
+        assert market.benchmark_returns is None
+        assert market.benchmark_value(1000.0, 10) is None
+        assert market.tickers == ['PETR4.SA']
+    
+    def test_impressao_digital_inclui_benchmark(self):
+        """Testa que a impressão digital muda quando apenas o benchmark muda."""
+        closes = self.closes.copy()
+        closes.loc[closes.index[-1], '^BVSP'] = 103.0
+        
+        assert MarketData(self.closes.copy(), '^BVSP').fingerprint == self.market.fingerprint
+        assert MarketData(closes, '^BVSP').fingerprint != self.market.fingerprint
+
+
+class TestDataCollectorMarketData:
+    """Testes para a coleta unificada pelo DataCollector."""
+    
+    def test_mesma_coleta_dos_retornos(self):
+        """Testa que os dados de mercado coincidem com os retornos baixados."""
+        collector = DataCollector(
+            ["PETR4", "VALE3"], start=datetime(2024, 1, 1), end=datetime(2024, 3, 1),
+            source=SyntheticSource(seed=6)
+        )
+        
+        market = collector.download_market_data()
+        
+        pd.testing.assert_frame_equal(market.returns, collector.download_data())
+        assert market.tickers == ['PETR4.SA', 'VALE3.SA']
+        assert market.benchmark_returns.name == '^BVSP'
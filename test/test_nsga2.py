@@ -0,0 +1,137 @@
+"""
+Testes para o módulo nsga2.py
+
+Este módulo contém testes para a ordenação não dominada, a distância de
+aglomeração e a seleção de sobreviventes do NSGA-II, e para a frente de
+Pareto de retorno e CVaR obtida com Portfolio.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nsga2 import dominance_matrix, non_dominated_sort, crowding_distance, rank_and_crowding, select_survivors, crowded_tournament
+from frontier import pareto_front, best_on_front, frontier_table, lp_frontier, risk_aversion_grid
+from universe import ReturnsUniverse
+
+
+def brute_force_ranks(values):
+    """Calcula as frentes removendo, a cada passo, os não dominados restantes."""
+    ranks = np.full(len(values), -1)
+    rank = 0
+    while (ranks < 0).any():
+        remaining = np.flatnonzero(ranks < 0)
+        for i in remaining:
+            others = values[remaining]
+            dominated = ((others >= values[i]).all(axis=1) & (others > values[i]).any(axis=1)).any()
+            if not dominated:
+                ranks[i] = rank
+        rank += 1
+    return ranks
+
+
+class TestNonDominatedSort:
+    """Testes para a ordenação em frentes não dominadas."""
+    
+    def test_dominancia(self):
+        """Testa a relação de dominância entre pares."""
+        values = np.array([[1.0, 1.0], [0.0, 0.0], [1.0, 0.0], [1.0, 1.0]])
+        dominates = dominance_matrix(values)
+        
+        assert dominates[0, 1] and dominates[0, 2] and dominates[2, 1]
+        assert not dominates[0, 3] and not dominates[3, 0]
+        assert not dominates.diagonal().any()
+    
+    def test_frentes_conhecidas(self):
+        """Testa as frentes de um exemplo pequeno."""
+        values = np.array([[3.0, 1.0], [1.0, 3.0], [2.0, 2.0], [1.0, 1.0], [0.0, 0.0], [2.0, 0.5]])
+        fronts = non_dominated_sort(values)
+        
+        assert [sorted(front.tolist()) for front in fronts] == [[0, 1, 2], [3, 5], [4]]
+    
+    def test_igual_a_forca_bruta(self):
+        """Testa a ordenação rápida contra uma ordenação por força bruta."""
+        values = np.random.default_rng(4).normal(size=(60, 3))
+        ranks, _ = rank_and_crowding(values)
+        
+        assert (ranks == brute_force_ranks(values)).all()
+
+
+class TestCrowdingDistance:
+    """Testes para a distância de aglomeração."""
+    
+    def test_extremos_infinitos(self):
+        """Testa que os extremos de cada objetivo recebem distância infinita."""
+        values = np.array([[0.0, 4.0], [1.0, 3.0], [3.0, 1.0], [4.0, 0.0]])
+        distance = crowding_distance(values)
+        
+        assert np.isinf(distance[[0, 3]]).all()
+        assert distance[1] == pytest.approx(2 * 3 / 4)
+        assert distance[2] == pytest.approx(2 * 3 / 4)
+    
+    def test_frente_pequena(self):
+        """Testa que frentes com até dois indivíduos são todas extremas."""
+        assert np.isinf(crowding_distance(np.array([[1.0, 2.0], [2.0, 1.0]]))).all()
+
+
+class TestSelection:
+    """Testes para a sobrevivência e o torneio por aglomeração."""
+    
+    def test_sobreviventes_por_frente_e_aglomeracao(self):
+        """Testa que a primeira frente entra inteira e a seguinte preserva as pontas."""
+        values = np.array([[3.0, 1.0], [1.0, 3.0], [2.0, 2.0], [2.5, 0.0], [0.0, 2.5], [1.2, 1.2], [1.0, 1.0]])
+        survivors = select_survivors(values, 5)
+        
+        assert survivors.tolist()[:3] == [0, 1, 2]
+        assert set(survivors.tolist()[3:]) == {3, 4}
+    
+    def test_torneio(self):
+        """Testa que o torneio prefere a melhor frente e, nela, o mais isolado."""
+        ranks = np.array([0, 1, 0])
+        crowding = np.array([1.0, np.inf, 5.0])
+        winners = crowded_tournament(ranks, crowding, 2000, np.random.default_rng(0))
+        
+        assert np.bincount(winners, minlength=3)[1] < np.bincount(winners, minlength=3)[2]
+        assert set(winners.tolist()) <= {0, 1, 2}
+
+
+class TestParetoFront:
+    """Testes para a frente de Pareto de retorno e CVaR das carteiras."""
+    
+    def setup_method(self):
+        rng = np.random.default_rng(3)
+        returns = pd.DataFrame({
+            'PETR4.SA': rng.normal(0.0010, 0.020, 200),
+            'VALE3.SA': rng.normal(0.0015, 0.030, 200),
+            'ITUB4.SA': rng.normal(0.0005, 0.012, 200),
+            'BBDC4.SA': rng.normal(0.0002, 0.010, 200)
+        }, index=pd.bdate_range('2023-01-02', periods=200))
+        self.universe = ReturnsUniverse.from_returns(returns)
+        self.params = {'population_size': 60, 'max_generations': 30, 'crossover_rate': 0.85, 'mutation_rate': 0.2, 'semente': 2}
+    
+    def test_uma_evolucao_atende_todas_as_taxas(self):
+        """Testa que a frente contém carteiras próximas do ótimo para cada taxa."""
+        weights, ga = pareto_front(self.universe, self.params)
+        rates = risk_aversion_grid(6)
+        exact = lp_frontier(self.universe, rates)
+        
+        for rate, optimum in zip(rates, exact['fitness']):
+            chosen = best_on_front(self.universe, weights, rate)
+            fitness = frontier_table(self.universe, [rate], weights[chosen:chosen + 1])['fitness'][0]
+            assert optimum - 1e-3 < fitness <= optimum + 1e-12
+        assert ga.stop_reason.value == "max_generations"
+    
+    def test_frente_nao_dominada_e_ordenada(self):
+        """Testa que nenhuma carteira da frente domina outra e que o retorno cresce."""
+        weights, _ = pareto_front(self.universe, self.params)
+        table = frontier_table(self.universe, np.zeros(len(weights)), weights)
+        values = table[['retorno_esperado', 'cvar']].to_numpy()
+        
+        assert not dominance_matrix(values).any()
+        assert (np.diff(table['retorno_esperado']) >= 0).all()
+        assert np.allclose(weights.sum(axis=1), 1.0)
@@ -0,0 +1,347 @@
+"""
+Testes para o módulo optimization_service.py
+
+Este módulo contém testes para o serviço de otimização e para os jobs em
+segundo plano, usando a fonte sintética de preços (sem rede).
+"""
+
+import pytest
+import threading
+import pandas as pd
+from datetime import datetime
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import optimization_service
+from optimization_service import run_optimization, match_tickers, OptimizationJob, ENGINE_GA, ENGINE_LP, ENGINE_NSGA2, SELECTION_TYPES
+from data_collector import DataCollector
+from price_sources import SyntheticSource
+from profiles import optimization_params
+from result_cache import ResultCache
+from parallel import ParallelEvaluator
+
+
+TICKERS = ["PETR4", "VALE3", "ITUB4"]
+
+PARAMS = {
+    'population_size': 12,
+    'max_generations': 4,
+    'threshold': 100.0,
+    'crossover_rate': 0.8,
+    'mutation_rate': 0.2,
+    'risk_free_rate': 0.1,
+    'semente': 3
+}
+
+
+def make_collector(tickers=TICKERS):
+    return DataCollector(tickers, start=datetime(2023, 1, 1), end=datetime(2023, 12, 31), source=SyntheticSource(seed=1))
+
+
+class TestMatchTickers:
+    """Testes para a associação entre tickers pedidos e colunas coletadas."""
+    
+    def test_com_e_sem_sufixo(self):
+        """Testa a associação de tickers com e sem o sufixo .SA."""
+        columns = pd.Index(['PETR4.SA', 'VALE3.SA', '^BVSP'])
+        
+        assert match_tickers(['PETR4', 'VALE3.SA', 'ITUB4'], columns) == {'PETR4': 'PETR4.SA', 'VALE3.SA': 'VALE3.SA'}
+
+
+class TestRunOptimization:
+    """Testes para o fluxo completo de otimização."""
+    
+    def test_resultado_completo(self):
+        """Testa os campos do resultado usados pela interface."""
+        result = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector())
+        
+        assert list(result['pesos'].index) == TICKERS
+        assert result['pesos'].sum() == pytest.approx(1.0)
+        assert result['geracoes_executadas'] == len(result['fitness_hist']['melhor']) == 4
+        assert len(result['valor_portfolio']) == len(result['valor_bovespa']) == len(result['datas'])
+        assert result['motivo_parada'] == "max_generations"
+        assert result['acoes_nao_carregadas'] == []
+        assert not result['em_cache']
+    
+    def test_mesma_semente_mesma_carteira(self):
+        """Testa que a mesma semente reproduz a mesma carteira."""
+        first = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector())
+        second = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector())
+        
+        pd.testing.assert_series_equal(first['pesos'], second['pesos'])
+    
+    def test_resultado_memorizado(self):
+        """Testa que a segunda execução idêntica vem do cache."""
+        cache = ResultCache(directory=None)
+        first = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector(), cache=cache)
+        second = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector(), cache=cache)
+        
+        assert second['em_cache']
+        assert second['fitness'] == first['fitness']
+        assert cache.hits == 1
+    
+    def test_benchmark_diferente_nao_reaproveita_cache(self, monkeypatch):
+        """Testa que a mudança apenas do benchmark invalida o resultado memorizado."""
+        cache = ResultCache(directory=None)
+        first = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector(), cache=cache)
+        
+        fetch_closes = SyntheticSource.fetch_closes
+        
+        def shifted_benchmark(self, tickers, start, end):
+            closes = fetch_closes(self, tickers, start, end)
+            closes.iloc[-1, closes.columns.get_loc('^BVSP')] *= 1.01
+            return closes
+        
+        monkeypatch.setattr(SyntheticSource, 'fetch_closes', shifted_benchmark)
+        second = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector(), cache=cache)
+        
+        assert not second['em_cache']
+        assert second['versao_dados'] != first['versao_dados']
+        assert second['valor_bovespa'].iloc[-1] != pytest.approx(first['valor_bovespa'].iloc[-1])
+    
+    def test_cancelamento_nao_e_memorizado(self):
+        """Testa que uma execução cancelada não entra no cache."""
+        cache = ResultCache(directory=None)
+        cancel_event = threading.Event()
+        cancel_event.set()
+        
+        result = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector(), cache=cache, cancel_event=cancel_event)
+        
+        assert result['motivo_parada'] == "cancelled"
+        assert len(cache) == 0
+    
+    def test_cancelamento_durante_fronteira(self):
+        """Testa que cancelar durante o traçado da fronteira encerra a execução como cancelada."""
+        cache = ResultCache(directory=None)
+        cancel_event = threading.Event()
+        
+        def on_phase(phase):
+            if "ponto 2 de" in phase:
+                cancel_event.set()
+        
+        result = run_optimization(
+            TICKERS, {**PARAMS, 'pontos_fronteira': 5}, 10000.0,
+            collector=make_collector(), cache=cache, cancel_event=cancel_event, on_phase=on_phase
+        )
+        
+        assert result['motivo_parada'] == "cancelled"
+        assert len(result['fronteira']) == 1
+        assert len(cache) == 0
+    
+    def test_avaliacao_paralela(self, monkeypatch):
+        """Testa que ``processos`` avalia o fitness em um pool, com o mesmo resultado da avaliação serial."""
+        closed = []
+        
+        class RecordingEvaluator(ParallelEvaluator):
+            def close(self):
+                closed.append(self.max_workers)
+                super().close()
+        
+        monkeypatch.setattr(optimization_service, 'ParallelEvaluator', RecordingEvaluator)
+        serial = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector())
+        parallel = run_optimization(TICKERS, {**PARAMS, 'processos': 2}, 10000.0, collector=make_collector())
+        
+        assert closed == [2]
+        assert parallel['fitness'] == pytest.approx(serial['fitness'])
+        pd.testing.assert_series_equal(parallel['pesos'], serial['pesos'])
+    
+    def test_modelo_de_ilhas(self, monkeypatch):
+        """Testa que ``ilhas`` reparte a população do algoritmo genético no modelo de ilhas."""
+        models = []
+        
+        class RecordingModel(optimization_service.IslandModel):
+            def run(self):
+                models.append(self)
+                return super().run()
+        
+        monkeypatch.setattr(optimization_service, 'IslandModel', RecordingModel)
+        result = run_optimization(TICKERS, {**PARAMS, 'ilhas': 3, 'comparar_otimo': True}, 10000.0, collector=make_collector())
+        
+        assert len(models) == 1
+        assert models[0]._islands == 3 and models[0]._island_size == 4
+        assert result['geracoes_executadas'] == PARAMS['max_generations']
+        assert len(result['fitness_hist']['melhor']) == PARAMS['max_generations']
+        assert result['pesos'].sum() == pytest.approx(1.0)
+        assert result['fitness'] <= result['fitness_otimo'] + 1e-12
+    
+    def test_modelo_de_ilhas_cancelado(self):
+        """Testa que o modelo de ilhas respeita o cancelamento."""
+        cancel_event = threading.Event()
+        cancel_event.set()
+        
+        result = run_optimization(TICKERS, {**PARAMS, 'ilhas': 2}, 10000.0, collector=make_collector(), cancel_event=cancel_event)
+        
+        assert result['motivo_parada'] == "cancelled"
+    
+    def test_processos_fora_da_chave_do_cache(self):
+        """Testa que o número de processos não impede o reaproveitamento do cache."""
+        cache = ResultCache(directory=None)
+        run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector(), cache=cache)
+        
+        result = run_optimization(TICKERS, {**PARAMS, 'processos': 2}, 10000.0, collector=make_collector(), cache=cache)
+        
+        assert result['em_cache']
+    
+    def test_dados_insuficientes(self):
+        """Testa que menos de duas ações com dados gera ValueError."""
+        with pytest.raises(ValueError, match="Dados insuficientes"):
+            run_optimization(["PETR4"], PARAMS, 10000.0, collector=make_collector(["PETR4"]))
+    
+    def test_algoritmo_genetico_nao_supera_otimo(self):
+        """Testa que o fitness do AG é limitado pelo ótimo exato, quando pedido."""
+        result = run_optimization(TICKERS, {**PARAMS, 'comparar_otimo': True}, 10000.0, collector=make_collector())
+        
+        assert result['fitness'] <= result['fitness_otimo'] + 1e-12
+    
+    def test_otimo_exato_apenas_quando_pedido(self, monkeypatch):
+        """Testa que os motores evolutivos não resolvem o programa linear por padrão."""
+        def fail(*args, **kwargs):
+            raise AssertionError("programa linear resolvido sem ser pedido")
+        monkeypatch.setattr(optimization_service, 'solve_mean_cvar', fail)
+        
+        result = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector())
+        
+        assert result['fitness_otimo'] is None
+    
+    def test_motor_programacao_linear(self):
+        """Testa o motor exato: carteira ótima sem gerações."""
+        result = run_optimization(TICKERS, {**PARAMS, 'motor': ENGINE_LP}, 10000.0, collector=make_collector())
+        
+        assert result['fitness'] == pytest.approx(result['fitness_otimo'], abs=1e-12)
+        assert result['pesos'].sum() == pytest.approx(1.0)
+        assert result['geracoes_executadas'] == 0
+        assert result['fitness_hist'] == {'melhor': [], 'media': []}
+        assert result['motivo_parada'] == "optimal"
+        assert len(result['valor_portfolio']) > 0
+    
+    def test_fronteira_eficiente(self):
+        """Testa a fronteira pedida junto com a otimização."""
+        plain = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector())
+        result = run_optimization(TICKERS, {**PARAMS, 'motor': ENGINE_LP, 'pontos_fronteira': 5}, 10000.0, collector=make_collector())
+        
+        assert plain['fronteira'] is None
+        assert list(result['fronteira']['aversao_risco']) == pytest.approx([0.0, 0.25, 0.5, 0.75, 1.0])
+    
+    def test_motor_nsga2_compartilha_frente(self):
+        """Testa que perfis diferentes escolhem carteiras da mesma frente de Pareto em cache."""
+        cache = ResultCache(directory=None)
+        cautious = run_optimization(TICKERS, {**PARAMS, 'motor': ENGINE_NSGA2, 'risk_free_rate': 0.9}, 10000.0, collector=make_collector(), cache=cache)
+        bold = run_optimization(TICKERS, {**PARAMS, 'motor': ENGINE_NSGA2, 'risk_free_rate': 0.1, 'comparar_otimo': True}, 10000.0, collector=make_collector(), cache=cache)
+        
+        assert cache.hits == 1
+        assert not bold['em_cache']
+        pd.testing.assert_frame_equal(cautious['pareto'], bold['pareto'])
+        assert bold['retorno_esperado'] >= cautious['retorno_esperado']
+        assert bold['fitness'] <= bold['fitness_otimo'] + 1e-12
+        assert bold['pesos'].sum() == pytest.approx(1.0)
+    
+    def test_motor_nsga2_escolhe_pela_aversao_ao_risco(self):
+        """Testa que, com a mesma taxa, perfis escolhem pela aversão ao risco."""
+        cache = ResultCache(directory=None)
+        cautious, bold = [
+            run_optimization(TICKERS, {**PARAMS, 'motor': ENGINE_NSGA2, 'risk_aversion': aversion}, 10000.0, collector=make_collector(), cache=cache)
+            for aversion in (0.9, 0.05)
+        ]
+        
+        assert cautious['cvar'] >= bold['cvar']
+        assert bold['retorno_esperado'] >= cautious['retorno_esperado']
+        assert cautious['pesos'].to_dict() != bold['pesos'].to_dict()
+    
+    @pytest.mark.parametrize("engine", [ENGINE_GA, ENGINE_LP, ENGINE_NSGA2])
+    def test_aversao_ao_risco_e_o_peso_do_fitness(self, engine):
+        """Testa que todos os motores e o fitness informado usam a aversão ao risco como peso do CVaR."""
+        aversion = 0.6
+        params = {**PARAMS, 'motor': engine, 'risk_aversion': aversion, 'comparar_otimo': True}
+        
+        result = run_optimization(TICKERS, params, 10000.0, collector=make_collector())
+        exact = run_optimization(TICKERS, {**PARAMS, 'motor': ENGINE_LP, 'risk_free_rate': aversion}, 10000.0, collector=make_collector())
+        
+        expected = (1 - aversion) * result['retorno_esperado'] + aversion * result['cvar']
+        assert result['fitness'] == pytest.approx(expected)
+        assert result['fitness_otimo'] == pytest.approx(exact['fitness'])
+        assert result['fitness'] <= result['fitness_otimo'] + 1e-12
+    
+    def test_perfis_tem_aversoes_distintas(self):
+        """Testa que os perfis, de mesma taxa, diferem na aversão ao risco."""
+        aversions = [optimization_params(profile)['risk_aversion'] for profile in ('Conservador', 'Moderado', 'Arrojado')]
+        
+        assert aversions == sorted(aversions, reverse=True)
+        assert len(set(aversions)) == 3
+    
+    @pytest.mark.parametrize("selection", SELECTION_TYPES)
+    def test_tipos_de_selecao(self, selection):
+        """Testa o algoritmo genético com cada tipo de seleção de pais."""
+        result = run_optimization(TICKERS, {**PARAMS, 'selecao': selection, 'comparar_otimo': True}, 10000.0, collector=make_collector())
+        
+        assert result['pesos'].sum() == pytest.approx(1.0)
+        assert result['fitness'] <= result['fitness_otimo'] + 1e-12
+        assert result['geracoes_executadas'] == PARAMS['max_generations']
+    
+    def test_selecao_desconhecida(self):
+        """Testa que um tipo de seleção inexistente (ou o NSGA-II fora do seu motor) gera ValueError."""
+        for selection in ('sorteio', 'nsga2'):
+            with pytest.raises(ValueError, match="seleção"):
+                run_optimization(TICKERS, {**PARAMS, 'selecao': selection}, 10000.0, collector=make_collector())
+    
+    def test_motor_genetico_usa_operadores_vetorizados(self, monkeypatch):
+        """Testa que o serviço evolui a população com o ``VectorizedGeneticAlgorithm``."""
+        created = []
+        
+        class Spy(optimization_service.VectorizedGeneticAlgorithm):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                created.append(self)
+        
+        monkeypatch.setattr(optimization_service, 'VectorizedGeneticAlgorithm', Spy)
+        result = run_optimization(TICKERS, PARAMS, 10000.0, collector=make_collector())
+        
+        assert len(created) == 1
+        assert result['geracoes_executadas'] == len(created[0].results)
+    
+    def test_motor_desconhecido(self):
+        """Testa que um motor inexistente gera ValueError."""
+        with pytest.raises(ValueError, match="Motor"):
+            run_optimization(TICKERS, {**PARAMS, 'motor': 'simplex'}, 10000.0, collector=make_collector())
+
+
+class TestOptimizationJob:
+    """Testes para a otimização em segundo plano."""
+    
+    def test_job_concluido_com_historico(self):
+        """Testa a execução em thread própria e o histórico por geração."""
+        job = OptimizationJob(TICKERS, PARAMS, 10000.0, collector=make_collector()).start()
+        
+        assert job.wait(timeout=30)
+        assert job.status == OptimizationJob.Status.DONE
+        assert [stats.generation for stats in job.history] == [0, 1, 2, 3]
+        assert job.result['fitness'] == pytest.approx(job.history[-1].best_fitness)
+    
+    def test_job_com_erro(self):
+        """Testa que o erro da otimização fica registrado no job."""
+        job = OptimizationJob(["PETR4"], PARAMS, 10000.0, collector=make_collector(["PETR4"])).start()
+        
+        job.wait(timeout=30)
+        
+        assert job.status == OptimizationJob.Status.FAILED
+        assert isinstance(job.error, ValueError)
+    
+    def test_job_cancelado(self):
+        """Testa o cancelamento de um job em andamento."""
+        job = OptimizationJob(TICKERS, {**PARAMS, 'max_generations': 10000}, 10000.0, collector=make_collector())
+        job.on_generation_end = lambda stats: job.cancel()
+        
+        job.start().wait(timeout=30)
+        
+        assert job.status == OptimizationJob.Status.CANCELLED
+        assert job.result['geracoes_executadas'] < 10000
+    
+    def test_job_iniciado_duas_vezes(self):
+        """Testa que um job não pode ser iniciado novamente."""
+        job = OptimizationJob(TICKERS, PARAMS, 10000.0, collector=make_collector()).start()
+        job.wait(timeout=30)
+        
+        with pytest.raises(RuntimeError):
+            job.start()
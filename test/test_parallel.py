@@ -0,0 +1,82 @@
+"""
+Testes para o módulo parallel.py
+
+Este módulo contém testes para a avaliação de fitness em um pool de
+processos com a matriz de retornos em memória compartilhada.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from universe import ReturnsUniverse
+from portfolio import Portfolio, evaluate_population
+from parallel import ParallelEvaluator, SharedReturns
+from genetic_algorithm import GeneticAlgorithm
+
+
+class TestParallelEvaluator:
+
+    def setup_method(self):
+        np.random.seed(5)
+        dates = pd.date_range(start='2023-01-01', periods=120, freq='D')
+        returns_data = pd.DataFrame(
+            np.random.normal(0.001, 0.02, (120, 6)),
+            columns=[f'ATIVO{i}.SA' for i in range(6)],
+            index=dates
+        )
+        self.universe = ReturnsUniverse.from_returns(returns_data)
+    
+    def test_compartilha_matriz_de_retornos(self):
+        shared = SharedReturns(self.universe)
+        try:
+            view = np.ndarray(shared.shape, dtype=np.float64, buffer=shared._memory.buf)
+            np.testing.assert_array_equal(view, self.universe.matrix)
+        finally:
+            shared.close()
+    
+    def test_equivale_avaliacao_serial(self):
+        population = Portfolio.random_population(self.universe, 9)
+        copies = [Portfolio(p.genes.copy(), self.universe) for p in population]
+        
+        evaluate_population(population)
+        with ParallelEvaluator(self.universe, max_workers=2) as evaluator:
+            evaluator(copies)
+        
+        for serial, parallel in zip(population, copies):
+            assert abs(serial.fitness() - parallel.fitness()) < 1e-12
+            assert abs(serial.cvar - parallel.cvar) < 1e-12
+    
+    def test_rejeita_universo_diferente(self):
+        other = ReturnsUniverse.from_returns(self.universe.returns)
+        with ParallelEvaluator(self.universe, max_workers=1) as evaluator:
+            with pytest.raises(ValueError):
+                evaluator(Portfolio.random_population(other, 2))
+    
+    @patch('builtins.print')
+    def test_avaliador_do_algoritmo_genetico(self, mock_print):
+        population = Portfolio.random_population(self.universe, 12)
+        with ParallelEvaluator(self.universe, max_workers=2) as evaluator:
+            ga = GeneticAlgorithm(
+                population=population,
+                threshold=1.0,
+                max_generations=3,
+                mutation_rate=0.2,
+                crossover_rate=0.8,
+                batch_fitness=evaluator
+            )
+            best = ga.run()
+        
+        assert isinstance(best, Portfolio)
+        assert len(ga.results) == 3
+
+
+if __name__ == '__main__':
+    # Configuração para executar os testes
+    pytest.main([__file__, "-v"])
@@ -7,6 +7,7 @@ como cromossomo genético.
 """
 
 import pytest
+import threading
 import numpy as np
 import pandas as pd
 from unittest.mock import patch, MagicMock
@@ -16,8 +17,9 @@ import os
 # Adiciona o diretório pai ao path para importar os módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from portfolio import Portfolio
+from portfolio import Portfolio, evaluate_population, population_diversity
 from chromosome import Chromosome
+from universe import ReturnsUniverse
 
 
 class TestPortfolioInitialization:
@@ -212,6 +214,16 @@ class TestPortfolioFitness:
         fitness2 = self.portfolio.fitness()
         
         assert fitness1 == fitness2
+    
+    def test_fitness_penaliza_perdas_na_cauda(self):
+        """Testa que o CVaR (negativo) entra somado e reduz o fitness."""
+        fitness_value = self.portfolio.fitness()
+        
+        assert fitness_value == pytest.approx(0.9 * self.portfolio.ExpReturn + 0.1 * self.portfolio.cvar)
+        assert fitness_value < self.portfolio.ExpReturn
+        
+        only_risk = Portfolio(self.weights, self.returns_data, risk_free_rate=1.0)
+        assert only_risk.fitness() == pytest.approx(only_risk.cvar)
 
 
 class TestPortfolioCrossover:
@@ -312,6 +324,39 @@ class TestPortfolioCrossover:
             assert abs(child1._weights[asset] - self.portfolio2._weights[asset]) < 1e-10
 
 
+class TestPortfolioCopy:
+    """Testes para o método copy do Portfolio."""
+    
+    def setup_method(self):
+        """Configuração inicial para cada teste."""
+        np.random.seed(42)
+        self.returns_data = pd.DataFrame({
+            'PETR4.SA': np.random.normal(0.001, 0.02, 50),
+            'VALE3.SA': np.random.normal(0.002, 0.03, 50)
+        })
+        self.portfolio = Portfolio({'PETR4.SA': 0.7, 'VALE3.SA': 0.3}, self.returns_data, risk_free_rate=0.3)
+    
+    def test_copia_mantem_pesos_e_fitness(self):
+        """Testa que a cópia tem os mesmos pesos, universo, taxa e fitness."""
+        clone = self.portfolio.copy()
+        
+        assert clone is not self.portfolio
+        assert clone.weights == self.portfolio.weights
+        assert clone.universe is self.portfolio.universe
+        assert clone.risk_free_rate == 0.3
+        assert clone.fitness() == self.portfolio.fitness()
+    
+    def test_mutacao_da_copia_nao_altera_original(self):
+        """Testa que a cópia não compartilha os genes com o original."""
+        original = self.portfolio.genes.copy()
+        clone = self.portfolio.copy()
+        
+        clone.mutate(mutation_rate=1.0)
+        
+        np.testing.assert_array_equal(self.portfolio.genes, original)
+        assert not np.shares_memory(clone.genes, self.portfolio.genes)
+
+
 class TestPortfolioMutate:
     """Testes para o método mutate do Portfolio."""
     
@@ -574,6 +619,257 @@ class TestPortfolioEdgeCases:
         assert abs(portfolio.cvar - expected_return) < 1e-10
 
 
+class TestPortfolioFitnessCache:
+    """Testes para a memoização do fitness do Portfolio."""
+    
+    def setup_method(self):
+        """Configuração inicial para cada teste."""
+        np.random.seed(42)
+        dates = pd.date_range(start='2023-01-01', periods=60, freq='D')
+        self.returns_data = pd.DataFrame({
+            'PETR4.SA': np.random.normal(0.001, 0.02, 60),
+            'VALE3.SA': np.random.normal(0.002, 0.03, 60)
+        }, index=dates)
+        self.portfolio = Portfolio({'PETR4.SA': 0.5, 'VALE3.SA': 0.5}, self.returns_data)
+        Portfolio.reset_fitness_stats()
+    
+    def test_fitness_repetido_usa_cache(self):
+        """Testa se chamadas repetidas não recalculam o fitness."""
+        first = self.portfolio.fitness()
+        for _ in range(4):
+            assert self.portfolio.fitness() == first
+        
+        stats = Portfolio.fitness_stats()
+        assert stats['evaluations'] == 1
+        assert stats['cache_hits'] == 4
+        assert stats['hit_rate'] == 0.8
+    
+    def test_cache_separado_por_alpha(self):
+        """Testa se níveis de confiança diferentes são avaliados separadamente."""
+        self.portfolio.fitness(alpha=0.95)
+        self.portfolio.fitness(alpha=0.99)
+        
+        assert Portfolio.fitness_stats()['evaluations'] == 2
+    
+    def test_cache_restaura_exp_return_e_cvar(self):
+        """Testa se o cache restaura ExpReturn e cvar do alpha consultado."""
+        self.portfolio.fitness(alpha=0.95)
+        cvar_95 = self.portfolio.cvar
+        self.portfolio.fitness(alpha=0.5)
+        self.portfolio.fitness(alpha=0.95)
+        
+        assert self.portfolio.cvar == cvar_95
+    
+    def test_mutacao_invalida_cache(self):
+        """Testa se a mutação descarta o fitness memoizado."""
+        self.portfolio.fitness()
+        self.portfolio.mutate(mutation_rate=1.0)
+        self.portfolio.fitness()
+        
+        assert Portfolio.fitness_stats()['evaluations'] == 2
+    
+    def test_mutacao_sem_alteracao_preserva_cache(self):
+        """Testa se uma mutação que não altera pesos mantém o cache."""
+        self.portfolio.fitness()
+        self.portfolio.mutate(mutation_rate=0.0)
+        self.portfolio.fitness()
+        
+        assert Portfolio.fitness_stats()['evaluations'] == 1
+    
+    def test_contadores_separados_por_thread(self):
+        """Testa que avaliações de outra thread (outra otimização) não entram na contagem."""
+        def evaluate_elsewhere():
+            other = Portfolio({'PETR4.SA': 0.2, 'VALE3.SA': 0.8}, self.returns_data)
+            other.fitness()
+            other.fitness()
+            counts.append(Portfolio.fitness_stats())
+        
+        counts = []
+        self.portfolio.fitness()
+        thread = threading.Thread(target=evaluate_elsewhere)
+        thread.start()
+        thread.join()
+        
+        assert counts[0]['evaluations'] == 1 and counts[0]['cache_hits'] == 1
+        assert Portfolio.fitness_stats()['evaluations'] == 1
+        assert Portfolio.fitness_stats()['cache_hits'] == 0
+    
+    def test_cache_respeita_taxa_livre_risco_atual(self):
+        """Testa se o fitness recomposto usa a taxa livre de risco atual."""
+        self.portfolio.fitness()
+        self.portfolio.risk_free_rate = 0.5
+        expected = 0.5 * self.portfolio.ExpReturn + 0.5 * self.portfolio.cvar
+        
+        assert abs(self.portfolio.fitness() - expected) < 1e-12
+
+
+class TestEvaluatePopulation:
+    """Testes para a avaliação em lote da população."""
+    
+    def setup_method(self):
+        """Configuração inicial para cada teste."""
+        np.random.seed(7)
+        dates = pd.date_range(start='2023-01-01', periods=250, freq='D')
+        self.returns_data = pd.DataFrame({
+            'PETR4.SA': np.random.normal(0.001, 0.02, 250),
+            'VALE3.SA': np.random.normal(0.002, 0.03, 250),
+            'ITUB4.SA': np.random.normal(0.0005, 0.015, 250)
+        }, index=dates)
+        base = {'PETR4.SA': 1, 'VALE3.SA': 1, 'ITUB4.SA': 1}
+        self.population = [Portfolio.random_instance(base, self.returns_data) for _ in range(20)]
+    
+    @pytest.mark.parametrize("alpha", [0.95, 0.99, 0.9])
+    def test_lote_equivale_avaliacao_individual(self, alpha):
+        """Testa se a avaliação em lote reproduz o cálculo individual."""
+        evaluate_population(self.population, alpha=alpha)
+        
+        for portfolio in self.population:
+            batched = portfolio.fitness(alpha)
+            batched_cvar = portfolio.cvar
+            portfolio.invalidate_cache()
+            assert abs(portfolio.fitness(alpha) - batched) < 1e-12
+            assert abs(portfolio.cvar - batched_cvar) < 1e-12
+    
+    def test_lote_preenche_cache(self):
+        """Testa se a avaliação em lote evita recálculos posteriores."""
+        Portfolio.reset_fitness_stats()
+        evaluate_population(self.population)
+        for portfolio in self.population:
+            portfolio.fitness()
+        
+        stats = Portfolio.fitness_stats()
+        assert stats['evaluations'] == len(self.population)
+        assert stats['cache_hits'] == len(self.population)
+    
+    def test_lote_ignora_portfolios_em_cache(self):
+        """Testa se portfólios já avaliados não são recalculados."""
+        self.population[0].fitness()
+        Portfolio.reset_fitness_stats()
+        evaluate_population(self.population)
+        
+        assert Portfolio.fitness_stats()['evaluations'] == len(self.population) - 1
+    
+    def test_lote_populacao_vazia(self):
+        """Testa avaliação em lote de população vazia."""
+        evaluate_population([])
+
+
+class TestPopulationDiversity:
+    """Testes para a medida de diversidade da população."""
+    
+    def setup_method(self):
+        """Configuração inicial para cada teste."""
+        np.random.seed(5)
+        self.universe = ReturnsUniverse.from_returns(pd.DataFrame({
+            'PETR4.SA': np.random.normal(0.001, 0.02, 100),
+            'VALE3.SA': np.random.normal(0.002, 0.03, 100)
+        }))
+    
+    def test_populacao_identica_tem_diversidade_zero(self):
+        """Testa que alocações iguais (mesmo com escalas diferentes) não têm diversidade."""
+        population = [Portfolio(np.array([1.0, 1.0]) * k, self.universe) for k in (1, 2, 5)]
+        
+        assert population_diversity(population) == pytest.approx(0.0)
+    
+    def test_distancia_media_ao_centroide(self):
+        """Testa o valor da diversidade para alocações opostas."""
+        population = [
+            Portfolio(np.array([1.0, 0.0]), self.universe),
+            Portfolio(np.array([0.0, 1.0]), self.universe)
+        ]
+        
+        assert population_diversity(population) == pytest.approx(np.sqrt(0.5))
+    
+    def test_populacao_vazia(self):
+        """Testa a diversidade de uma população vazia."""
+        assert population_diversity([]) == 0.0
+
+
+class TestPortfolioGenomaCompacto:
+    """Testes para a representação dos genes em vetor float64."""
+    
+    def setup_method(self):
+        """Configuração inicial para cada teste."""
+        np.random.seed(3)
+        dates = pd.date_range(start='2023-01-01', periods=40, freq='D')
+        self.returns_data = pd.DataFrame({
+            'PETR4.SA': np.random.normal(0.001, 0.02, 40),
+            'VALE3.SA': np.random.normal(0.002, 0.03, 40),
+            'ITUB4.SA': np.random.normal(0.0005, 0.015, 40)
+        }, index=dates)
+        self.universe = ReturnsUniverse(['VALE3.SA', 'ITUB4.SA', 'PETR4.SA'], self.returns_data)
+    
+    def test_portfolio_sem_dict_por_instancia(self):
+        """Testa se o Portfolio usa __slots__ em vez de __dict__."""
+        portfolio = Portfolio({'PETR4.SA': 1.0, 'VALE3.SA': 1.0}, self.returns_data)
+        assert not hasattr(portfolio, '__dict__')
+    
+    def test_genes_alinhados_ao_universo(self):
+        """Testa se pesos em dicionário são alinhados à ordem do universo."""
+        weights = {'PETR4.SA': 0.2, 'VALE3.SA': 0.5, 'ITUB4.SA': 0.3}
+        portfolio = Portfolio(weights, self.universe)
+        
+        np.testing.assert_array_equal(portfolio.genes, [0.5, 0.3, 0.2])
+        assert portfolio.weights == pytest.approx(weights)
+    
+    def test_fitness_alinha_retornos_por_ticker(self):
+        """Testa se o fitness independe da ordem das colunas do DataFrame."""
+        weights = {'PETR4.SA': 0.2, 'VALE3.SA': 0.5, 'ITUB4.SA': 0.3}
+        reordered = self.returns_data[['ITUB4.SA', 'PETR4.SA', 'VALE3.SA']]
+        
+        fitness_original = Portfolio(weights, self.returns_data).fitness()
+        fitness_reordered = Portfolio(weights, reordered).fitness()
+        
+        assert abs(fitness_original - fitness_reordered) < 1e-12
+    
+    def test_populacao_aleatoria_compartilha_matriz(self):
+        """Testa se a população aleatória usa linhas de uma única matriz."""
+        population = Portfolio.random_population(self.universe, 5, risk_free_rate=0.1)
+        
+        assert len(population) == 5
+        base = population[0].genes.base
+        assert base is not None
+        assert all(p.genes.base is base for p in population)
+        assert all(p.universe is self.universe for p in population)
+        assert all(p.risk_free_rate == 0.1 for p in population)
+    
+    def test_mutacao_atua_sobre_matriz_da_populacao(self):
+        """Testa se a mutação altera a linha correspondente da matriz."""
+        population = Portfolio.random_population(self.universe, 3)
+        matrix = population[0].genes.base
+        population[1].mutate(mutation_rate=1.0)
+        
+        np.testing.assert_array_equal(matrix[1], population[1].genes)
+    
+    def test_filhos_compartilham_universo(self):
+        """Testa se o crossover reaproveita o universo dos pais."""
+        population = Portfolio.random_population(self.universe, 2)
+        child1, child2 = population[0].crossover(population[1])
+        
+        assert child1.universe is self.universe
+        assert child2.universe is self.universe
+    
+    def test_populacao_reprodutivel_com_gerador(self):
+        """Testa que o mesmo gerador semeado gera a mesma população e as mesmas mutações."""
+        first = Portfolio.random_population(self.universe, 4, rng=np.random.default_rng(17))
+        second = Portfolio.random_population(self.universe, 4, rng=np.random.default_rng(17))
+        for a, b in zip(first, second):
+            a.mutate(mutation_rate=0.5)
+            b.mutate(mutation_rate=0.5)
+        
+        for a, b in zip(first, second):
+            np.testing.assert_array_equal(a.genes, b.genes)
+    
+    def test_filhos_herdam_gerador(self):
+        """Testa que os filhos do crossover usam o gerador dos pais."""
+        rng = np.random.default_rng(2)
+        population = Portfolio.random_population(self.universe, 2, rng=rng)
+        child1, child2 = population[0].crossover(population[1])
+        
+        assert child1.rng is rng
+        assert child2.rng is rng
+
+
 if __name__ == '__main__':
     # Configuração para executar os testes
     pytest.main([__file__, "-v"])
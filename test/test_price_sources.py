@@ -0,0 +1,176 @@
+"""
+Testes para o módulo price_sources.py
+
+Este módulo contém testes para as fontes de preços (Yahoo Finance,
+arquivos locais e gerador sintético) e para o seu uso pelo DataCollector.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock
+from datetime import datetime
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_sources import ERRORS_ATTR, YFinanceSource, LocalFileSource, SyntheticSource, save_snapshot
+from price_store import PriceStore
+from data_collector import DataCollector
+
+
+class TestYFinanceSource:
+    """Testes para a fonte do Yahoo Finance com download substituído."""
+    
+    def test_extrai_fechamentos_por_ticker(self):
+        """Testa a extração da coluna Close de cada ticker."""
+        dates = pd.bdate_range('2024-01-01', periods=3)
+        download = Mock(return_value=pd.DataFrame({
+            ('PETR4.SA', 'Close'): [1.0, 2.0, 3.0],
+            ('^BVSP', 'Close'): [4.0, 5.0, 6.0]
+        }, index=dates))
+        
+        result = YFinanceSource(download).fetch_closes(['PETR4.SA', '^BVSP'], datetime(2024, 1, 1), datetime(2024, 1, 5))
+        
+        assert list(result.columns) == ['PETR4.SA', '^BVSP']
+        assert download.call_args.kwargs['auto_adjust'] is True
+    
+    def test_ticker_ausente_e_omitido(self):
+        """Testa que um ticker ausente da resposta é omitido."""
+        download = Mock(return_value=pd.DataFrame({('PETR4.SA', 'Close'): [1.0]}))
+        
+        result = YFinanceSource(download).fetch_closes(['PETR4.SA', 'VALE3.SA'], datetime(2024, 1, 1), datetime(2024, 1, 5))
+        
+        assert list(result.columns) == ['PETR4.SA']
+    
+    def test_erro_por_ticker_sem_saida_padrao(self, capsys):
+        """Testa que o erro de um ticker vai para attrs, e não para a saída padrão."""
+        download = Mock(return_value=pd.DataFrame({('PETR4.SA', 'Close'): [1.0]}))
+        
+        result = YFinanceSource(download).fetch_closes(['PETR4.SA', 'VALE3.SA'], datetime(2024, 1, 1), datetime(2024, 1, 5))
+        
+        assert list(result.attrs[ERRORS_ATTR]) == ['VALE3.SA']
+        assert result.attrs[ERRORS_ATTR]['VALE3.SA'].startswith("KeyError")
+        assert capsys.readouterr().out == ""
+    
+    def test_resposta_vazia_sem_erros(self):
+        """Testa que uma resposta vazia (sem pregões) não registra erros."""
+        result = YFinanceSource(Mock(return_value=pd.DataFrame())).fetch_closes(['PETR4.SA'], datetime(2024, 1, 6), datetime(2024, 1, 8))
+        
+        assert result.empty
+        assert result.attrs.get(ERRORS_ATTR, {}) == {}
+
+
+class TestSyntheticSource:
+    """Testes para o gerador sintético de preços."""
+    
+    def test_determinismo(self):
+        """Testa que a mesma semente gera os mesmos preços."""
+        first = SyntheticSource(seed=3).fetch_closes(['PETR4.SA'], datetime(2024, 1, 1), datetime(2024, 3, 1))
+        second = SyntheticSource(seed=3).fetch_closes(['PETR4.SA'], datetime(2024, 1, 1), datetime(2024, 3, 1))
+        
+        pd.testing.assert_frame_equal(first, second)
+    
+    def test_preco_independe_do_intervalo_e_do_conjunto(self):
+        """Testa que um pregão tem o mesmo preço em pedidos diferentes."""
+        source = SyntheticSource(seed=1)
+        wide = source.fetch_closes(['PETR4.SA', 'VALE3.SA'], datetime(2023, 1, 1), datetime(2024, 3, 1))
+        narrow = source.fetch_closes(['VALE3.SA'], datetime(2024, 2, 1), datetime(2024, 2, 10))
+        
+        pd.testing.assert_series_equal(narrow['VALE3.SA'], wide['VALE3.SA'].loc[narrow.index])
+    
+    def test_sementes_e_tickers_diferentes(self):
+        """Testa que sementes e tickers diferentes geram trajetórias diferentes."""
+        start, end = datetime(2024, 1, 1), datetime(2024, 2, 1)
+        a = SyntheticSource(seed=1).fetch_closes(['PETR4.SA', 'VALE3.SA'], start, end)
+        b = SyntheticSource(seed=2).fetch_closes(['PETR4.SA'], start, end)
+        
+        assert not np.allclose(a['PETR4.SA'], a['VALE3.SA'])
+        assert not np.allclose(a['PETR4.SA'], b['PETR4.SA'])
+    
+    def test_intervalo_em_dias_uteis(self):
+        """Testa que apenas dias úteis do intervalo [start, end) são gerados."""
+        result = SyntheticSource().fetch_closes(['PETR4.SA'], datetime(2024, 1, 1), datetime(2024, 1, 8))
+        
+        assert list(result.index) == list(pd.bdate_range('2024-01-01', '2024-01-05'))
+        assert (result['PETR4.SA'] > 0).all()
+    
+    def test_intervalo_vazio(self):
+        """Testa um intervalo sem dias úteis."""
+        result = SyntheticSource().fetch_closes(['PETR4.SA'], datetime(2024, 1, 6), datetime(2024, 1, 6))
+        
+        assert result.empty
+
+
+class TestLocalFileSource:
+    """Testes para a fonte de arquivos locais."""
+    
+    def setup_method(self):
+        self.start = datetime(2024, 1, 1)
+        self.end = datetime(2024, 3, 1)
+        self.closes = SyntheticSource(seed=5).fetch_closes(['PETR4.SA', '^BVSP'], self.start, self.end)
+    
+    def test_le_snapshot_csv(self, tmp_path):
+        """Testa a leitura de um snapshot gravado em CSV."""
+        save_snapshot(self.closes, str(tmp_path))
+        
+        result = LocalFileSource(str(tmp_path)).fetch_closes(['PETR4.SA', '^BVSP'], self.start, self.end)
+        
+        pd.testing.assert_frame_equal(result, self.closes, check_freq=False, check_names=False)
+    
+    def test_filtra_intervalo_e_omite_ausentes(self, tmp_path):
+        """Testa o recorte do intervalo e a omissão de tickers sem arquivo."""
+        save_snapshot(self.closes, str(tmp_path))
+        
+        result = LocalFileSource(str(tmp_path)).fetch_closes(
+            ['PETR4.SA', 'AUSENTE.SA'], datetime(2024, 2, 1), datetime(2024, 2, 8)
+        )
+        
+        assert list(result.columns) == ['PETR4.SA']
+        assert result.index.min() >= pd.Timestamp('2024-02-01')
+        assert result.index.max() < pd.Timestamp('2024-02-08')
+    
+    def test_diretorio_inexistente(self, tmp_path):
+        """Testa que um diretório inexistente gera FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            LocalFileSource(str(tmp_path / "inexistente"))
+    
+    def test_formato_invalido(self, tmp_path):
+        """Testa que um formato de snapshot desconhecido gera ValueError."""
+        with pytest.raises(ValueError):
+            save_snapshot(self.closes, str(tmp_path), file_format='xlsx')
+
+
+class TestDataCollectorComFonte:
+    """Testes para o DataCollector com fontes de preços substituídas."""
+    
+    def setup_method(self):
+        self.start = datetime(2024, 1, 1)
+        self.end = datetime(2024, 3, 1)
+    
+    def test_fonte_sintetica_sem_rede(self):
+        """Testa a coleta de retornos a partir da fonte sintética."""
+        collector = DataCollector(["PETR4", "VALE3"], start=self.start, end=self.end, source=SyntheticSource())
+        
+        result = collector.download_data()
+        
+        assert list(result.columns) == ['PETR4.SA', 'VALE3.SA', '^BVSP']
+        assert not result.isna().any().any()
+    
+    def test_fonte_local_com_armazem(self, tmp_path):
+        """Testa a coleta a partir de um snapshot local gravando no armazém."""
+        closes = SyntheticSource(seed=2).fetch_closes(['PETR4.SA', '^BVSP'], self.start, self.end)
+        save_snapshot(closes, str(tmp_path / "snapshot"))
+        store = PriceStore(str(tmp_path / "store"))
+        
+        collector = DataCollector(
+            ["PETR4"], start=self.start, end=self.end,
+            store=store, source=LocalFileSource(str(tmp_path / "snapshot"))
+        )
+        result = collector.download_data()
+        
+        expected = closes.pct_change().dropna()
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+        assert store.covers('PETR4.SA', self.start, self.end)
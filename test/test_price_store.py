@@ -0,0 +1,246 @@
+"""
+Testes para o módulo price_store.py
+
+Este módulo contém testes para o armazém local de preços: gravação,
+leitura por intervalo, manifesto de cobertura e persistência entre
+instâncias.
+"""
+
+import pytest
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from threading import Thread
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_store import PriceStore
+
+
+def make_closes(start, periods, first=100.0):
+    dates = pd.bdate_range(start=start, periods=periods)
+    return pd.Series(first + np.arange(periods, dtype=float), index=dates)
+
+
+class TestPriceStoreWrite:
+    """Testes para a gravação de séries no armazém."""
+    
+    def test_grava_e_le_serie(self, tmp_path):
+        """Testa que a série gravada é lida de volta sem alterações."""
+        store = PriceStore(str(tmp_path))
+        closes = make_closes('2024-01-01', 10)
+        
+        store.write('PETR4.SA', closes, datetime(2024, 1, 1), datetime(2024, 1, 20))
+        result = store.read('PETR4.SA')
+        
+        np.testing.assert_array_equal(result.to_numpy(), closes.to_numpy())
+        assert list(result.index) == list(closes.index)
+        assert result.name == 'PETR4.SA'
+    
+    def test_manifesto_registra_cobertura(self, tmp_path):
+        """Testa que o manifesto guarda o intervalo pedido, não só os pregões."""
+        store = PriceStore(str(tmp_path))
+        store.write('PETR4.SA', make_closes('2024-01-02', 5), datetime(2024, 1, 1), datetime(2024, 1, 10))
+        
+        with open(tmp_path / PriceStore.MANIFEST, encoding='utf-8') as file:
+            manifest = json.load(file)
+        
+        entry = manifest['tickers']['PETR4.SA']
+        assert entry['start'] == '2024-01-01'
+        assert entry['end'] == '2024-01-10'
+        assert entry['rows'] == 5
+    
+    def test_uniao_de_intervalos_sobrepostos(self, tmp_path):
+        """Testa que intervalos sobrepostos são unidos na mesma série."""
+        store = PriceStore(str(tmp_path))
+        store.write('VALE3.SA', make_closes('2024-01-01', 10), datetime(2024, 1, 1), datetime(2024, 1, 13))
+        store.write('VALE3.SA', make_closes('2024-01-10', 10, first=200.0), datetime(2024, 1, 10), datetime(2024, 1, 24))
+        
+        result = store.read('VALE3.SA')
+        
+        assert store.coverage('VALE3.SA') == (pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-24'))
+        assert result.index.is_monotonic_increasing
+        assert not result.index.has_duplicates
+        assert result[pd.Timestamp('2024-01-10')] == 200.0
+    
+    def test_intervalo_disjunto_substitui(self, tmp_path):
+        """Testa que um intervalo sem contato com o anterior o substitui."""
+        store = PriceStore(str(tmp_path))
+        store.write('ITUB4.SA', make_closes('2023-01-02', 5), datetime(2023, 1, 1), datetime(2023, 1, 10))
+        store.write('ITUB4.SA', make_closes('2024-01-01', 5), datetime(2024, 1, 1), datetime(2024, 1, 10))
+        
+        assert store.coverage('ITUB4.SA') == (pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-10'))
+        assert len(store.read('ITUB4.SA')) == 5
+    
+    def test_serie_vazia(self, tmp_path):
+        """Testa a gravação de um ticker sem pregões no intervalo."""
+        store = PriceStore(str(tmp_path))
+        store.write('BBDC4.SA', pd.Series(dtype=float), datetime(2024, 1, 1), datetime(2024, 1, 5))
+        
+        assert store.covers('BBDC4.SA', datetime(2024, 1, 1), datetime(2024, 1, 5))
+        assert store.read('BBDC4.SA').empty
+
+
+class TestPriceStoreRead:
+    """Testes para a leitura e a cobertura do armazém."""
+    
+    def setup_method(self):
+        self.start = datetime(2024, 1, 1)
+        self.end = datetime(2024, 2, 1)
+    
+    def test_leitura_por_intervalo(self, tmp_path):
+        """Testa que a leitura respeita início inclusivo e fim exclusivo."""
+        store = PriceStore(str(tmp_path))
+        store.write('PETR4.SA', make_closes('2024-01-01', 20), self.start, self.end)
+        
+        result = store.read('PETR4.SA', datetime(2024, 1, 3), datetime(2024, 1, 5))
+        
+        assert list(result.index) == [pd.Timestamp('2024-01-03'), pd.Timestamp('2024-01-04')]
+    
+    def test_cobertura(self, tmp_path):
+        """Testa a verificação de cobertura de um intervalo."""
+        store = PriceStore(str(tmp_path))
+        store.write('PETR4.SA', make_closes('2024-01-01', 20), self.start, self.end)
+        
+        assert store.covers('PETR4.SA', datetime(2024, 1, 5), datetime(2024, 1, 20))
+        assert not store.covers('PETR4.SA', datetime(2023, 12, 1), datetime(2024, 1, 20))
+        assert not store.covers('PETR4.SA', datetime(2024, 1, 5), datetime(2024, 3, 1))
+        assert not store.covers('VALE3.SA', self.start, self.end)
+    
+    def test_leitura_de_varios_tickers(self, tmp_path):
+        """Testa o alinhamento por data na leitura de vários tickers."""
+        store = PriceStore(str(tmp_path))
+        store.write('PETR4.SA', make_closes('2024-01-01', 10), self.start, self.end)
+        store.write('VALE3.SA', make_closes('2024-01-02', 10), self.start, self.end)
+        
+        result = store.read_many(['PETR4.SA', 'VALE3.SA', 'AUSENTE.SA'], self.start, self.end)
+        
+        assert list(result.columns) == ['PETR4.SA', 'VALE3.SA']
+        assert len(result) == 11
+        assert result['VALE3.SA'].isna().sum() == 1
+    
+    def test_ticker_ausente(self, tmp_path):
+        """Testa que ler um ticker ausente gera KeyError."""
+        store = PriceStore(str(tmp_path))
+        
+        with pytest.raises(KeyError):
+            store.read('AUSENTE.SA')
+    
+    def test_persistencia_entre_instancias(self, tmp_path):
+        """Testa que uma nova instância enxerga os dados gravados."""
+        PriceStore(str(tmp_path)).write('PETR4.SA', make_closes('2024-01-01', 10), self.start, self.end)
+        
+        store = PriceStore(str(tmp_path))
+        
+        assert 'PETR4.SA' in store
+        assert store.tickers == ('PETR4.SA',)
+        assert len(store.read('PETR4.SA')) == 10
+
+
+class TestPriceStoreMissingRanges:
+    """Testes para o cálculo dos trechos ausentes."""
+    
+    def setup_method(self):
+        self.start = datetime(2024, 1, 10)
+        self.end = datetime(2024, 2, 1)
+    
+    def make_store(self, tmp_path):
+        store = PriceStore(str(tmp_path))
+        store.write('PETR4.SA', make_closes('2024-01-10', 15), self.start, self.end)
+        return store
+    
+    def test_ticker_ausente_pede_intervalo_inteiro(self, tmp_path):
+        """Testa que um ticker sem dados precisa do intervalo inteiro."""
+        store = PriceStore(str(tmp_path))
+        
+        assert store.missing_ranges('VALE3.SA', self.start, self.end) == [
+            (pd.Timestamp('2024-01-10'), pd.Timestamp('2024-02-01'))
+        ]
+    
+    def test_intervalo_coberto_nao_pede_nada(self, tmp_path):
+        """Testa que um intervalo já coberto não gera trechos."""
+        store = self.make_store(tmp_path)
+        
+        assert store.missing_ranges('PETR4.SA', datetime(2024, 1, 15), datetime(2024, 1, 20)) == []
+    
+    def test_trechos_de_inicio_e_fim(self, tmp_path):
+        """Testa que apenas o início e o fim ausentes são pedidos."""
+        store = self.make_store(tmp_path)
+        
+        ranges = store.missing_ranges('PETR4.SA', datetime(2024, 1, 1), datetime(2024, 2, 3))
+        
+        assert ranges == [
+            (pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-10')),
+            (pd.Timestamp('2024-02-01'), pd.Timestamp('2024-02-03'))
+        ]
+    
+    def test_pedido_sem_contato_estende_ate_a_cobertura(self, tmp_path):
+        """Testa que um pedido posterior à cobertura mantém a série contínua."""
+        store = self.make_store(tmp_path)
+        
+        ranges = store.missing_ranges('PETR4.SA', datetime(2024, 3, 1), datetime(2024, 3, 10))
+        
+        assert ranges == [(pd.Timestamp('2024-02-01'), pd.Timestamp('2024-03-10'))]
+    
+    def test_trecho_gravado_estende_cobertura(self, tmp_path):
+        """Testa que gravar o trecho ausente completa a cobertura."""
+        store = self.make_store(tmp_path)
+        (tail_start, tail_end), = store.missing_ranges('PETR4.SA', self.start, datetime(2024, 2, 6))
+        
+        store.write('PETR4.SA', make_closes('2024-02-01', 3), tail_start, tail_end)
+        
+        assert store.covers('PETR4.SA', self.start, datetime(2024, 2, 6))
+        assert len(store.read('PETR4.SA')) == 18
+
+
+class TestPriceStoreManifest:
+    """Testes para o manifesto compartilhado entre instâncias."""
+    
+    def setup_method(self):
+        self.start = datetime(2024, 1, 1)
+        self.end = datetime(2024, 2, 1)
+    
+    def test_instancias_nao_descartam_gravacoes_uma_da_outra(self, tmp_path):
+        """Testa que uma instância antiga une sua gravação à das outras."""
+        first = PriceStore(str(tmp_path))
+        second = PriceStore(str(tmp_path))
+        
+        first.write('PETR4.SA', make_closes('2024-01-01', 10), self.start, self.end)
+        second.write('VALE3.SA', make_closes('2024-01-01', 5), self.start, self.end)
+        
+        assert PriceStore(str(tmp_path)).tickers == ('PETR4.SA', 'VALE3.SA')
+        assert len(second.read('PETR4.SA')) == 10
+    
+    def test_regravacao_preserva_mapeamento_aberto(self, tmp_path):
+        """Testa que um leitor com o arquivo mapeado continua vendo a versão anterior inteira."""
+        store = PriceStore(str(tmp_path))
+        store.write('PETR4.SA', make_closes('2024-01-01', 10), self.start, self.end)
+        mapped = store._records('PETR4.SA')
+        
+        store.write('PETR4.SA', make_closes('2024-01-01', 3, first=50.0), self.start, datetime(2024, 1, 4))
+        
+        assert len(mapped) == 10
+        assert mapped['close'][0] == 100.0
+        assert store.read('PETR4.SA').iloc[0] == 50.0
+    
+    def test_gravacoes_concorrentes(self, tmp_path):
+        """Testa gravações simultâneas de instâncias no mesmo diretório."""
+        tickers = [f'ATIVO{i}.SA' for i in range(8)]
+        stores = [PriceStore(str(tmp_path)) for _ in tickers]
+        threads = [
+            Thread(target=store.write, args=(ticker, make_closes('2024-01-01', 10), self.start, self.end))
+            for store, ticker in zip(stores, tickers)
+        ]
+        
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert PriceStore(str(tmp_path)).tickers == tuple(sorted(tickers))
+        assert sorted(os.listdir(tmp_path)) == sorted([PriceStore.MANIFEST] + [f'{t}.npy' for t in tickers])
+
@@ -0,0 +1,109 @@
+"""
+Testes para o módulo result_cache.py
+
+Este módulo contém testes para o cache de resultados de otimização em
+memória (LRU) e em disco.
+"""
+
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import result_cache
+from result_cache import ResultCache, make_key
+
+
+PARAMS = {'population_size': 50, 'max_generations': 30, 'mutation_rate': 0.15}
+
+
+class TestMakeKey:
+    """Testes para a chave de cache das otimizações."""
+    
+    def test_ordem_dos_tickers_e_dos_parametros(self):
+        """Testa que a ordem dos tickers e dos parâmetros não altera a chave."""
+        first = make_key('abc', ['VALE3.SA', 'PETR4.SA'], PARAMS, seed=1)
+        second = make_key('abc', ['PETR4.SA', 'VALE3.SA'], dict(reversed(list(PARAMS.items()))), seed=1)
+        
+        assert first == second
+    
+    def test_componentes_da_chave(self):
+        """Testa que dados, tickers, parâmetros e semente diferenciam a chave."""
+        keys = {
+            make_key('abc', ['PETR4.SA'], PARAMS, seed=1),
+            make_key('abd', ['PETR4.SA'], PARAMS, seed=1),
+            make_key('abc', ['VALE3.SA'], PARAMS, seed=1),
+            make_key('abc', ['PETR4.SA'], {**PARAMS, 'mutation_rate': 0.2}, seed=1),
+            make_key('abc', ['PETR4.SA'], PARAMS, seed=2)
+        }
+        
+        assert len(keys) == 5
+    
+    def test_versao_diferencia_a_chave(self, monkeypatch):
+        """Testa que mudar a versão do cache invalida as chaves antigas."""
+        current = make_key('abc', ['PETR4.SA'], PARAMS, seed=1)
+        monkeypatch.setattr(result_cache, 'CACHE_VERSION', result_cache.CACHE_VERSION + 1)
+        
+        assert make_key('abc', ['PETR4.SA'], PARAMS, seed=1) != current
+
+
+class TestResultCache:
+    """Testes para o armazenamento dos resultados."""
+    
+    def test_memoria_lru(self):
+        """Testa o descarte do resultado menos usado recentemente."""
+        cache = ResultCache(capacity=2, directory=None)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (3, 1)
+    
+    def test_persistencia_em_disco(self, tmp_path):
+        """Testa que um novo cache lê os resultados gravados por outro."""
+        result = {'pesos': pd.Series({'PETR4': 0.6, 'VALE3': 0.4}), 'fitness': 1.5}
+        ResultCache(directory=str(tmp_path)).put('chave', result)
+        
+        cache = ResultCache(directory=str(tmp_path))
+        loaded = cache.get('chave')
+        
+        assert 'chave' in cache
+        assert loaded['fitness'] == 1.5
+        pd.testing.assert_series_equal(loaded['pesos'], result['pesos'])
+        assert len(cache) == 1
+    
+    def test_descartado_da_memoria_continua_em_disco(self, tmp_path):
+        """Testa que o resultado descartado da memória ainda é lido do disco."""
+        cache = ResultCache(capacity=1, directory=str(tmp_path))
+        cache.put('a', 1)
+        cache.put('b', 2)
+        
+        assert cache.get('a') == 1
+    
+    def test_arquivo_corrompido_e_ignorado(self, tmp_path):
+        """Testa que um arquivo truncado é tratado como ausente."""
+        (tmp_path / "chave.pkl").write_bytes(b"\x80\x05truncado")
+        
+        assert ResultCache(directory=str(tmp_path)).get('chave', 'ausente') == 'ausente'
+    
+    def test_limpar(self, tmp_path):
+        """Testa a remoção dos resultados da memória e do disco."""
+        cache = ResultCache(directory=str(tmp_path))
+        cache.put('a', 1)
+        cache.clear()
+        
+        assert 'a' not in cache
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_capacidade_invalida(self):
+        """Testa que a capacidade deve ser positiva."""
+        with pytest.raises(ValueError):
+            ResultCache(capacity=0, directory=None)
@@ -0,0 +1,142 @@
+"""
+Testes para o módulo selection.py
+
+Este módulo contém testes para os operadores de seleção sobre o vetor de
+fitness: torneio, roleta (amostragem universal estocástica), ranking
+linear, truncamento e a escolha parcial dos k melhores.
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selection import top_k, tournament_selection, roulette_selection, rank_selection, truncation_selection
+
+
+class TestTopK:
+    """Testes para a escolha dos k melhores."""
+    
+    def test_melhores_em_ordem_decrescente(self):
+        """Testa que os índices saem do maior para o menor fitness."""
+        fitness = np.array([0.3, -1.0, 2.5, 0.9, 1.7])
+        
+        assert top_k(fitness, 3).tolist() == [2, 4, 3]
+    
+    def test_igual_a_ordenacao_completa(self):
+        """Testa contra a ordenação completa em um vetor aleatório."""
+        fitness = np.random.default_rng(0).normal(size=500)
+        
+        assert top_k(fitness, 50).tolist() == np.argsort(-fitness)[:50].tolist()
+    
+    def test_limites(self):
+        """Testa k nulo e k maior que a população."""
+        fitness = np.array([1.0, 2.0])
+        
+        assert top_k(fitness, 0).size == 0
+        assert top_k(fitness, 5).tolist() == [1, 0]
+
+
+class TestSelectionOperators:
+    """Testes comuns aos operadores de seleção de pais."""
+    
+    OPERATORS = [
+        lambda f, n, rng: tournament_selection(f, n, 3, rng),
+        roulette_selection,
+        rank_selection,
+        truncation_selection
+    ]
+    
+    @pytest.mark.parametrize("operator", OPERATORS)
+    def test_formato_e_indices_validos(self, operator):
+        """Testa o formato (K x 2) e os índices dentro da população."""
+        fitness = np.random.default_rng(1).normal(size=9)
+        
+        parents = operator(fitness, 5, np.random.default_rng(2))
+        
+        assert parents.shape == (5, 2)
+        assert parents.min() >= 0 and parents.max() < 9
+    
+    @pytest.mark.parametrize("operator", OPERATORS)
+    def test_favorece_maior_fitness(self, operator):
+        """Testa que o melhor indivíduo é escolhido mais vezes que o pior."""
+        fitness = np.linspace(-1.0, 1.0, 10)
+        
+        counts = np.bincount(operator(fitness, 2000, np.random.default_rng(3)).ravel(), minlength=10)
+        
+        assert counts[9] > counts[0]
+    
+    @pytest.mark.parametrize("operator", OPERATORS)
+    def test_populacao_unitaria(self, operator):
+        """Testa que um único indivíduo forma todos os pares."""
+        parents = operator(np.array([0.5]), 3, np.random.default_rng(4))
+        
+        assert (parents == 0).all()
+
+
+class TestTournament:
+    """Testes para a seleção por torneio."""
+    
+    def test_muitos_competidores_escolhem_os_melhores(self):
+        """Testa que, com muitos competidores, os pais são os dois melhores."""
+        fitness = np.arange(10, dtype=np.float64)
+        
+        parents = tournament_selection(fitness, 20, 200, np.random.default_rng(9))
+        
+        assert (parents[:, 0] == 9).all()
+        assert (fitness[parents[:, 1]] >= 8).all()
+    
+    def test_primeiro_pai_e_o_vencedor(self):
+        """Testa que o primeiro pai de cada par tem fitness maior ou igual ao do segundo."""
+        fitness = np.random.default_rng(10).normal(size=12)
+        
+        parents = tournament_selection(fitness, 50, 4, np.random.default_rng(11))
+        
+        assert (fitness[parents[:, 0]] >= fitness[parents[:, 1]]).all()
+    
+    def test_competidor_unico_e_os_dois_pais(self):
+        """Testa que, com um único competidor, ele é usado como os dois pais."""
+        parents = tournament_selection(np.arange(10, dtype=np.float64), 20, 1, np.random.default_rng(12))
+        
+        assert (parents[:, 0] == parents[:, 1]).all()
+
+
+class TestRoulette:
+    """Testes para a roleta com amostragem universal estocástica."""
+    
+    def test_contagens_proporcionais(self):
+        """Testa que cada indivíduo recebe o piso ou o teto da sua cota esperada."""
+        fitness = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+        
+        counts = np.bincount(roulette_selection(fitness, 50, np.random.default_rng(5)).ravel(), minlength=5)
+        expected = 100 * fitness / fitness.sum()
+        
+        assert (np.abs(counts - expected) < 1).all()
+    
+    def test_fitness_iguais_e_negativos(self):
+        """Testa a roleta uniforme quando todos têm o mesmo fitness negativo."""
+        counts = np.bincount(roulette_selection(np.full(4, -2.0), 20, np.random.default_rng(6)).ravel(), minlength=4)
+        
+        assert counts.tolist() == [10, 10, 10, 10]
+
+
+class TestRankAndTruncation:
+    """Testes para o ranking linear e o truncamento."""
+    
+    def test_ranking_ignora_escala(self):
+        """Testa que o ranking depende apenas da ordem do fitness."""
+        small = rank_selection(np.array([1.0, 2.0, 3.0]), 20, np.random.default_rng(7))
+        large = rank_selection(np.array([1.0, 2.0, 3000.0]), 20, np.random.default_rng(7))
+        
+        assert (small == large).all()
+    
+    def test_truncamento_apenas_metade_superior(self):
+        """Testa que apenas a metade de maior fitness é escolhida."""
+        fitness = np.array([5.0, 1.0, 4.0, 0.0, 3.0, 2.0])
+        
+        parents = truncation_selection(fitness, 100, np.random.default_rng(8))
+        
+        assert set(parents.ravel().tolist()) == {0, 2, 4}
@@ -0,0 +1,123 @@
+"""
+Testes para o módulo tail_risk.py
+
+Este módulo contém testes para os estimadores de VaR e CVaR baseados em
+partição, comparando-os com o cálculo por percentil e máscara.
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tail_risk import tail_size, var_cvar, var_cvar_batch
+
+
+def percentile_reference(returns, alpha):
+    """
+    Cálculo de referência com ordenação completa e máscara booleana.
+    
+    Quando a posição do percentil é inteira, ``np.percentile`` pode cair
+    alguns ulps abaixo da observação correspondente; a máscara tolera essa
+    diferença para que a observação continue na cauda.
+    """
+    var = np.percentile(returns, (1 - alpha) * 100)
+    return var, returns[returns <= var + 1e-15].mean()
+
+
+class TestTailSize:
+
+    def test_tamanho_cauda_basico(self):
+        # 5% de 101 observações: percentil na posição 5 -> 6 observações
+        assert tail_size(101, 0.95) == 6
+    
+    def test_tamanho_cauda_minimo(self):
+        assert tail_size(10, 1.0) == 1
+        assert tail_size(1, 0.95) == 1
+    
+    def test_tamanho_cauda_sem_erro_de_arredondamento(self):
+        # (1 - 0.9) * 100 = 9.999999999999998: a posição exata é 10
+        assert tail_size(101, 0.9) == 11
+    
+    def test_tamanho_cauda_completo(self):
+        assert tail_size(10, 0.0) == 10
+    
+    def test_serie_vazia_gera_erro(self):
+        with pytest.raises(ValueError):
+            tail_size(0, 0.95)
+    
+    def test_alpha_invalido_gera_erro(self):
+        with pytest.raises(ValueError):
+            tail_size(10, 1.5)
+
+
+class TestVarCvar:
+
+    def setup_method(self):
+        self.rng = np.random.default_rng(42)
+    
+    @pytest.mark.parametrize("n_obs", [1, 2, 20, 99, 100, 2520])
+    @pytest.mark.parametrize("alpha", [0.9, 0.95, 0.99])
+    def test_equivale_percentil(self, n_obs, alpha):
+        returns = self.rng.normal(0.001, 0.02, n_obs)
+        
+        var, cvar = var_cvar(returns, alpha)
+        expected_var, expected_cvar = percentile_reference(returns, alpha)
+        
+        assert var == pytest.approx(expected_var, abs=1e-15)
+        assert cvar == pytest.approx(expected_cvar, abs=1e-15)
+    
+    @pytest.mark.parametrize("alpha", [0.9, 0.95, 0.99])
+    def test_equivale_percentil_para_todo_tamanho(self, alpha):
+        """Percorre os tamanhos de série em que 1 - alpha não é exato."""
+        for n_obs in range(1, 3000):
+            returns = self.rng.normal(0.001, 0.02, n_obs)
+            
+            var, cvar = var_cvar(returns, alpha)
+            expected_var, expected_cvar = percentile_reference(returns, alpha)
+            
+            assert var == pytest.approx(expected_var, abs=1e-15), n_obs
+            assert cvar == pytest.approx(expected_cvar, abs=1e-15), n_obs
+    
+    def test_cvar_menor_ou_igual_var(self):
+        returns = self.rng.normal(0, 0.02, 500)
+        var, cvar = var_cvar(returns, 0.95)
+        
+        assert cvar <= var
+    
+    def test_retornos_constantes(self):
+        var, cvar = var_cvar(np.full(10, 0.015), 0.95)
+        
+        assert var == pytest.approx(0.015)
+        assert cvar == pytest.approx(0.015)
+    
+    def test_nao_altera_entrada(self):
+        returns = self.rng.normal(0, 0.02, 50)
+        original = returns.copy()
+        var_cvar(returns, 0.95)
+        
+        np.testing.assert_array_equal(returns, original)
+
+
+class TestVarCvarBatch:
+
+    def test_lote_equivale_series_individuais(self):
+        rng = np.random.default_rng(1)
+        matrix = rng.normal(0.001, 0.02, (750, 30))
+        
+        var, cvar = var_cvar_batch(matrix, 0.95)
+        
+        assert var.shape == (30,)
+        assert cvar.shape == (30,)
+        for column in range(30):
+            expected_var, expected_cvar = percentile_reference(matrix[:, column], 0.95)
+            assert var[column] == pytest.approx(expected_var, abs=1e-15)
+            assert cvar[column] == pytest.approx(expected_cvar, abs=1e-15)
+
+
+if __name__ == '__main__':
+    # Configuração para executar os testes
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+"""
+Testes para o módulo universe.py
+
+Este módulo contém testes para a classe ReturnsUniverse, verificando o
+alinhamento dos tickers e as estatísticas pré-calculadas dos ativos.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from universe import ReturnsUniverse
+
+
+class TestReturnsUniverse:
+    """Testes para construção e estatísticas do universo."""
+    
+    def setup_method(self):
+        """Configuração inicial para cada teste."""
+        np.random.seed(11)
+        dates = pd.date_range(start='2023-01-01', periods=80, freq='D')
+        self.returns_data = pd.DataFrame({
+            'PETR4.SA': np.random.normal(0.001, 0.02, 80),
+            'VALE3.SA': np.random.normal(0.002, 0.03, 80),
+            'ITUB4.SA': np.random.normal(0.0005, 0.015, 80),
+            '^BVSP': np.random.normal(0.0005, 0.015, 80)
+        }, index=dates)
+    
+    def test_from_returns_descarta_benchmark(self):
+        """Testa se o benchmark é removido do universo."""
+        universe = ReturnsUniverse.from_returns(self.returns_data, benchmark='^BVSP')
+        
+        assert universe.tickers == ('PETR4.SA', 'VALE3.SA', 'ITUB4.SA')
+        assert universe.size == 3
+        assert list(universe.columns) == list(universe.tickers)
+    
+    def test_matriz_contigua_float64_alinhada(self):
+        """Testa se a matriz segue a ordem dos tickers e é contígua."""
+        tickers = ['ITUB4.SA', 'PETR4.SA']
+        universe = ReturnsUniverse.from_returns(self.returns_data, tickers=tickers)
+        
+        assert universe.matrix.dtype == np.float64
+        assert universe.matrix.flags['C_CONTIGUOUS']
+        np.testing.assert_array_equal(universe.matrix, self.returns_data[tickers].to_numpy())
+        assert universe.index == {'ITUB4.SA': 0, 'PETR4.SA': 1}
+    
+    def test_estatisticas_pre_calculadas(self):
+        """Testa média e covariância dos ativos."""
+        universe = ReturnsUniverse.from_returns(self.returns_data, benchmark='^BVSP')
+        expected = self.returns_data[list(universe.tickers)]
+        
+        np.testing.assert_allclose(universe.mean, expected.mean().to_numpy())
+        np.testing.assert_allclose(universe.cov, expected.cov().to_numpy())
+        assert universe.cov is universe.cov
+    
+    def test_ticker_inexistente_gera_erro(self):
+        """Testa se tickers sem dados levantam KeyError."""
+        with pytest.raises(KeyError):
+            ReturnsUniverse(['XXXX3.SA'], self.returns_data)
+    
+    def test_to_array_segue_ordem_do_universo(self):
+        """Testa conversão de dicionário de pesos para vetor."""
+        universe = ReturnsUniverse(['VALE3.SA', 'PETR4.SA'], self.returns_data)
+        
+        np.testing.assert_array_equal(universe.to_array({'PETR4.SA': 0.3, 'VALE3.SA': 0.7}), [0.7, 0.3])
+
+
+if __name__ == '__main__':
+    # Configuração para executar os testes
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,202 @@
+"""
+Testes para o módulo vectorized_operators.py
+
+Este módulo contém testes para os operadores genéticos vetorizados
+(torneio, cruzamento por máscara e mutação matricial) e para o
+VectorizedGeneticAlgorithm.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Adiciona o diretório pai ao path para importar os módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from universe import ReturnsUniverse
+from portfolio import Portfolio
+from selection import tournament_selection
+from vectorized_operators import blend_crossover, mutate_matrix, VectorizedGeneticAlgorithm
+
+
+def make_universe(n_assets=6, n_obs=200):
+    np.random.seed(21)
+    returns_data = pd.DataFrame(
+        np.random.normal(0.001, 0.02, (n_obs, n_assets)),
+        columns=[f'ATIVO{i}.SA' for i in range(n_assets)]
+    )
+    return ReturnsUniverse.from_returns(returns_data)
+
+
+class TestTournamentSelection:
+    """Testes para a seleção por torneio vetorizada."""
+    
+    def test_formato_dos_pares(self):
+        """Testa que são retornados n_pairs pares de índices válidos."""
+        rng = np.random.default_rng(0)
+        fitness = np.arange(10, dtype=float)
+        
+        parents = tournament_selection(fitness, 7, 3, rng)
+        
+        assert parents.shape == (7, 2)
+        assert parents.min() >= 0 and parents.max() < 10
+    
+    def test_vencedores_sao_os_melhores_do_torneio(self):
+        """Testa que com todos competindo os pais são sempre os dois melhores sorteados."""
+        rng = np.random.default_rng(1)
+        fitness = np.array([0.1, 0.9, 0.5, 0.7])
+        
+        parents = tournament_selection(fitness, 50, 200, rng)
+        
+        assert np.all(parents[:, 0] == 1)
+        assert np.all(np.isin(parents[:, 1], [1, 3]))
+    
+    def test_competidor_unico(self):
+        """Testa que com um único competidor ele é usado como os dois pais."""
+        rng = np.random.default_rng(2)
+        
+        parents = tournament_selection(np.ones(5), 4, 1, rng)
+        
+        assert parents.shape == (4, 2)
+        assert np.all(parents[:, 0] == parents[:, 1])
+
+
+class TestBlendCrossover:
+    """Testes para o cruzamento por máscara."""
+    
+    def test_sem_cruzamento_copia_os_pais(self):
+        """Testa que com taxa zero os filhos são cópias dos pais."""
+        rng = np.random.default_rng(3)
+        a = np.zeros((3, 4))
+        b = np.ones((3, 4))
+        
+        children = blend_crossover(a, b, 0.0, rng)
+        
+        np.testing.assert_array_equal(children[0::2], a)
+        np.testing.assert_array_equal(children[1::2], b)
+    
+    def test_filhos_sao_complementares(self):
+        """Testa que cada gene vem de um pai e o irmão recebe o outro."""
+        rng = np.random.default_rng(4)
+        a = np.zeros((20, 8))
+        b = np.ones((20, 8))
+        
+        children = blend_crossover(a, b, 1.0, rng)
+        
+        np.testing.assert_array_equal(children[0::2] + children[1::2], 1.0)
+        assert 0 < children[0::2].mean() < 1
+
+
+class TestMutateMatrix:
+    """Testes para a mutação matricial."""
+    
+    def test_sem_mutacao_mantem_a_matriz(self):
+        """Testa que com taxa zero nenhuma linha é alterada."""
+        rng = np.random.default_rng(5)
+        genes = np.full((4, 3), 1 / 3)
+        original = genes.copy()
+        
+        changed = mutate_matrix(genes, 0.0, 0.5, 0.1, rng)
+        
+        assert not changed.any()
+        np.testing.assert_array_equal(genes, original)
+    
+    @pytest.mark.parametrize("gaussian", [False, True])
+    def test_linhas_alteradas_sao_validas(self, gaussian):
+        """Testa que as linhas alteradas ficam não negativas e somam 1."""
+        rng = np.random.default_rng(6)
+        genes = rng.random((50, 5))
+        
+        changed = mutate_matrix(genes, 1.0, 0.5, 0.3, rng, gaussian=gaussian)
+        
+        assert changed.any()
+        assert np.all(genes >= 0)
+        np.testing.assert_allclose(genes[changed].sum(axis=1), 1.0)
+    
+    def test_linha_zerada_continua_valida(self):
+        """Testa que uma linha inicialmente zerada sai da mutação somando 1."""
+        rng = np.random.default_rng(7)
+        genes = np.zeros((1, 4))
+        
+        changed = mutate_matrix(genes, 1.0, 1.0, 0.1, rng)
+        
+        assert changed[0]
+        assert np.all(genes >= 0)
+        assert np.isclose(genes[0].sum(), 1.0)
+
+
+class TestVectorizedGeneticAlgorithm:
+    """Testes para o algoritmo genético vetorizado."""
+    
+    def make_ga(self, size=20, generations=5, seed=8):
+        universe = make_universe()
+        population = Portfolio.random_population(universe, size, rng=np.random.default_rng(seed))
+        return VectorizedGeneticAlgorithm(
+            population=population,
+            threshold=1.0,
+            max_generations=generations,
+            mutation_rate=0.3,
+            crossover_rate=0.8,
+            rng=np.random.default_rng(seed)
+        )
+    
+    def test_run_retorna_portfolio_valido(self):
+        """Testa que a execução retorna um portfólio com pesos válidos."""
+        ga = self.make_ga()
+        
+        best = ga.run()
+        
+        assert isinstance(best, Portfolio)
+        assert np.isclose(sum(best.weights.values()), 1.0)
+        assert len(ga.results) == 5
+    
+    def test_tamanho_da_populacao_preservado(self):
+        """Testa que a população mantém o tamanho, inclusive ímpar."""
+        ga = self.make_ga(size=7)
+        
+        ga.run()
+        
+        assert len(ga.population) == 7
+    
+    def test_populacao_compartilha_matriz(self):
+        """Testa que após a mutação os genes são linhas de uma única matriz."""
+        ga = self.make_ga(generations=1)
+        
+        ga._mutation()
+        
+        base = ga.population[0].genes.base
+        assert base is not None
+        assert all(p.genes.base is base for p in ga.population)
+    
+    def test_mutacao_invalida_apenas_linhas_alteradas(self):
+        """Testa que o cache de fitness é descartado só nas linhas mutadas."""
+        ga = self.make_ga(generations=1)
+        ga._evaluate_population()
+        ga._mutation_rate = 0.0
+        
+        ga._mutation()
+        
+        assert all(p._fitness_cache for p in ga.population)
+    
+    def test_reprodutibilidade_com_semente(self):
+        """Testa que a mesma semente produz a mesma evolução."""
+        first = self.make_ga(seed=11).run()
+        second = self.make_ga(seed=11).run()
+        
+        np.testing.assert_array_equal(first.genes, second.genes)
+    
+    def test_melhor_da_geracao_anterior_sobrevive(self):
+        """Testa que a elite volta intacta, sem mutação, na geração seguinte."""
+        ga = self.make_ga(generations=1)
+        ga._mutation_rate = 1.0
+        ga._gene_mutation_rate = 1.0
+        ga._evaluate_population()
+        best = max(ga.population, key=lambda p: p.fitness())
+        genes = best.genes.copy()
+        
+        ga.run()
+        
+        assert ga.population[0] is best
+        np.testing.assert_array_equal(best.genes, genes)
@@ -0,0 +1,138 @@
+"""
+Módulo contendo o universo de ativos compartilhado pela população.
+
+O universo é construído uma única vez a partir dos retornos baixados pelo
+``DataCollector`` e guarda a ordem dos tickers, a matriz de retornos e as
+estatísticas por ativo, permitindo que cada portfólio represente seus genes
+apenas como um vetor de pesos alinhado a essa ordem.
+"""
+
+from typing import Iterable, Dict, Tuple
+import numpy as np
+import pandas as pd
+from fingerprint import fingerprint_array
+
+
+class ReturnsUniverse:
+    """
+    Universo de ativos compartilhado por todos os portfólios de uma execução.
+    
+    A posição de cada ticker em ``tickers`` define a coluna correspondente
+    nos vetores de pesos, na matriz de retornos e no vetor de médias. Como
+    os retornos não mudam durante a execução, a matriz e as médias são
+    calculadas na construção, e a covariância na primeira consulta.
+    """
+    
+    def __init__(self, tickers: Iterable[str], returns: pd.DataFrame) -> None:
+        """
+        Inicializa o universo de ativos.
+        
+        Args:
+            tickers: Códigos dos ativos, na ordem dos genes
+            returns: DataFrame com retornos históricos dos ativos
+        
+        Raises:
+            KeyError: Ticker sem coluna correspondente em ``returns``
+        """
+        self.tickers: Tuple[str, ...] = tuple(tickers)
+        self.index: Dict[str, int] = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.columns: pd.Index = pd.Index(self.tickers)
+        self.returns: pd.DataFrame = returns
+        self.dates: pd.Index = returns.index
+        
+        # Matriz (T x N) contígua em memória e média de cada ativo
+        self.matrix: np.ndarray = np.ascontiguousarray(
+            returns[list(self.tickers)].to_numpy(dtype=np.float64)
+        )
+        self.mean: np.ndarray = self.matrix.mean(axis=0) if len(self.matrix) else np.zeros(self.size)
+        self._cov: np.ndarray = None
+        self._fingerprint: str = None
+    
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame, tickers: Iterable[str] = None, benchmark: str = None) -> 'ReturnsUniverse':
+        """
+        Cria o universo a partir da saída de ``DataCollector.download_data()``.
+        
+        Args:
+            returns: DataFrame com retornos dos ativos e do benchmark
+            tickers: Tickers a incluir, na ordem desejada (padrão: todas as colunas)
+            benchmark: Coluna do benchmark a ser descartada
+        
+        Returns:
+            ReturnsUniverse: Universo pronto para ser compartilhado
+        """
+        if tickers is None:
+            tickers = [column for column in returns.columns if column != benchmark]
+        return cls(tickers, returns)
+    
+    @classmethod
+    def from_matrix(
+        cls,
+        tickers: Iterable[str],
+        matrix: np.ndarray,
+        mean: np.ndarray = None,
+        dates: pd.Index = None
+    ) -> 'ReturnsUniverse':
+        """
+        Cria o universo diretamente sobre uma matriz de retornos já alinhada.
+        
+        A matriz não é copiada, o que permite montar o universo sobre um
+        bloco de memória compartilhada em processos auxiliares.
+        
+        Args:
+            tickers: Códigos dos ativos, na ordem das colunas
+            matrix: Matriz (T x N) de retornos em float64
+            mean: Retornos médios dos ativos (calculados se omitidos)
+            dates: Índice de datas das observações
+            
+        Returns:
+            ReturnsUniverse: Universo que referencia ``matrix``
+        """
+        universe = cls.__new__(cls)
+        universe.tickers = tuple(tickers)
+        universe.index = {ticker: i for i, ticker in enumerate(universe.tickers)}
+        universe.columns = pd.Index(universe.tickers)
+        universe.matrix = matrix
+        universe.mean = mean if mean is not None else matrix.mean(axis=0)
+        universe.returns = pd.DataFrame(matrix, columns=universe.columns, index=dates, copy=False)
+        universe.dates = universe.returns.index
+        universe._cov = None
+        universe._fingerprint = None
+        return universe
+    
+    @property
+    def size(self) -> int:
+        """Retorna o número de ativos do universo."""
+        return len(self.tickers)
+    
+    @property
+    def cov(self) -> np.ndarray:
+        """Retorna a matriz (N x N) de covariância dos retornos dos ativos."""
+        if self._cov is None:
+            self._cov = np.atleast_2d(np.cov(self.matrix, rowvar=False))
+        return self._cov
+    
+    @property
+    def fingerprint(self) -> str:
+        """Retorna a impressão digital estável dos tickers, datas e retornos do universo."""
+        if self._fingerprint is None:
+            self._fingerprint = fingerprint_array(self.matrix, self.tickers, self.dates)
+        return self._fingerprint
+    
+    def to_array(self, weights: dict) -> np.ndarray:
+        """
+        Converte um dicionário de pesos em vetor alinhado ao universo.
+        
+        Args:
+            weights: Dicionário com pesos dos ativos
+        
+        Returns:
+            np.ndarray: Vetor de pesos na ordem dos tickers
+        """
+        return np.array([weights[ticker] for ticker in self.tickers], dtype=np.float64)
+    
+    def __len__(self) -> int:
+        return len(self.tickers)
+    
+    def __repr__(self) -> str:
+        return f"ReturnsUniverse({len(self.tickers)} ativos, {len(self.returns)} observações)"
@@ -0,0 +1,202 @@
+"""
+Módulo contendo operadores genéticos vetorizados sobre a matriz da população.
+
+Cruzamento e mutação atuam de uma só vez sobre a matriz (P x N) de pesos,
+e a seleção (módulo ``selection``) sobre o vetor de fitness da geração,
+com um punhado de chamadas NumPy em vez de P x N passos do interpretador. O
+``VectorizedGeneticAlgorithm`` reaproveita o laço de ``GeneticAlgorithm``
+substituindo apenas a seleção, o cruzamento e a mutação.
+"""
+
+from typing import List
+import numpy as np
+from genetic_algorithm import GeneticAlgorithm
+from portfolio import Portfolio, normalized_weights_matrix, stack_population
+
+
+def blend_crossover(
+    parents_a: np.ndarray,
+    parents_b: np.ndarray,
+    crossover_rate: float,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Cruzamento uniforme por máscara entre linhas das matrizes de pais.
+    
+    Para cada par sorteado para cruzamento, uma máscara de Bernoulli escolhe
+    de qual pai vem cada gene; o segundo filho recebe o complemento. Pares
+    não sorteados são copiados sem alteração.
+    
+    Args:
+        parents_a: Matriz (K x N) com o primeiro pai de cada par
+        parents_b: Matriz (K x N) com o segundo pai de cada par
+        crossover_rate: Probabilidade de cruzamento de cada par
+        rng: Gerador de números aleatórios
+    
+    Returns:
+        np.ndarray: Matriz (2K x N) com os filhos, intercalados por par
+    """
+    n_pairs, n_genes = parents_a.shape
+    crossing = rng.random(n_pairs) < crossover_rate
+    mask = (rng.random((n_pairs, n_genes)) < 0.5) & crossing[:, None]
+    
+    children = np.empty((2 * n_pairs, n_genes), dtype=np.float64)
+    children[0::2] = np.where(mask, parents_b, parents_a)
+    children[1::2] = np.where(mask, parents_a, parents_b)
+    return children
+
+
+def mutate_matrix(
+    genes: np.ndarray,
+    mutation_rate: float,
+    gene_mutation_rate: float,
+    scale: float,
+    rng: np.random.Generator,
+    gaussian: bool = False
+) -> np.ndarray:
+    """
+    Mutação de toda a população com uma única matriz de ruído.
+    
+    Cada linha é sorteada com ``mutation_rate`` e, dentro dela, cada gene com
+    ``gene_mutation_rate``. O ruído é uniforme em ``[-scale, scale]`` ou
+    gaussiano com desvio ``scale``. Os pesos são truncados em zero e cada
+    linha alterada é renormalizada para soma 1 (linhas zeradas voltam à
+    alocação uniforme). A matriz é modificada in-place.
+    
+    Args:
+        genes: Matriz (P x N) de pesos
+        mutation_rate: Probabilidade de mutação de cada cromossomo
+        gene_mutation_rate: Probabilidade de mutação de cada gene
+        scale: Amplitude do ruído
+        rng: Gerador de números aleatórios
+        gaussian: Se o ruído deve ser gaussiano em vez de uniforme
+    
+    Returns:
+        np.ndarray: Vetor booleano (P) indicando as linhas alteradas
+    """
+    n_rows, n_genes = genes.shape
+    chosen = rng.random(n_rows) < mutation_rate
+    mask = (rng.random((n_rows, n_genes)) < gene_mutation_rate) & chosen[:, None]
+    if gaussian:
+        noise = rng.normal(0.0, scale, size=(n_rows, n_genes))
+    else:
+        noise = rng.uniform(-scale, scale, size=(n_rows, n_genes))
+    
+    changed = mask.any(axis=1)
+    np.add(genes, noise, out=genes, where=mask)
+    np.clip(genes, 0.0, None, out=genes)
+    
+    rows = genes[changed]
+    totals = rows.sum(axis=1, keepdims=True)
+    uniform = np.full_like(rows, 1.0 / max(n_genes, 1))
+    genes[changed] = np.divide(rows, totals, out=uniform, where=totals > 0)
+    return changed
+
+
+class VectorizedGeneticAlgorithm(GeneticAlgorithm[Portfolio]):
+    """
+    Algoritmo genético de portfólios com operadores vetorizados.
+    
+    Mantém o laço, o elitismo e os resultados de ``GeneticAlgorithm``, mas
+    cada geração é reproduzida e mutada diretamente sobre a matriz de pesos
+    da população, a partir do vetor de fitness calculado em lote.
+    """
+    
+    def __init__(
+        self,
+        population: List[Portfolio],
+        threshold: float,
+        max_generations: int,
+        mutation_rate: float,
+        crossover_rate: float,
+        elitism: bool = True,
+        gene_mutation_rate: float = 0.2,
+        mutation_scale: float = 0.1,
+        gaussian_mutation: bool = False,
+        competitors: int = 3,
+        rng: np.random.Generator = None,
+        batch_fitness=None,
+        **criteria
+    ) -> None:
+        """
+        Inicializa o algoritmo genético vetorizado.
+        
+        Args:
+            population: População inicial de portfólios de um mesmo universo
+            threshold: Limiar de aptidão para parada antecipada
+            max_generations: Número máximo de gerações
+            mutation_rate: Probabilidade de mutação de cada cromossomo
+            crossover_rate: Probabilidade de cruzamento de cada par
+            elitism: Se deve aplicar elitismo
+            gene_mutation_rate: Probabilidade de mutação de cada gene
+            mutation_scale: Amplitude do ruído de mutação
+            gaussian_mutation: Se o ruído deve ser gaussiano em vez de uniforme
+            competitors: Número de competidores por torneio
+            rng: Gerador de números aleatórios, ou semente para criá-lo
+            batch_fitness: Avaliador em lote (padrão: ``evaluate_population``)
+            criteria: Critérios de convergência e tipo de seleção (``selection_type``)
+                repassados ao ``GeneticAlgorithm``
+        """
+        from portfolio import evaluate_population
+        
+        super().__init__(
+            population=population,
+            threshold=threshold,
+            max_generations=max_generations,
+            mutation_rate=mutation_rate,
+            crossover_rate=crossover_rate,
+            elitism=elitism,
+            batch_fitness=batch_fitness or evaluate_population,
+            rng=rng,
+            **criteria
+        )
+        self._gene_mutation_rate = gene_mutation_rate
+        self._mutation_scale = mutation_scale
+        self._gaussian_mutation = gaussian_mutation
+        self._competitors = competitors
+    
+    def _select_parents(self) -> np.ndarray:
+        """
+        Seleciona os pares de pais sobre a população avaliada em lote,
+        conforme o tipo de seleção (inclusive NSGA-II).
+        
+        Returns:
+            np.ndarray: Matriz (K x 2) com os índices dos pais na população
+        """
+        self._evaluate_population()
+        return self._select_parent_indices()
+    
+    def _crossover(self, parents: np.ndarray) -> List[Portfolio]:
+        """
+        Gera a nova população cruzando as linhas da matriz de pesos.
+        
+        Args:
+            parents: Índices dos pares de pais
+            
+        Returns:
+            List[Portfolio]: Filhos cujos genes são linhas de uma nova matriz
+        """
+        size = len(self._population)
+        template = self._population[0]
+        weights = normalized_weights_matrix(self._population)
+        children = blend_crossover(
+            weights[parents[:, 0]], weights[parents[:, 1]], self._crossover_rate, self._rng
+        )[:size]
+        return [Portfolio(row, template.universe, template.risk_free_rate, template.rng) for row in children]
+    
+    def _mutation(self) -> None:
+        """Aplica a mutação à matriz da população (exceto a elite) de uma só vez."""
+        mutable = self._mutable_population()
+        if not mutable:
+            return
+        genes = stack_population(mutable)
+        changed = mutate_matrix(
+            genes,
+            self._mutation_rate,
+            self._gene_mutation_rate,
+            self._mutation_scale,
+            self._rng,
+            self._gaussian_mutation
+        )
+        for index in np.flatnonzero(changed):
+            mutable[index].invalidate_cache()